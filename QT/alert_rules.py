@@ -0,0 +1,227 @@
+import datetime
+from collections import namedtuple
+import numpy as np
+
+
+Alert = namedtuple('Alert', ['sensor_id', 'rule', 'time', 'value', 'message'])
+
+FIELD_LABELS = {
+    'temperature_celsius': ('Suhu', '°C'),
+    'humidity_percent': ('Kelembaban', '%'),
+}
+
+# Dampak kondisi di luar range, sama seperti pesan alert sebelumnya
+IMPACTS = {
+    ('temperature_celsius', 'low'): "Viskositas meningkat (produk mengental, sulit dipompa)",
+    ('temperature_celsius', 'high'): "Overpressure → Risiko ledakan.",
+    ('humidity_percent', 'low'): "Peningkatan risiko static electricity (bahaya percikan api)",
+    ('humidity_percent', 'high'): "Pertumbuhan mikroba (bakteri pengurai hidrokarbon)",
+}
+
+
+def rising_state(enter, leave, initial):
+    """State boolean per sampel dari event masuk/keluar (hysteresis), dihitung secara vektor.
+
+    State mengikuti event terakhir (enter -> True, leave -> False); sebelum event
+    pertama state sama dengan initial. Mengembalikan (state, state sebelumnya).
+    """
+    count = len(enter)
+    events = np.where(enter | leave, np.arange(count), -1)
+    last_event = np.maximum.accumulate(events)
+    state = np.where(last_event >= 0, enter[np.maximum(last_event, 0)], initial)
+    previous = np.empty(count, dtype=bool)
+    previous[0] = initial
+    previous[1:] = state[:-1]
+    return state, previous
+
+
+class ThresholdRule:
+    """Alert saat nilai keluar dari batas; baru dianggap normal lagi setelah
+    kembali melewati batas sebesar hysteresis."""
+
+    def __init__(self, name, field, direction, limit, hysteresis=0.0):
+        self.name = name
+        self.field = field
+        self.direction = direction  # 'low' atau 'high'
+        self.limit = limit
+        self.hysteresis = hysteresis
+
+    def evaluate(self, times, values, state):
+        if self.direction == 'high':
+            enter = values > self.limit
+            leave = values <= self.limit - self.hysteresis
+        else:
+            enter = values < self.limit
+            leave = values >= self.limit + self.hysteresis
+        active, previous = rising_state(enter, leave, state.get('active', False))
+        state['active'] = bool(active[-1])
+        return np.flatnonzero(active & ~previous)
+
+    def message(self, value, setpoint_range):
+        label, unit = FIELD_LABELS[self.field]
+        diff = abs(value - self.limit)
+        level = "TINGGI" if self.direction == 'high' else "RENDAH"
+        too = "tinggi" if self.direction == 'high' else "rendah"
+        return (
+            f"⚠ PERINGATAN {label.upper()} {level} ⚠\n"
+            f"{label} saat ini: {value:.1f}{unit}\n"
+            f"Range normal: {setpoint_range[0]}-{setpoint_range[1]}{unit}\n"
+            f"(Terlalu {too} {diff:.1f}{unit})\n"
+            f"Dampak: {IMPACTS[(self.field, self.direction)]}"
+        )
+
+
+class DurationRule:
+    """Alert saat nilai terus-menerus di luar batas selama minimal `duration`"""
+
+    def __init__(self, name, field, direction, limit, duration):
+        self.name = name
+        self.field = field
+        self.direction = direction
+        self.limit = limit
+        self.duration = np.timedelta64(int(duration.total_seconds() * 1e9), 'ns')
+
+    def evaluate(self, times, values, state):
+        outside = values > self.limit if self.direction == 'high' else values < self.limit
+        count = len(values)
+
+        # Awal setiap run berturut-turut; run pertama bisa lanjutan dari batch sebelumnya
+        starts = outside.copy()
+        starts[1:] &= ~outside[:-1]
+        carried = state.get('run_start') is not None and outside[0]
+        if carried:
+            starts[0] = False
+        run_id = np.cumsum(starts)
+        start_index = np.flatnonzero(starts)
+        run_start = np.empty(count, dtype='datetime64[ns]')
+        has_start = run_id > 0
+        run_start[has_start] = times[start_index[run_id[has_start] - 1]]
+        if carried:
+            run_start[~has_start] = state['run_start']
+
+        satisfied = outside & (times - run_start >= self.duration)
+
+        # Hanya sampel pertama yang memenuhi durasi di setiap run yang memicu alert
+        previous = np.empty(count, dtype=bool)
+        previous[0] = bool(carried and state.get('fired'))
+        previous[1:] = satisfied[:-1] & (run_id[1:] == run_id[:-1])
+        first = satisfied & ~previous
+
+        state['run_start'] = run_start[-1] if outside[-1] else None
+        state['fired'] = bool(satisfied[-1])
+        return np.flatnonzero(first)
+
+    def message(self, value, setpoint_range):
+        label, unit = FIELD_LABELS[self.field]
+        minutes = self.duration / np.timedelta64(1, 'm')
+        where = "di atas maksimum" if self.direction == 'high' else "di bawah minimum"
+        return (
+            f"⚠ {label.upper()} {where.upper()} SELAMA {minutes:.0f} MENIT ⚠\n"
+            f"{label} saat ini: {value:.1f}{unit}\n"
+            f"Range normal: {setpoint_range[0]}-{setpoint_range[1]}{unit}\n"
+            f"Dampak: {IMPACTS[(self.field, self.direction)]}"
+        )
+
+
+class RateOfChangeRule:
+    """Alert saat laju perubahan melebihi batas (satuan per menit)"""
+
+    def __init__(self, name, field, max_rate):
+        self.name = name
+        self.field = field
+        self.max_rate = max_rate
+
+    def evaluate(self, times, values, state):
+        previous = state.get('last')
+        all_times, all_values = times, values
+        if previous is not None:
+            all_times = np.concatenate([[previous[0]], times])
+            all_values = np.concatenate([[previous[1]], values])
+        state['last'] = (times[-1], values[-1])
+        if len(all_times) < 2:
+            return np.empty(0, dtype=int)
+
+        minutes = np.diff(all_times) / np.timedelta64(1, 'm')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rate = np.abs(np.diff(all_values)) / minutes
+        fired = np.flatnonzero((minutes > 0) & (rate > self.max_rate))
+        # Indeks relatif terhadap batch baru
+        return fired if previous is not None else fired + 1
+
+    def message(self, value, setpoint_range):
+        label, unit = FIELD_LABELS[self.field]
+        return (
+            f"⚠ PERUBAHAN {label.upper()} TERLALU CEPAT ⚠\n"
+            f"{label} saat ini: {value:.1f}{unit}\n"
+            f"Batas laju perubahan: {self.max_rate}{unit}/menit"
+        )
+
+
+def build_default_rules(temp_range, humidity_range, hysteresis=None, duration=None, max_rates=None):
+    """Aturan bawaan dashboard berdasarkan range set point"""
+    hysteresis = hysteresis or {'temperature_celsius': 0.5, 'humidity_percent': 1.0}
+    duration = duration or datetime.timedelta(minutes=3)
+    max_rates = max_rates or {'temperature_celsius': 2.0, 'humidity_percent': 5.0}
+    rules = []
+    for field, (low, high) in (('temperature_celsius', temp_range),
+                               ('humidity_percent', humidity_range)):
+        rules.append(ThresholdRule(f"{field}_low", field, 'low', low, hysteresis[field]))
+        rules.append(ThresholdRule(f"{field}_high", field, 'high', high, hysteresis[field]))
+        rules.append(DurationRule(f"{field}_high_duration", field, 'high', high, duration))
+        rules.append(RateOfChangeRule(f"{field}_rate", field, max_rates[field]))
+    return rules
+
+
+class AlertEngine:
+    """Mengevaluasi semua aturan untuk batch sampel baru per sensor.
+
+    State tiap aturan dan cooldown disimpan per (aturan, sensor), jadi alert
+    suhu tidak menahan alert kelembaban dan sensor lain.
+    """
+
+    def __init__(self, temp_range, humidity_range, cooldown=300):
+        self.cooldown = np.timedelta64(int(cooldown), 's')
+        self.states = {}  # (rule, sensor_id) -> dict state aturan
+        self.last_fired = {}  # (rule, sensor_id) -> waktu alert terakhir
+        self.set_ranges(temp_range, humidity_range)
+
+    def set_ranges(self, temp_range, humidity_range):
+        self.ranges = {'temperature_celsius': temp_range, 'humidity_percent': humidity_range}
+        self.rules = build_default_rules(temp_range, humidity_range)
+
+    def reset(self):
+        """Mengosongkan state dan cooldown (misal setelah set point diubah)"""
+        self.states.clear()
+        self.last_fired.clear()
+
+    def evaluate(self, sensor_id, field, times, values, since=None):
+        """Mengembalikan daftar Alert untuk batch (times datetime64 UTC, values float).
+
+        Sampel sebelum `since` hanya memperbarui state aturan tanpa memicu alert,
+        misalnya saat full resync mengambil ulang data 24 jam.
+        """
+        times = np.asarray(times, dtype='datetime64[ns]')
+        values = np.asarray(values, dtype='float64')
+        valid = ~np.isnan(values)
+        times, values = times[valid], values[valid]
+        if not len(times):
+            return []
+
+        alerts = []
+        for rule in self.rules:
+            if rule.field != field:
+                continue
+            key = (rule.name, sensor_id)
+            fired = rule.evaluate(times, values, self.states.setdefault(key, {}))
+            for idx in fired:
+                event_time = times[idx]
+                if since is not None and event_time < since:
+                    continue
+                last = self.last_fired.get(key)
+                if last is not None and event_time - last < self.cooldown:
+                    continue
+                self.last_fired[key] = event_time
+                value = float(values[idx])
+                alerts.append(Alert(sensor_id, rule.name, event_time, value,
+                                    rule.message(value, self.ranges[field])))
+        return alerts
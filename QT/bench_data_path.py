@@ -0,0 +1,346 @@
+"""Benchmark jalur data dashboard tanpa InfluxDB dan tanpa layar.
+
+Data dilayani oleh FakeQueryApi (data sintetis atau hasil query_raw yang
+direkam). Tahapan yang diukur dan padanannya di MonitoringApp:
+
+  fetch_full        update_data: DataWorker.fetch saat full resync
+  fetch_tick        update_data: DataWorker.fetch inkremental (satu titik baru per sensor)
+  table_columns     update_data_table/refresh_table: SeriesStore.table_columns
+  table_model       refresh_table: SensorTableModel.update_data (reset) + format satu halaman
+  table_model_tick  update_data_table: SensorTableModel.update_data inkremental
+  chart_prep        update_chart: visible_slice + minmax_downsample
+  chart_draw        update_chart: full draw figure (backend Agg)
+  export_csv, export_xlsx, export_parquet
+                    export_to_excel dari data di memori
+
+Setiap tahapan diukur latensinya (beberapa kali, tanpa tracemalloc) lalu
+memori puncaknya (satu kali, dengan tracemalloc). Hasil disimpan sebagai JSON
+agar bisa dibandingkan antar commit.
+
+Contoh:
+  python bench_data_path.py
+  python bench_data_path.py --points 10000000 --sensors 1 100 --repeat 1
+  python bench_data_path.py --recorded query_raw.csv
+  python bench_data_path.py --compare bench_results/data_path-20250101-120000.json
+"""
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PyQt6 import QtCore
+from data_worker import DataWorker
+from downsample import minmax_downsample, visible_slice
+from export_worker import ExportWorker, store_chunks
+from fake_influx import FakeQueryApi
+from sensor_table_model import SensorTableModel
+from series_store import FIELDS, SeriesStore
+
+
+# Sama dengan default MonitoringApp
+WINDOW_DURATION = datetime.timedelta(hours=24)
+RESYNC_GAP = datetime.timedelta(minutes=5)
+STORE_CAPACITY = 100_000
+TEMP_RANGE = (24.0, 30.0)
+HUMIDITY_RANGE = (50.0, 70.0)
+CHART_WIDTH_PX = 1000
+TABLE_PAGE_ROWS = 40
+
+DEFAULT_POINTS = [1_000, 100_000, 1_000_000]
+DEFAULT_SENSORS = [1, 10, 100]
+STAGES = ["fetch_full", "fetch_tick", "table_columns", "table_model", "table_model_tick",
+          "chart_prep", "chart_draw", "export_csv", "export_xlsx", "export_parquet"]
+OPTIONAL_MODULES = {"export_xlsx": "openpyxl", "export_parquet": "pyarrow"}
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_results")
+
+
+def measure(run, prepare=None, repeat=3):
+    """Latensi (detik) setiap run; prepare() dipanggil di luar pengukuran"""
+    durations = []
+    for _ in range(repeat):
+        args = prepare() if prepare else ()
+        started = time.perf_counter()
+        run(*args)
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def measure_peak_memory(run, prepare=None):
+    """Memori puncak (byte) yang dialokasikan selama satu run"""
+    args = prepare() if prepare else ()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        run(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class Scenario:
+    """Satu kombinasi jumlah titik dan sensor beserta worker, store dan data palsunya"""
+
+    def __init__(self, api, sensor_ids, interval):
+        self.api = api
+        self.sensor_ids = sensor_ids
+        self.sensor_id = sensor_ids[0] if sensor_ids else None
+        self.interval = interval
+        self.tail_time = api.segments['raw'][-1][0]
+        self.tmpdir = tempfile.mkdtemp(prefix="bench_export_")
+
+        self.store = SeriesStore(capacity=STORE_CAPACITY, retention=WINDOW_DURATION)
+        self.worker = DataWorker(self.store, FIELDS, WINDOW_DURATION, RESYNC_GAP)
+        self.payloads = []
+        self.failures = []
+        self.worker.data_ready.connect(self.payloads.append)
+        self.worker.fetch_failed.connect(lambda *failure: self.failures.append(failure))
+        self.request_id = 0
+
+    @classmethod
+    def synthetic(cls, points, n_sensors):
+        per_series = max(points // (n_sensors * len(FIELDS)), 1)
+        # Semua titik masuk ke dalam window agar full resync benar-benar membaca `points` titik
+        interval = np.timedelta64(int(WINDOW_DURATION.total_seconds() * 1e9) // (per_series + 1), 'ns')
+        end = np.datetime64('now', 'ns') - interval
+        api = FakeQueryApi.synthetic(n_sensors, per_series, end=end, interval=interval)
+        return cls(api, [f"SHT20-{i + 1:03d}" for i in range(n_sensors)], interval)
+
+    @classmethod
+    def recorded(cls, path):
+        api = FakeQueryApi.recorded(path)
+        scenario = cls(api, [], np.timedelta64(1, 's'))
+        scenario.fetch(force_resync=True)
+        scenario.sensor_ids = scenario.store.sensors()
+        scenario.sensor_id = scenario.sensor_ids[0]
+        return scenario
+
+    def close(self):
+        self.api.close()
+        for name in os.listdir(self.tmpdir):
+            os.remove(os.path.join(self.tmpdir, name))
+        os.rmdir(self.tmpdir)
+
+    def fetch(self, force_resync):
+        self.request_id += 1
+        self.worker.fetch({
+            'request_id': self.request_id,
+            'query_api': self.api,
+            'bucket': "bench",
+            'sensor_id': self.sensor_id,
+            'sensor_ids': None,
+            'force_resync': force_resync,
+        })
+        if self.failures:
+            request_id, status, title, message = self.failures.pop()
+            raise RuntimeError(f"{title}: {message}")
+        return self.payloads.pop()
+
+    def add_tick(self):
+        """Satu titik baru per sensor per field, seperti satu interval polling"""
+        self.tail_time = self.tail_time + self.interval
+        count = len(self.sensor_ids)
+        self.api.add_samples(self.sensor_ids, np.array([self.tail_time]),
+                             np.full((count, 1), 27.0), np.full((count, 1), 60.0))
+
+    def stages(self):
+        """Nama tahapan -> (run, prepare, jumlah baris yang diproses)"""
+        self.fetch(force_resync=True)
+        columns = self.store.table_columns(self.sensor_id)
+        rows = len(columns['time'])
+        stored = sum(len(self.store.series(sensor_id, field)[0])
+                     for sensor_id in self.store.sensors() for field in FIELDS)
+        times, values = self.store.series(self.sensor_id, FIELDS[0])
+
+        def previous_columns():
+            old = dict(columns)
+            for key in ('time',) + FIELDS:
+                old[key] = columns[key][:-1]
+            model = SensorTableModel(TEMP_RANGE, HUMIDITY_RANGE)
+            model.update_data(old)
+            return (model,)
+
+        def update_model(model):
+            model.update_data(columns)
+            for row in range(min(TABLE_PAGE_ROWS, model.rowCount())):
+                for column in range(model.columnCount()):
+                    model.data(model.index(row, column))
+
+        figure = Figure(figsize=(CHART_WIDTH_PX / 100, 4), dpi=100)
+        canvas = FigureCanvasAgg(figure)
+        ax = figure.add_subplot(111)
+        line, = ax.plot([], [], 'b-')
+
+        def prepare_chart():
+            start, end = visible_slice(times, times[0], times[-1])
+            return minmax_downsample(times[start:end], values[start:end], CHART_WIDTH_PX)
+
+        def draw_chart():
+            plot_times, plot_values = prepare_chart()
+            line.set_data(plot_times, plot_values)
+            ax.relim()
+            ax.autoscale_view()
+            canvas.draw()
+
+        def export(file_format):
+            def run():
+                worker = ExportWorker(store_chunks(columns), rows,
+                                      os.path.join(self.tmpdir, f"export.{file_format}"),
+                                      file_format, TEMP_RANGE, HUMIDITY_RANGE)
+                errors = []
+                worker.failed.connect(errors.append)
+                worker.run()
+                if errors:
+                    raise RuntimeError(errors[0])
+            return run
+
+        return {
+            "fetch_full": (lambda: self.fetch(force_resync=True), None, stored),
+            "fetch_tick": (lambda: self.fetch(force_resync=False), self.add_tick, len(self.sensor_ids)),
+            "table_columns": (lambda: self.store.table_columns(self.sensor_id), None, rows),
+            "table_model": (update_model,
+                            lambda: (SensorTableModel(TEMP_RANGE, HUMIDITY_RANGE),), rows),
+            "table_model_tick": (update_model, previous_columns, rows),
+            "chart_prep": (prepare_chart, None, len(times)),
+            "chart_draw": (draw_chart, None, len(times)),
+            "export_csv": (export("csv"), None, rows),
+            "export_xlsx": (export("xlsx"), None, rows),
+            "export_parquet": (export("parquet"), None, rows),
+        }
+
+
+def run_scenario(scenario, label, stage_names, repeat):
+    results = []
+    stages = scenario.stages()
+    for name in stage_names:
+        module = OPTIONAL_MODULES.get(name)
+        if module and importlib.util.find_spec(module) is None:
+            print(f"  {name:<17} dilewati ({module} tidak terpasang)")
+            continue
+        run, prepare, rows = stages[name]
+        durations = measure(run, prepare, repeat)
+        peak = measure_peak_memory(run, prepare)
+        result = dict(label, stage=name, rows=rows, runs=repeat,
+                      median_ms=statistics.median(durations) * 1000,
+                      min_ms=min(durations) * 1000,
+                      max_ms=max(durations) * 1000,
+                      peak_mb=peak / 2**20)
+        results.append(result)
+        print(f"  {name:<17} rows={rows:>10}  median={result['median_ms']:10.2f} ms  "
+              f"min={result['min_ms']:10.2f} ms  peak={result['peak_mb']:8.1f} MB", flush=True)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def environment():
+    import pandas
+    return {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pandas.__version__,
+        'matplotlib': matplotlib.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def result_key(result):
+    return (result.get('source'), result.get('points'), result.get('sensors'), result['stage'])
+
+
+def compare(results, baseline_path, threshold):
+    """Membandingkan median dengan hasil sebelumnya; mengembalikan jumlah regresi"""
+    with open(baseline_path) as f:
+        baseline = {result_key(result): result for result in json.load(f)['results']}
+    regressions = 0
+    print(f"\nPerbandingan dengan {baseline_path} (ambang regresi {threshold:.0%}):")
+    for result in results:
+        old = baseline.get(result_key(result))
+        if old is None:
+            continue
+        ratio = result['median_ms'] / old['median_ms'] if old['median_ms'] else float('inf')
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESI"
+            regressions += 1
+        print(f"  {result.get('points', '-')!s:>9} titik {result.get('sensors', '-')!s:>4} sensor "
+              f"{result['stage']:<17} {old['median_ms']:10.2f} -> {result['median_ms']:10.2f} ms "
+              f"({ratio:5.2f}x){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark jalur data dashboard (tanpa InfluxDB)")
+    parser.add_argument("--points", type=int, nargs="+", default=DEFAULT_POINTS,
+                        help="Jumlah titik total (semua sensor dan field)")
+    parser.add_argument("--sensors", type=int, nargs="+", default=DEFAULT_SENSORS)
+    parser.add_argument("--recorded", help="CSV hasil query_raw yang direkam, menggantikan data sintetis")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default=RESULTS_DIR, help="Direktori hasil JSON")
+    parser.add_argument("--compare", help="File JSON hasil sebelumnya sebagai baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Kenaikan median yang dianggap regresi (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication(sys.argv)
+
+    results = []
+    if args.recorded:
+        print(f"Data rekaman: {args.recorded}")
+        scenario = Scenario.recorded(args.recorded)
+        try:
+            results += run_scenario(scenario, {'source': os.path.basename(args.recorded)},
+                                    args.stages, args.repeat)
+        finally:
+            scenario.close()
+    else:
+        for points in args.points:
+            for n_sensors in args.sensors:
+                print(f"{points} titik, {n_sensors} sensor", flush=True)
+                scenario = Scenario.synthetic(points, n_sensors)
+                try:
+                    results += run_scenario(scenario, {'source': 'synthetic', 'points': points,
+                                                       'sensors': n_sensors},
+                                            args.stages, args.repeat)
+                finally:
+                    scenario.close()
+
+    meta = environment()
+    meta['max_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, f"data_path-{datetime.datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(path, "w") as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2)
+    print(f"\nHasil disimpan di {path}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""Benchmark frame-time GUI end-to-end dengan platform Qt offscreen.
+
+MonitoringApp dijalankan tanpa layar dan tanpa InfluxDB: query_api diganti
+FakeQueryApi berisi riwayat sintetis, lalu setiap tick data baru ditambahkan
+dan update_data dipanggil seperti timer aplikasi. Yang dicatat:
+
+  refresh_ms        update_data -> on_data_ready selesai (query + pengolahan + GUI)
+  on_data_ready_ms  waktu handler on_data_ready di thread GUI
+  update_chart_ms   waktu update_chart per field
+  update_table_ms   waktu update_data_table
+  repaint_chart_ms  repaint() sinkron kedua FigureCanvas setelah refresh
+  repaint_table_ms  repaint() sinkron viewport tabel setelah refresh
+  stall_ms          keterlambatan heartbeat timer (jank event loop)
+
+Contoh:
+  python bench_gui.py
+  python bench_gui.py --sizes 1280x800 1920x1080 --sensors 10 --history 100000 --rate 2
+  python bench_gui.py --compare bench_results/gui-20250101-120000.json
+"""
+import argparse
+import collections
+import datetime
+import functools
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+import numpy as np
+from PyQt6 import QtCore, QtWidgets
+import dashboard
+from bench_data_path import RESULTS_DIR, WINDOW_DURATION, environment
+from fake_influx import FakeQueryApi
+from history_cache import HistoryCache
+
+PERCENTILES = (50, 90, 95, 99)
+HEARTBEAT_MS = 5
+
+
+class NonBlockingMessageBox:
+    """Pengganti QMessageBox agar dialog error tidak memblokir benchmark"""
+
+    messages = []
+
+    @classmethod
+    def record(cls, parent, title, text, *args, **kwargs):
+        cls.messages.append(f"{title}: {text}")
+
+    warning = critical = information = record
+
+
+def timed(samples, name, method):
+    """Membungkus method agar durasinya (ms) dicatat di samples[name]"""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            samples[name].append((time.perf_counter() - started) * 1000)
+    return wrapper
+
+
+class GuiBenchmark:
+    """Satu skenario: ukuran jendela, jumlah sensor, riwayat awal dan laju data"""
+
+    def __init__(self, app, samples, size, n_sensors, history, rate, duration, batch):
+        self.app = app
+        self.size = size
+        self.n_sensors = n_sensors
+        self.history = history  # Titik per sensor per field di awal
+        self.rate = rate  # Refresh per detik
+        self.duration = duration  # Detik
+        self.batch = batch  # Titik baru per sensor per tick
+        self.samples = samples  # nama metrik -> list durasi (ms)
+        self.requested = {}  # request_id -> waktu update_data dipanggil
+        self.skipped = 0
+
+        self.tmpdir = tempfile.mkdtemp(prefix="bench_gui_")
+        window_ns = int(WINDOW_DURATION.total_seconds() * 1e9)
+        self.interval = np.timedelta64(window_ns // (history + 1), 'ns')
+        end = np.datetime64('now', 'ns') - self.interval
+        self.api = FakeQueryApi.synthetic(n_sensors, history, end=end, interval=self.interval)
+        self.sensor_ids = [f"SHT20-{i + 1:03d}" for i in range(n_sensors)]
+        self.tail_time = end
+        self.rng = np.random.default_rng(1)
+
+        cache = HistoryCache(os.path.join(self.tmpdir, "cache.sqlite3"))
+        self.window = dashboard.MonitoringApp(history_cache=cache)
+        self.window.resize(*size)
+        self.window.show()
+        self.window.on_first_paint()
+        self.window.query_api = self.api
+        self.window.worker.data_ready.connect(self.after_refresh)
+
+    def wait_for_refresh(self, timeout=120):
+        deadline = time.monotonic() + timeout
+        while self.window.fetch_in_progress and time.monotonic() < deadline:
+            self.app.processEvents(QtCore.QEventLoop.ProcessEventsFlag.AllEvents, 50)
+
+    def add_tick(self):
+        """Data baru untuk semua sensor, seperti yang ditulis TCP server"""
+        times = self.tail_time + self.interval * np.arange(1, self.batch + 1)
+        self.tail_time = times[-1]
+        shape = (self.n_sensors, self.batch)
+        self.api.add_samples(self.sensor_ids, times,
+                             27 + self.rng.normal(0, 0.5, shape), 60 + self.rng.normal(0, 1.0, shape))
+
+    def tick(self):
+        self.add_tick()
+        if self.window.fetch_in_progress:
+            self.skipped += 1  # Sama seperti timer aplikasi: tick dilewati jika fetch masih berjalan
+            return
+        started = time.perf_counter()
+        self.window.update_data()
+        self.requested[self.window.fetch_request_id] = started
+
+    def after_refresh(self, payload):
+        """Terhubung setelah on_data_ready, jadi dipanggil setelah GUI selesai memproses hasil"""
+        started = self.requested.pop(payload['request_id'], None)
+        if started is None:
+            return
+        self.samples['refresh_ms'].append((time.perf_counter() - started) * 1000)
+
+        repaint_started = time.perf_counter()
+        for chart in self.window.charts.values():
+            chart['canvas'].repaint()
+        self.samples['repaint_chart_ms'].append((time.perf_counter() - repaint_started) * 1000)
+        repaint_started = time.perf_counter()
+        self.window.tableWidget.viewport().repaint()
+        self.samples['repaint_table_ms'].append((time.perf_counter() - repaint_started) * 1000)
+
+    def heartbeat(self):
+        now = time.perf_counter()
+        if self.last_beat is not None:
+            self.samples['stall_ms'].append(max((now - self.last_beat) * 1000 - HEARTBEAT_MS, 0.0))
+        self.last_beat = now
+
+    def run(self):
+        # Full resync awal (riwayat penuh) tidak ikut diukur
+        self.window.update_data()
+        self.wait_for_refresh()
+        self.samples.clear()
+
+        self.last_beat = None
+        heartbeat = QtCore.QTimer()
+        heartbeat.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        heartbeat.timeout.connect(self.heartbeat)
+        ticker = QtCore.QTimer()
+        ticker.timeout.connect(self.tick)
+
+        loop = QtCore.QEventLoop()
+        QtCore.QTimer.singleShot(int(self.duration * 1000), loop.quit)
+        heartbeat.start(HEARTBEAT_MS)
+        ticker.start(int(1000 / self.rate))
+        loop.exec()
+        ticker.stop()
+        heartbeat.stop()
+        self.wait_for_refresh()
+
+    def close(self):
+        self.window.close()
+        self.window.deleteLater()
+        self.app.processEvents()
+        self.api.close()
+        for name in os.listdir(self.tmpdir):
+            os.remove(os.path.join(self.tmpdir, name))
+        os.rmdir(self.tmpdir)
+
+    def report(self):
+        label = {
+            'size': f"{self.size[0]}x{self.size[1]}",
+            'sensors': self.n_sensors,
+            'history': self.history,
+            'rate': self.rate,
+            'batch': self.batch,
+        }
+        results = []
+        for metric, values in sorted(self.samples.items()):
+            if not values:
+                continue
+            result = dict(label, metric=metric, count=len(values), max=float(np.max(values)))
+            for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+                result[f"p{p}"] = float(value)
+            results.append(result)
+        return results, self.skipped
+
+
+def print_results(results):
+    print(f"  {'metrik':<18}{'n':>6}" + "".join(f"{'p' + str(p):>10}" for p in PERCENTILES) + f"{'max':>10}")
+    for result in results:
+        print(f"  {result['metric']:<18}{result['count']:>6}"
+              + "".join(f"{result[f'p{p}']:10.2f}" for p in PERCENTILES) + f"{result['max']:10.2f}")
+
+
+def result_key(result):
+    return (result['size'], result['sensors'], result['history'], result['rate'], result['batch'],
+            result['metric'])
+
+
+def compare(results, baseline_path, threshold):
+    """Membandingkan p95 dengan hasil sebelumnya; mengembalikan jumlah regresi"""
+    with open(baseline_path) as f:
+        baseline = {result_key(result): result for result in json.load(f)['results']}
+    regressions = 0
+    print(f"\nPerbandingan p95 dengan {baseline_path} (ambang regresi {threshold:.0%}):")
+    for result in results:
+        old = baseline.get(result_key(result))
+        if old is None:
+            continue
+        ratio = result['p95'] / old['p95'] if old['p95'] else float('inf')
+        # Stall di bawah 1 frame (16 ms) tidak terasa, jangan dianggap regresi
+        flag = ""
+        if ratio > 1 + threshold and result['p95'] > 1.0 and \
+                (result['metric'] != 'stall_ms' or result['p95'] > 16.0):
+            flag = "  REGRESI"
+            regressions += 1
+        print(f"  {result['size']:>9} {result['sensors']:>3} sensor {result['metric']:<18} "
+              f"{old['p95']:10.2f} -> {result['p95']:10.2f} ms ({ratio:5.2f}x){flag}")
+    return regressions
+
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark frame-time GUI dengan Qt offscreen")
+    parser.add_argument("--sizes", type=parse_size, nargs="+", default=[(1280, 800), (1920, 1080)],
+                        help="Ukuran jendela, misal 1920x1080")
+    parser.add_argument("--sensors", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--history", type=int, default=86_400,
+                        help="Titik awal per sensor per field (default: 1 titik/detik selama 24 jam)")
+    parser.add_argument("--rate", type=float, default=1.0, help="Refresh per detik")
+    parser.add_argument("--batch", type=int, default=10, help="Titik baru per sensor per refresh")
+    parser.add_argument("--duration", type=float, default=20.0, help="Durasi per skenario (detik)")
+    parser.add_argument("--out", default=RESULTS_DIR)
+    parser.add_argument("--compare", help="File JSON hasil sebelumnya sebagai baseline")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+    dashboard.QMessageBox = NonBlockingMessageBox
+    # Bungkus method kelas sebelum jendela dibuat agar koneksi signal memakai versi terukur
+    originals = {name: getattr(dashboard.MonitoringApp, name)
+                 for name in ("on_data_ready", "update_chart", "update_data_table")}
+
+    results = []
+    skipped = {}
+    for size in args.sizes:
+        for n_sensors in args.sensors:
+            print(f"{size[0]}x{size[1]}, {n_sensors} sensor, riwayat {args.history} titik, "
+                  f"{args.rate}/detik", flush=True)
+            samples = collections.defaultdict(list)
+            for name, metric in (("on_data_ready", "on_data_ready_ms"),
+                                 ("update_chart", "update_chart_ms"),
+                                 ("update_data_table", "update_table_ms")):
+                setattr(dashboard.MonitoringApp, name, timed(samples, metric, originals[name]))
+            bench = None
+            try:
+                bench = GuiBenchmark(app, samples, size, n_sensors, args.history, args.rate,
+                                     args.duration, args.batch)
+                bench.run()
+                scenario_results, skipped_ticks = bench.report()
+            finally:
+                if bench is not None:
+                    bench.close()
+            print_results(scenario_results)
+            if skipped_ticks:
+                print(f"  {skipped_ticks} tick dilewati karena fetch sebelumnya belum selesai")
+            skipped[f"{size[0]}x{size[1]}/{n_sensors}"] = skipped_ticks
+            results += scenario_results
+
+    for name, method in originals.items():
+        setattr(dashboard.MonitoringApp, name, method)
+    if NonBlockingMessageBox.messages:
+        print("\nPesan error selama benchmark:")
+        for message in NonBlockingMessageBox.messages:
+            print(f"  {message}")
+
+    meta = environment()
+    meta.update(duration=args.duration, skipped_ticks=skipped)
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, f"gui-{datetime.datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(path, "w") as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2)
+    print(f"\nHasil disimpan di {path}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
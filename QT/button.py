@@ -9,9 +9,14 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 from matplotlib.figure import Figure
-import datetime
-import pytz
+import matplotlib.dates as mdates
+import numpy as np
 import mplcursors
+import pandas as pd
+import flux_reader
+from flux_query import FluxQuery, window_for
+from sensor_registry import SensorRegistry
+from local_time import format_local, nearest_index, to_local
 
 class MonitoringApp(QtWidgets.QMainWindow, Ui_MainWindow):
     def __init__(self):
@@ -29,6 +34,12 @@ class MonitoringApp(QtWidgets.QMainWindow, Ui_MainWindow):
         self.query_api = None
         self.timer = QTimer()
         self.update_interval = 10000  # 10 seconds
+        self.range_seconds = 3600  # Chart shows the last hour
+        self.sensor_id = "SHT20-PascaPanen-001"
+
+        # Sensor metadata is loaded from InfluxDB tags and cached; header labels change only when it does
+        self.sensor_registry = SensorRegistry()
+        self.header = None
 
         # For storing line references
         self.temp_line = None
@@ -132,47 +143,42 @@ class MonitoringApp(QtWidgets.QMainWindow, Ui_MainWindow):
             return
 
         try:
-            query = f'''
-            from(bucket: "{self.influx_bucket}")
-              |> range(start: -1h)
-              |> filter(fn: (r) => r["_measurement"] == "environment_monitoring")
-              |> filter(fn: (r) => r["_field"] == "humidity_percent" or r["_field"] == "temperature_celsius")
-              |> filter(fn: (r) => r["location"] == "Gudang Fermentasi 1")
-              |> filter(fn: (r) => r["process_stage"] == "Fermentasi")
-              |> filter(fn: (r) => r["sensor_id"] == "SHT20-PascaPanen-001")
-              |> aggregateWindow(every: 1m, fn: mean, createEmpty: false)
-              |> yield(name: "mean")
-            '''
+            # This window has a single chart pair, so it follows one sensor by id only;
+            # location and stage come from the registry rather than the filter.
+            # Window sized so each field returns about one row per chart pixel, joined per timestamp
+            query = FluxQuery(self.influx_bucket) \
+                .range(f"-{self.range_seconds}s") \
+                .tags(sensor_id=self.sensor_id) \
+                .aggregate(window_for(self.range_seconds, self.temp_canvas.width())) \
+                .pivot() \
+                .keep(flux_reader.PIVOT_COLUMNS) \
+                .build("mean")
 
             try:
-                result = self.query_api.query(query)
+                # Rows arrive as CSV columns; the time column is parsed once as datetime64
+                frames = list(flux_reader.stream_frames(self.query_api, query))
             except Exception as query_error:
                 self.statusLabel.setText("STATUS: Query Error ⚠")
                 QMessageBox.warning(self, "Query Error", f"Failed to execute query: {str(query_error)}")
                 return
 
-            temp_data = []
-            humidity_data = []
-            temp_times = []
-            humidity_times = []
-
-            for table in result:
-                for record in table.records:
-                    if record.get_field() == "temperature_celsius":
-                        temp_data.append(record.get_value())
-                        temp_times.append(record.get_time())
-                    elif record.get_field() == "humidity_percent":
-                        humidity_data.append(record.get_value())
-                        humidity_times.append(record.get_time())
-
-                    if not self.locationLabel.text().startswith("LOCATION:"):
-                        self.locationLabel.setText(f"LOCATION: {record.values.get('location', 'N/A')}")
-                        self.processStageLabel.setText(f"PROSES: {record.values.get('process_stage', 'N/A')}")
-                        self.sensorIdLabel.setText(f"SENSOR ID: {record.values.get('sensor_id', 'N/A')}")
-
-            if temp_data and temp_times:
+            frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame({'time': []})
+            # Tables may be split by tag (e.g. a sensor that changed location), so sort after joining
+            temp_times, temp_data = flux_reader.sort_by_time(
+                *flux_reader.field_arrays(frame, "temperature_celsius"))
+            humidity_times, humidity_data = flux_reader.sort_by_time(
+                *flux_reader.field_arrays(frame, "humidity_percent"))
+
+            if self.sensor_registry.is_stale():
+                try:
+                    self.sensor_registry.refresh(self.query_api, self.influx_bucket)
+                except Exception:
+                    pass  # Labels keep their last values; the registry retries after its TTL
+            self.update_header()
+
+            if len(temp_times):
                 self.update_chart(self.temp_ax, self.temp_canvas, temp_times, temp_data, 'Temperature (°C)')
-            if humidity_data and humidity_times:
+            if len(humidity_times):
                 self.update_chart(self.humidity_ax, self.humidity_canvas, humidity_times, humidity_data, 'Humidity (%)')
 
             now = QDateTime.currentDateTime()
@@ -182,11 +188,21 @@ class MonitoringApp(QtWidgets.QMainWindow, Ui_MainWindow):
             self.statusLabel.setText("STATUS: Update Error ⚠")
             QMessageBox.warning(self, "Error", f"Error updating data: {str(e)}")
 
-    def update_chart(self, ax, canvas, times, values, title):
+    def update_header(self):
+        metadata = self.sensor_registry.get(self.sensor_id) or ("N/A", "N/A")
+        header = (self.sensor_id,) + metadata
+        if header == self.header:
+            return
+        self.header = header
+        self.locationLabel.setText(f"LOCATION: {metadata[0]}")
+        self.processStageLabel.setText(f"PROSES: {metadata[1]}")
+        self.sensorIdLabel.setText(f"SENSOR ID: {self.sensor_id}")
+
+    def update_chart(self, ax, canvas, utc_times, values, title):
         try:
             ax.clear()
-            local_tz = pytz.timezone('Asia/Jakarta')
-            local_times = [t.astimezone(local_tz) for t in times]
+            # Convert once, vectorized: UTC datetime64 array -> naive WIB array for plotting
+            local_times = to_local(utc_times)
             line, = ax.plot(local_times, values, 'b-')
             if title == 'Temperature (°C)':
                 if self.temp_cursor:
@@ -200,25 +216,22 @@ class MonitoringApp(QtWidgets.QMainWindow, Ui_MainWindow):
             ax.set_xlabel('Time (WIB)')
             ax.set_ylabel(title.split(' ')[0])
             ax.grid(True)
-            ax.xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter('%H:%M:%S', tz=local_tz))
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
             plt.setp(ax.get_xticklabels(), rotation=45)
-            formatted_times = [t.strftime('%Y-%m-%d %H:%M:%S') for t in local_times]
+
+            # Tooltip text is built only for the hovered sample, found by binary search
+            cursor = mplcursors.cursor(line, hover=True)
+            def on_add(sel):
+                target = np.datetime64(mdates.num2date(sel.target[0]).replace(tzinfo=None), 'ns')
+                idx = nearest_index(local_times, target)
+                sel.annotation.set_text(
+                    f"{title.split(' ')[0]}: {values[idx]:.2f}\nTime: {format_local(utc_times[idx])}"
+                )
+            cursor.connect("add", on_add)
             if title == 'Temperature (°C)':
-                self.temp_cursor = mplcursors.cursor(line, hover=True)
-                def on_add_temp(sel):
-                    idx = sel.target.index
-                    sel.annotation.set_text(
-                        f"{title.split(' ')[0]}: {values[idx]:.2f}\nTime: {formatted_times[idx]}"
-                    )
-                self.temp_cursor.connect("add", on_add_temp)
+                self.temp_cursor = cursor
             else:
-                self.humidity_cursor = mplcursors.cursor(line, hover=True)
-                def on_add_humidity(sel):
-                    idx = sel.target.index
-                    sel.annotation.set_text(
-                        f"{title.split(' ')[0]}: {values[idx]:.2f}\nTime: {formatted_times[idx]}"
-                    )
-                self.humidity_cursor.connect("add", on_add_humidity)
+                self.humidity_cursor = cursor
             canvas.draw()
 
         except Exception as e:
@@ -0,0 +1,383 @@
+"""Audit rekonsiliasi InfluxDB vs blockchain (batch Merkle dan event NewReading di indeks lokal).
+
+Rentang waktu dipecah menjadi chunk yang diproses paralel di process pool.
+Setiap baris InfluxDB lebih dulu dihitung leaf-nya (sama dengan readingLeaf
+kontrak) dan dicari di pembacaan batch yang proof-nya valid terhadap root
+yang tercatat di chain; yang cocok berarti sudah di-anchor. Sisanya
+dipasangkan dengan NewReading dan pembacaan batch lain pada kunci
+(sensor_id, timestamp detik) dan nilai x10 (fixed point kontrak) secara
+vektor. Baris yang tidak ada di chain dan lebih baru dari pembacaan on-chain
+terbaru masih menunggu batch berikutnya (pending), sisanya hilang (missing).
+Worker hanya mengembalikan ringkasan plus contoh selisih.
+
+Contoh:
+  INFLUXDB_TOKEN=... python chain_audit.py
+  python chain_audit.py --start 2025-01-01T00:00:00Z --end 2025-02-01T00:00:00Z --sync --out selisih.csv
+"""
+import argparse
+import concurrent.futures
+import datetime
+import multiprocessing
+import os
+import time
+import numpy as np
+import pandas as pd
+from chain_reader import ChainIndex, ChainReader, JsonRpcClient, DEFAULT_CONTRACT, DEFAULT_INDEX_PATH, \
+    DEFAULT_PROOF_PATH, DEFAULT_RPC_URL
+
+
+AUDIT_CHUNK = datetime.timedelta(hours=6)  # Rentang waktu per tugas di process pool
+SAMPLE_LIMIT = 500  # Contoh selisih per jenis per chunk yang dikembalikan
+# Tidak ada di blockchain, belum di-anchor, tidak ada di InfluxDB, nilai beda
+KINDS = ("missing", "pending", "extra", "mismatched")
+KIND_LABELS = {
+    "missing": "Tidak ada di blockchain",
+    "pending": "Belum di-anchor",
+    "extra": "Tidak ada di InfluxDB",
+    "mismatched": "Nilai berbeda",
+}
+KEY = ['sensor_id', 'timestamp', 'occurrence']
+
+# Konfigurasi default sama dengan dashboard; dari dashboard config diteruskan langsung,
+# dari command line token dibaca dari environment (INFLUXDB_TOKEN atau --token)
+DEFAULT_CONFIG = {
+    'influx_url': "http://localhost:8086",
+    'influx_org': "INSTITUT TEKNOLOGI SEPULUH NOPEMBER",
+    'influx_token': os.environ.get("INFLUXDB_TOKEN"),
+    'influx_bucket': "Tank T-101",
+    'index_path': DEFAULT_INDEX_PATH,
+    'contract': DEFAULT_CONTRACT.lower(),
+}
+
+# Koneksi per proses worker, dibuat sekali oleh init_worker
+worker_state = {}
+
+
+def build_audit_query(bucket, start, end):
+    """Query Flux semua sensor dalam [start, end), sudah di-pivot per timestamp"""
+    import flux_reader
+    from flux_query import FluxQuery
+    return FluxQuery(bucket).range(start, end).pivot().keep(flux_reader.PIVOT_COLUMNS).build()
+
+
+def to_fixed_point(values):
+    """Nilai x10 dibulatkan menjauhi nol seperti f64::round di tcp_server (bukan pembulatan bankir)"""
+    scaled = np.asarray(values, dtype='float64') * 10
+    return np.sign(scaled) * np.floor(np.abs(scaled) + 0.5)
+
+
+def influx_frame(query_api, bucket, start, end):
+    """Sisi InfluxDB: timestamp dipotong ke detik, nilai dikonversi ke x10; lokasi/tahap untuk leaf"""
+    import flux_reader
+    query = build_audit_query(bucket, start, end)
+    frames = []
+    for chunk in flux_reader.stream_frames(query_api, query, columns=flux_reader.PIVOT_COLUMNS):
+        times = chunk['time'].dt.tz_convert(None).to_numpy(dtype='datetime64[s]')
+        frames.append(pd.DataFrame({
+            'sensor_id': chunk['sensor_id'].astype(str).to_numpy(),
+            'location': chunk['location'].astype(str).to_numpy(),
+            'process_stage': chunk['process_stage'].astype(str).to_numpy(),
+            'timestamp': times.astype('int64'),
+            'temperature_x10': to_fixed_point(chunk.get('temperature_celsius', np.nan)),
+            'humidity_x10': to_fixed_point(chunk.get('humidity_percent', np.nan)),
+        }))
+    if not frames:
+        return empty_frame().assign(location=np.empty(0, dtype=object), process_stage=np.empty(0, dtype=object))
+    return pd.concat(frames, ignore_index=True)
+
+
+def influx_leaves(influx):
+    """Leaf (hex) tiap baris InfluxDB; None untuk baris yang nilainya tidak lengkap (tidak bisa di-anchor)"""
+    import merkle
+    leaves = np.full(len(influx), None, dtype=object)
+    complete = np.flatnonzero(influx['temperature_x10'].notna().to_numpy() & influx['humidity_x10'].notna().to_numpy())
+    if len(complete):
+        rows = influx.iloc[complete]
+        digests = merkle.reading_leaves(
+            rows['sensor_id'], rows['location'], rows['process_stage'], rows['timestamp'],
+            rows['temperature_x10'].astype('int64'), rows['humidity_x10'].astype('int64'))
+        leaves[complete] = [merkle.to_hex(digest) for digest in digests]
+    return leaves
+
+
+def anchored_frame(index, contract, start, end):
+    """Pembacaan batch yang terbukti on-chain (proof valid, root ada di BatchAnchored) beserta leaf-nya"""
+    columns = index.anchored_columns(contract, start, end)
+    return pd.DataFrame({
+        'leaf': np.asarray(columns['leaf'], dtype=object),
+        'sensor_id': np.asarray(columns['sensor_id'], dtype=object),
+        'timestamp': np.asarray(columns['timestamp'], dtype='int64'),
+        'temperature_x10': np.asarray(columns['temperature_x10'], dtype='float64'),
+        'humidity_x10': np.asarray(columns['humidity_x10'], dtype='float64'),
+    })
+
+
+def chain_frame(index, contract, start, end):
+    """Sisi NewReading"""
+    columns = index.columns(contract, start, end)
+    frame = pd.DataFrame({
+        'sensor_id': np.asarray(columns['sensor_id'], dtype=object),
+        'timestamp': np.asarray(columns['timestamp'], dtype='int64'),
+        'temperature_x10': np.asarray(columns['temperature_x10'], dtype='float64'),
+        'humidity_x10': np.asarray(columns['humidity_x10'], dtype='float64'),
+    })
+    return frame
+
+
+def empty_frame():
+    return pd.DataFrame({
+        'sensor_id': np.empty(0, dtype=object),
+        'timestamp': np.empty(0, dtype='int64'),
+        'temperature_x10': np.empty(0, dtype='float64'),
+        'humidity_x10': np.empty(0, dtype='float64'),
+    })
+
+
+def rows_in(frame, other):
+    """Mask baris `frame` yang punya pasangan identik di `other`; duplikat dipasangkan satu-satu"""
+    values = ['sensor_id', 'timestamp', 'temperature_x10', 'humidity_x10']
+    left = frame[values].assign(occurrence=frame.groupby(values, dropna=False).cumcount().to_numpy())
+    right = other[values].assign(occurrence=other.groupby(values, dropna=False).cumcount().to_numpy())
+    merged = left.merge(right, on=values + ['occurrence'], how='left', indicator=True)
+    return (merged['_merge'] == 'both').to_numpy()
+
+
+def compare_frames(influx, chain):
+    """Menyamakan kedua sisi dan mengklasifikasikan selisih; mengembalikan (jumlah cocok, residu, mask).
+
+    Pertama dipasangkan baris yang kunci dan nilainya persis sama. Sisanya
+    dipasangkan pada (sensor_id, timestamp): pasangan berarti nilai berbeda,
+    yang tidak punya pasangan berarti hilang di salah satu sisi. Beberapa
+    pembacaan dengan sensor dan detik yang sama dipasangkan berurutan lewat
+    nomor kemunculan, sehingga duplikat tidak menjadi perkalian silang.
+    """
+    values = ['sensor_id', 'timestamp', 'temperature_x10', 'humidity_x10']
+    for frame in (influx, chain):
+        frame['occurrence'] = frame.groupby(values, dropna=False).cumcount()
+    exact = influx.merge(chain, on=values + ['occurrence'], how='outer', indicator=True)
+    matched = int(np.count_nonzero((exact['_merge'] == 'both').to_numpy()))
+
+    residual = []
+    for side in ('left_only', 'right_only'):
+        rest = exact.loc[exact['_merge'] == side, values].reset_index(drop=True)
+        rest['occurrence'] = rest.groupby(['sensor_id', 'timestamp']).cumcount()
+        residual.append(rest)
+    merged = residual[0].merge(residual[1], on=KEY, how='outer', suffixes=('_influx', '_chain'),
+                               indicator=True)
+    masks = {
+        'missing': (merged['_merge'] == 'left_only').to_numpy(),
+        'extra': (merged['_merge'] == 'right_only').to_numpy(),
+        'mismatched': (merged['_merge'] == 'both').to_numpy(),
+    }
+    return matched, merged, masks
+
+
+def mark_pending(merged, masks, last_anchored):
+    """Baris yang tidak ada di chain tetapi lebih baru dari pembacaan on-chain terbaru menunggu batch berikutnya"""
+    newer = (merged['timestamp'] > last_anchored).to_numpy() if last_anchored is not None \
+        else np.zeros(len(merged), dtype=bool)
+    masks['pending'] = masks['missing'] & newer
+    masks['missing'] = masks['missing'] & ~newer
+    return masks
+
+
+def audit_range(query_api, index, bucket, contract, start, end, sample_limit=SAMPLE_LIMIT):
+    """Audit satu chunk [start, end) dalam detik unix; mengembalikan ringkasan dan contoh selisih"""
+    started = time.perf_counter()
+    influx = influx_frame(query_api, bucket, start, end)
+    leaves = influx_leaves(influx)
+    anchored = anchored_frame(index, contract, start, end)
+    is_anchored = pd.Series(leaves).isin(anchored['leaf']).to_numpy()
+
+    # Baris yang belum terbukti di-anchor dibandingkan dengan NewReading dan pembacaan batch yang
+    # leaf-nya tidak ada di InfluxDB (nilai berbeda atau hanya ada di chain)
+    rest = influx.loc[~is_anchored, ['sensor_id', 'timestamp', 'temperature_x10', 'humidity_x10']]
+    unmatched_batch = anchored.loc[~anchored['leaf'].isin(leaves[is_anchored]), rest.columns]
+    # Selama tcp_server juga mengirim addReading, pembacaan yang sudah ter-anchor punya NewReading juga;
+    # NewReading itu sudah terwakili oleh baris anchored dan tidak boleh muncul sebagai 'extra'
+    legacy = chain_frame(index, contract, start, end)
+    legacy = legacy.loc[~rows_in(legacy, influx.loc[is_anchored])]
+    chain = pd.concat([legacy, unmatched_batch], ignore_index=True)
+    matched, merged, masks = compare_frames(rest.reset_index(drop=True), chain)
+
+    mark_pending(merged, masks, index.last_anchored_timestamp(contract))
+
+    samples = []
+    for kind in KINDS:
+        rows = merged.loc[masks[kind]].head(sample_limit)
+        for row in rows.itertuples(index=False):
+            samples.append({
+                'kind': kind,
+                'sensor_id': row.sensor_id,
+                'timestamp': int(row.timestamp),
+                'temperature_x10_influx': row.temperature_x10_influx,
+                'temperature_x10_chain': row.temperature_x10_chain,
+                'humidity_x10_influx': row.humidity_x10_influx,
+                'humidity_x10_chain': row.humidity_x10_chain,
+            })
+
+    result = {
+        'start': start,
+        'end': end,
+        'influx_rows': len(influx),
+        'chain_rows': len(chain) - len(unmatched_batch) + len(anchored),
+        'anchored': int(is_anchored.sum()),
+        'matched': matched,
+        'samples': samples,
+        'seconds': time.perf_counter() - started,
+    }
+    for kind in KINDS:
+        result[kind] = int(masks[kind].sum())
+    return result
+
+
+def init_worker(config):
+    """Initializer process pool: satu client InfluxDB dan satu koneksi indeks per proses"""
+    from influxdb_client import InfluxDBClient
+    client = InfluxDBClient(url=config['influx_url'], token=config['influx_token'],
+                            org=config['influx_org'], timeout=120_000)
+    worker_state.update(
+        config=config,
+        client=client,
+        query_api=client.query_api(),
+        index=ChainIndex(config['index_path']),
+    )
+
+
+def audit_chunk(start, end):
+    """Dijalankan di proses worker"""
+    config = worker_state['config']
+    return audit_range(worker_state['query_api'], worker_state['index'], config['influx_bucket'],
+                       config['contract'], start, end)
+
+
+def chunk_ranges(start, end, chunk=AUDIT_CHUNK):
+    """Rentang [start, end) dalam detik unix per chunk"""
+    step = int(chunk.total_seconds())
+    start, end = int(start), int(end)
+    return [(chunk_start, min(chunk_start + step, end)) for chunk_start in range(start, end, step)]
+
+
+class AuditReport:
+    """Akumulasi hasil chunk: total per jenis, contoh selisih dan throughput"""
+
+    def __init__(self, start, end, chunks):
+        self.start = start
+        self.end = end
+        self.chunks = chunks
+        self.done = 0
+        self.totals = dict.fromkeys(('influx_rows', 'chain_rows', 'anchored', 'matched') + KINDS, 0)
+        self.samples = []
+        self.worker_seconds = 0.0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self.cancelled = False
+
+    def add(self, result):
+        self.done += 1
+        for key in self.totals:
+            self.totals[key] += result[key]
+        self.samples += result['samples']
+        self.worker_seconds += result['seconds']
+        self.elapsed = time.perf_counter() - self.started
+
+    def rows(self):
+        return self.totals['influx_rows'] + self.totals['chain_rows']
+
+    def rows_per_second(self):
+        return self.rows() / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        totals = self.totals
+        status = " (dibatalkan)" if self.cancelled else ""
+        return (f"{self.done}/{self.chunks} chunk{status}: {totals['influx_rows']} baris InfluxDB, "
+                f"{totals['chain_rows']} baris blockchain, {totals['anchored']} terverifikasi di batch, "
+                f"{totals['matched']} cocok dengan NewReading, {totals['pending']} belum di-anchor, "
+                f"{totals['missing']} tidak ada di blockchain, {totals['extra']} tidak ada di InfluxDB, "
+                f"{totals['mismatched']} nilai berbeda · {self.rows_per_second():,.0f} baris/detik "
+                f"({self.elapsed:.1f} detik, {self.worker_seconds:.1f} detik-proses)")
+
+    def samples_frame(self):
+        frame = pd.DataFrame(self.samples, columns=[
+            'kind', 'sensor_id', 'timestamp', 'temperature_x10_influx', 'temperature_x10_chain',
+            'humidity_x10_influx', 'humidity_x10_chain'])
+        return frame.sort_values(['timestamp', 'sensor_id'], kind='stable', ignore_index=True)
+
+
+def run_audit(config, start, end, chunk=AUDIT_CHUNK, workers=None, progress=None, cancelled=lambda: False):
+    """Menjalankan audit paralel; progress(report) dipanggil setiap chunk selesai.
+
+    Proses worker memakai start method 'spawn' agar aman dipanggil dari aplikasi Qt
+    yang sudah punya thread lain. Spawn mengimpor ulang modul __main__ di setiap
+    worker, jadi skrip pemanggil tidak boleh mengimpor GUI di level atas (lihat main.py).
+    """
+    ranges = chunk_ranges(start, end, chunk)
+    report = AuditReport(start, end, len(ranges))
+    if not ranges:
+        return report
+    workers = workers or min(len(ranges), os.cpu_count() or 1)
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                                initializer=init_worker, initargs=(config,)) as pool:
+        futures = [pool.submit(audit_chunk, *chunk_range) for chunk_range in ranges]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                report.add(future.result())
+                if progress is not None:
+                    progress(report)
+                if cancelled():
+                    report.cancelled = True
+                    break
+        finally:
+            for future in futures:
+                future.cancel()
+    return report
+
+
+def parse_time(text):
+    value = datetime.datetime.fromisoformat(text.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()
+
+
+def main():
+    now = time.time()
+    parser = argparse.ArgumentParser(description="Audit rekonsiliasi InfluxDB vs blockchain")
+    parser.add_argument("--start", type=parse_time, default=now - 7 * 86400,
+                        help="Awal rentang (ISO 8601, default 7 hari terakhir)")
+    parser.add_argument("--end", type=parse_time, default=now)
+    parser.add_argument("--chunk-hours", type=float, default=AUDIT_CHUNK.total_seconds() / 3600)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--bucket", default=DEFAULT_CONFIG['influx_bucket'])
+    parser.add_argument("--token", default=DEFAULT_CONFIG['influx_token'],
+                        help="Token InfluxDB (default dari environment INFLUXDB_TOKEN)")
+    parser.add_argument("--index", default=DEFAULT_CONFIG['index_path'])
+    parser.add_argument("--contract", default=DEFAULT_CONFIG['contract'])
+    parser.add_argument("--sync", action="store_true", help="Sinkronkan indeks blockchain dulu")
+    parser.add_argument("--rpc", default=DEFAULT_RPC_URL)
+    parser.add_argument("--proofs", default=DEFAULT_PROOF_PATH, help="File proof batch dari tcp_server")
+    parser.add_argument("--out", help="File CSV contoh selisih")
+    args = parser.parse_args()
+    if not args.token:
+        parser.error("token InfluxDB belum diset (INFLUXDB_TOKEN atau --token)")
+
+    config = dict(DEFAULT_CONFIG, influx_token=args.token, influx_bucket=args.bucket, index_path=args.index,
+                  contract=args.contract.lower())
+    if args.sync:
+        index = ChainIndex(args.index)
+        added = ChainReader(JsonRpcClient(args.rpc), index, args.contract, proof_path=args.proofs).sync()
+        index.close()
+        print(f"Indeks blockchain: {added} pembacaan baru")
+
+    report = run_audit(config, args.start, args.end, datetime.timedelta(hours=args.chunk_hours), args.workers,
+                       progress=lambda report: print(f"\r{report.done}/{report.chunks} chunk", end="", flush=True))
+    print()
+    print(report.summary())
+    if args.out:
+        report.samples_frame().to_csv(args.out, index=False)
+        print(f"Contoh selisih disimpan di {args.out}")
+
+
+if __name__ == "__main__":
+    main()
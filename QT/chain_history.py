@@ -0,0 +1,117 @@
+import numpy as np
+from PyQt6 import QtCore
+from PyQt6.QtCore import Qt, pyqtSignal
+from chain_reader import ChainReader, JsonRpcClient
+from local_time import format_local_array
+
+
+class ChainSyncWorker(QtCore.QObject):
+    """Menjalankan ChainReader.sync di thread terpisah"""
+
+    progress = pyqtSignal(int, int, int)  # halaman selesai, total halaman, pembacaan baru
+    finished = pyqtSignal(int)  # jumlah pembacaan baru
+    failed = pyqtSignal(str)  # pesan error
+
+    def __init__(self, rpc_url, contract, index):
+        super().__init__()
+        self.rpc_url = rpc_url
+        self.contract = contract
+        self.index = index
+        self.cancel_requested = False
+
+    def cancel(self):
+        """Dipanggil dari thread GUI; halaman yang sudah tersimpan tetap di indeks"""
+        self.cancel_requested = True
+
+    def run(self):
+        try:
+            reader = ChainReader(JsonRpcClient(self.rpc_url), self.index, self.contract)
+            added = reader.sync(progress=self.progress.emit, cancelled=lambda: self.cancel_requested)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(added)
+
+
+class ChainHistoryModel(QtCore.QAbstractTableModel):
+    """Model tabel riwayat on-chain dari ChainIndex; sel diformat saat diminta view"""
+
+    HEADERS = ["ID", "Blok", "Waktu", "Sensor ID", "Lokasi", "Tahap Proses", "Suhu (°C)",
+               "Kelembaban (%)", "Tx Hash"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.readings = []
+        self.local_times = []  # Teks waktu WIB per baris, diformat sekali di update_data
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.readings)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        reading = self.readings[index.row()]
+        column = index.column()
+        if column == 0:
+            return str(reading.id) if reading.id is not None else f"Batch {reading.batch_id}"
+        if column == 1:
+            return str(reading.block_number)
+        if column == 2:
+            return self.local_times[index.row()]
+        if column == 3:
+            return reading.sensor_id
+        if column == 4:
+            return reading.location
+        if column == 5:
+            return reading.process_stage
+        if column == 6:
+            return f"{reading.temperature_x10 / 10:.1f}"  # Kontrak menyimpan nilai x10
+        if column == 7:
+            return f"{reading.humidity_x10 / 10:.1f}"
+        return reading.tx_hash
+
+    def update_data(self, readings):
+        timestamps = np.fromiter((reading.timestamp for reading in readings), dtype='int64', count=len(readings))
+        self.beginResetModel()
+        self.readings = readings
+        self.local_times = format_local_array(timestamps.astype('datetime64[s]')).tolist()
+        self.endResetModel()
+
+
+class AuditWorker(QtCore.QObject):
+    """Menjalankan audit InfluxDB vs blockchain (process pool) dari thread terpisah"""
+
+    progress = pyqtSignal(int, int, str)  # chunk selesai, total chunk, ringkasan sementara
+    finished = pyqtSignal(object)  # AuditReport
+    failed = pyqtSignal(str)  # pesan error
+
+    def __init__(self, config, start, end):
+        super().__init__()
+        self.config = config
+        self.start = start  # Detik unix
+        self.end = end
+        self.cancel_requested = False
+
+    def cancel(self):
+        """Dipanggil dari thread GUI; chunk yang sedang berjalan diselesaikan dulu"""
+        self.cancel_requested = True
+
+    def run(self):
+        try:
+            from chain_audit import run_audit
+            report = run_audit(
+                self.config, self.start, self.end,
+                progress=lambda report: self.progress.emit(report.done, report.chunks, report.summary()),
+                cancelled=lambda: self.cancel_requested)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(report)
@@ -0,0 +1,512 @@
+"""Pembaca riwayat on-chain kontrak Fermentation lewat event NewReading dan BatchAnchored.
+
+Alih-alih getReadingCount() lalu satu RPC sensorReadings(i) per indeks, log
+NewReading diambil per halaman rentang blok (eth_getLogs) secara paralel,
+didekode sekaligus, lalu disimpan ke indeks SQLite lokal. Sinkronisasi
+berikutnya hanya membaca blok setelah blok terakhir yang sudah diindeks.
+
+Sejak tcp_server meng-anchor pembacaan per batch, pembacaan baru tidak lagi
+memancarkan NewReading: yang ada di chain hanya root Merkle per batch (event
+BatchAnchored). Isi batch diambil dari file proof tcp_server
+(anchor_proofs.jsonl); setiap proof dicek sekali saat diimpor, dan pembacaan
+hanya dianggap on-chain jika root-nya ada di log BatchAnchored.
+
+Contoh:
+  python chain_reader.py
+  python chain_reader.py --rpc http://127.0.0.1:8545 --contract 0x5FbDB2315678afecb367f032d93F642f64180aa3
+"""
+import argparse
+import concurrent.futures
+import json
+import os
+import sqlite3
+import threading
+import urllib.request
+from collections import namedtuple
+
+
+DEFAULT_RPC_URL = "http://127.0.0.1:8545"
+DEFAULT_CONTRACT = "0x5FbDB2315678afecb367f032d93F642f64180aa3"  # Alamat deploy pertama di Hardhat
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".sht20_dashboard", "chain_index.sqlite3")
+DEFAULT_PROOF_PATH = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, "tcp_server", "anchor_proofs.jsonl"))
+# keccak256("NewReading(uint256,string,string,string,uint256,int256,uint256)")
+NEW_READING_TOPIC = "0xa410fde5ffaba2b9c7cf05ad32cfc19ac67b0b4f6184dd647d521206e6892327"
+# keccak256("BatchAnchored(uint256,bytes32,uint256,uint256,uint256)")
+BATCH_ANCHORED_TOPIC = "0xd9ba95f36ed5c35443d7c4baf98742a75715b2d6464915253b350718df9fae8c"
+PROOF_IMPORT_RECORDS = 100  # Baris (batch) file proof per transaksi SQLite
+PAGE_BLOCKS = 2_000  # Rentang blok per request eth_getLogs
+MIN_PAGE_BLOCKS = 1
+
+# batch_id terisi untuk pembacaan yang di-anchor lewat batch (id NewReading-nya None)
+Reading = namedtuple('Reading', [
+    'id', 'block_number', 'log_index', 'tx_hash', 'sensor_id', 'location', 'process_stage',
+    'timestamp', 'temperature_x10', 'humidity_x10', 'batch_id',
+], defaults=(None,))
+
+Batch = namedtuple('Batch', [
+    'batch_id', 'block_number', 'log_index', 'tx_hash', 'merkle_root', 'count', 'first_timestamp',
+    'last_timestamp',
+])
+
+
+class RpcError(Exception):
+    """Error dari node JSON-RPC"""
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.code = code
+
+
+class JsonRpcClient:
+    def __init__(self, url=DEFAULT_RPC_URL, timeout=30):
+        self.url = url
+        self.timeout = timeout
+        self.next_id = 0
+        self.lock = threading.Lock()
+
+    def call(self, method, params):
+        with self.lock:
+            self.next_id += 1
+            request_id = self.next_id
+        body = json.dumps({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params})
+        request = urllib.request.Request(self.url, data=body.encode(),
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            reply = json.load(response)
+        if 'error' in reply:
+            raise RpcError(reply['error'].get('message', str(reply['error'])), reply['error'].get('code'))
+        return reply['result']
+
+    def block_number(self):
+        return int(self.call('eth_blockNumber', []), 16)
+
+    def block_hash(self, number):
+        block = self.call('eth_getBlockByNumber', [hex(number), False])
+        return block['hash'] if block else None
+
+    def get_logs(self, address, topics, from_block, to_block):
+        """Log dengan topic pertama salah satu dari `topics`"""
+        return self.call('eth_getLogs', [{
+            'address': address,
+            'topics': [list(topics)],
+            'fromBlock': hex(from_block),
+            'toBlock': hex(to_block),
+        }])
+
+
+def abi_string(data, offset):
+    """String ABI: satu word panjang lalu byte UTF-8, dimulai di offset"""
+    length = int.from_bytes(data[offset:offset + 32], 'big')
+    return data[offset + 32:offset + 32 + length].decode('utf-8', errors='replace')
+
+
+def decode_new_reading(log):
+    """Mendekode satu log NewReading (id di topics[1], sisanya di data)"""
+    data = bytes.fromhex(log['data'][2:])
+    words = [data[i:i + 32] for i in range(0, 6 * 32, 32)]
+    return Reading(
+        id=int(log['topics'][1], 16),
+        block_number=int(log['blockNumber'], 16),
+        log_index=int(log['logIndex'], 16),
+        tx_hash=log['transactionHash'],
+        sensor_id=abi_string(data, int.from_bytes(words[0], 'big')),
+        location=abi_string(data, int.from_bytes(words[1], 'big')),
+        process_stage=abi_string(data, int.from_bytes(words[2], 'big')),
+        timestamp=int.from_bytes(words[3], 'big'),
+        temperature_x10=int.from_bytes(words[4], 'big', signed=True),
+        humidity_x10=int.from_bytes(words[5], 'big'),
+    )
+
+
+def decode_batch_anchored(log):
+    """Mendekode satu log BatchAnchored (batchId dan root di topics, sisanya di data)"""
+    data = bytes.fromhex(log['data'][2:])
+    count, first_timestamp, last_timestamp = (int.from_bytes(data[i:i + 32], 'big') for i in range(0, 96, 32))
+    return Batch(
+        batch_id=int(log['topics'][1], 16),
+        block_number=int(log['blockNumber'], 16),
+        log_index=int(log['logIndex'], 16),
+        tx_hash=log['transactionHash'],
+        merkle_root=log['topics'][2].lower(),
+        count=count,
+        first_timestamp=first_timestamp,
+        last_timestamp=last_timestamp,
+    )
+
+
+def decode_logs(logs):
+    """Memisahkan log menjadi (pembacaan NewReading, batch BatchAnchored)"""
+    readings, batches = [], []
+    for log in logs:
+        if log.get('removed'):
+            continue
+        if log['topics'][0].lower() == BATCH_ANCHORED_TOPIC:
+            batches.append(decode_batch_anchored(log))
+        else:
+            readings.append(decode_new_reading(log))
+    return readings, batches
+
+
+def proof_rows(records):
+    """Baris anchored_readings dari baris file proof; leaf dihitung ulang dari nilai dan proof dicek ke root"""
+    import numpy as np
+    import merkle
+    anchored = [(record, item) for record in records for item in record['readings']]
+    if not anchored:
+        return []
+    readings = [item['reading'] for _, item in anchored]
+    leaves = merkle.reading_leaves(*zip(*((r['sensor_id'], r['location'], r['process_stage'], r['timestamp'],
+                                          r['temperature_x10'], r['humidity_x10']) for r in readings)))
+    stored_leaves = np.stack([merkle.from_hex(item['leaf']) for _, item in anchored])
+    proofs = [np.array([merkle.from_hex(node) for node in item['proof']], dtype=np.uint8).reshape(-1, 32)
+              for _, item in anchored]
+    roots = np.stack([merkle.from_hex(record['root']) for record, _ in anchored])
+    proof_ok = (leaves == stored_leaves).all(axis=1) & (merkle.fold_proofs(leaves, proofs) == roots).all(axis=1)
+    return [
+        (item['leaf'].lower(), record['root'].lower(), record['tx_hash'], reading['sensor_id'],
+         reading['location'], reading['process_stage'], reading['timestamp'], reading['temperature_x10'],
+         reading['humidity_x10'], json.dumps(item['proof']), int(ok))
+        for (record, item), reading, ok in zip(anchored, readings, proof_ok)
+    ]
+
+
+class ChainIndex:
+    """Indeks SQLite lokal: pembacaan per id, batch yang di-anchor beserta isinya, plus blok terakhir
+    yang sudah disinkronkan"""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS readings (
+                    contract TEXT NOT NULL,
+                    id INTEGER NOT NULL,
+                    block_number INTEGER NOT NULL,
+                    log_index INTEGER NOT NULL,
+                    tx_hash TEXT NOT NULL,
+                    sensor_id TEXT NOT NULL,
+                    location TEXT NOT NULL,
+                    process_stage TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
+                    temperature_x10 INTEGER NOT NULL,
+                    humidity_x10 INTEGER NOT NULL,
+                    PRIMARY KEY (contract, id)
+                )
+            """)
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS readings_block ON readings (contract, block_number)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS readings_sensor_time ON readings (contract, sensor_id, timestamp)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS readings_time ON readings (contract, timestamp)")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS batches (
+                    contract TEXT NOT NULL,
+                    batch_id INTEGER NOT NULL,
+                    block_number INTEGER NOT NULL,
+                    log_index INTEGER NOT NULL,
+                    tx_hash TEXT NOT NULL,
+                    merkle_root TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    first_timestamp INTEGER NOT NULL,
+                    last_timestamp INTEGER NOT NULL,
+                    PRIMARY KEY (contract, batch_id)
+                )
+            """)
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS batches_root ON batches (contract, merkle_root)")
+            # Isi batch dari file proof tcp_server; proof_ok = leaf dan proof cocok dengan root
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS anchored_readings (
+                    contract TEXT NOT NULL,
+                    leaf TEXT NOT NULL,
+                    merkle_root TEXT NOT NULL,
+                    tx_hash TEXT NOT NULL,
+                    sensor_id TEXT NOT NULL,
+                    location TEXT NOT NULL,
+                    process_stage TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
+                    temperature_x10 INTEGER NOT NULL,
+                    humidity_x10 INTEGER NOT NULL,
+                    proof TEXT NOT NULL,
+                    proof_ok INTEGER NOT NULL,
+                    PRIMARY KEY (contract, leaf)
+                )
+            """)
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS anchored_root ON anchored_readings (contract, merkle_root)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS anchored_time ON anchored_readings (contract, timestamp)")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS proof_state (
+                    contract TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    offset INTEGER NOT NULL,
+                    PRIMARY KEY (contract, path)
+                )
+            """)
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    contract TEXT PRIMARY KEY,
+                    last_block INTEGER NOT NULL,
+                    last_block_hash TEXT
+                )
+            """)
+
+    def close(self):
+        self.connection.close()
+
+    def sync_state(self, contract):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT last_block, last_block_hash FROM sync_state WHERE contract = ?", (contract,)).fetchone()
+        return row if row else (None, None)
+
+    def store_page(self, contract, readings, batches, last_block, last_block_hash):
+        """Menyimpan satu halaman dan memajukan blok terakhir dalam satu transaksi"""
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO readings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((contract,) + tuple(reading)[:10] for reading in readings))
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO batches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((contract,) + tuple(batch) for batch in batches))
+            self.connection.execute(
+                "INSERT OR REPLACE INTO sync_state (contract, last_block, last_block_hash) VALUES (?, ?, ?)",
+                (contract, last_block, last_block_hash))
+
+    def reset(self, contract):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM readings WHERE contract = ?", (contract,))
+            self.connection.execute("DELETE FROM batches WHERE contract = ?", (contract,))
+            self.connection.execute("DELETE FROM sync_state WHERE contract = ?", (contract,))
+
+    def import_proofs(self, contract, path):
+        """Mengimpor baris baru file proof tcp_server mulai offset terakhir; mengembalikan jumlah pembacaan.
+
+        Baris terakhir yang belum diakhiri newline (masih ditulis) dibaca di impor berikutnya.
+        """
+        if not os.path.exists(path):
+            return 0
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT offset FROM proof_state WHERE contract = ? AND path = ?", (contract, path)).fetchone()
+        offset = row[0] if row else 0
+        if os.path.getsize(path) < offset:
+            offset = 0  # File diganti atau dipotong
+
+        imported = 0
+        with open(path, 'rb') as file:
+            file.seek(offset)
+            while True:
+                records = []
+                for line in file:
+                    if not line.endswith(b'\n'):
+                        break
+                    offset += len(line)
+                    if line.strip():
+                        records.append(json.loads(line))
+                    if len(records) >= PROOF_IMPORT_RECORDS:
+                        break
+                rows = proof_rows(records)
+                with self.lock, self.connection:
+                    self.connection.executemany(
+                        "INSERT OR REPLACE INTO anchored_readings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        ((contract,) + row for row in rows))
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO proof_state (contract, path, offset) VALUES (?, ?, ?)",
+                        (contract, path, offset))
+                imported += len(rows)
+                if len(records) < PROOF_IMPORT_RECORDS:
+                    return imported
+
+    # Pembacaan on-chain: NewReading, ditambah isi batch yang proof-nya valid dan root-nya ada di BatchAnchored.
+    # Selama tcp_server juga mengirim addReading (SHT20_LEGACY_READINGS) pembacaan yang sama ada di keduanya;
+    # baris NewReading yang dipakai agar tidak terhitung dua kali.
+    ALL_READINGS = """
+        SELECT id, block_number, log_index, tx_hash, sensor_id, location, process_stage, timestamp,
+               temperature_x10, humidity_x10, NULL AS batch_id
+        FROM readings WHERE contract = :contract
+        UNION ALL
+        SELECT NULL, b.block_number, b.log_index, b.tx_hash, a.sensor_id, a.location, a.process_stage,
+               a.timestamp, a.temperature_x10, a.humidity_x10, b.batch_id
+        FROM anchored_readings a JOIN batches b ON b.contract = a.contract AND b.merkle_root = a.merkle_root
+        WHERE a.contract = :contract AND a.proof_ok = 1
+          AND NOT EXISTS (
+              SELECT 1 FROM readings r
+              WHERE r.contract = a.contract AND r.sensor_id = a.sensor_id AND r.timestamp = a.timestamp
+                AND r.location = a.location AND r.process_stage = a.process_stage
+                AND r.temperature_x10 = a.temperature_x10 AND r.humidity_x10 = a.humidity_x10)
+    """
+
+    def count(self, contract, sensor_id=None):
+        query = f"SELECT COUNT(*) FROM ({self.ALL_READINGS})"
+        params = {'contract': contract}
+        if sensor_id:
+            query += " WHERE sensor_id = :sensor_id"
+            params['sensor_id'] = sensor_id
+        with self.lock:
+            return self.connection.execute(query, params).fetchone()[0]
+
+    def sensors(self, contract):
+        with self.lock:
+            return [row[0] for row in self.connection.execute(
+                f"SELECT DISTINCT sensor_id FROM ({self.ALL_READINGS}) ORDER BY sensor_id", {'contract': contract})]
+
+    def readings(self, contract, sensor_id=None, start=None, end=None):
+        """Pembacaan urut blok; start/end berupa unix timestamp (detik)"""
+        query = f"SELECT * FROM ({self.ALL_READINGS}) WHERE 1"
+        params = {'contract': contract}
+        if sensor_id:
+            query += " AND sensor_id = :sensor_id"
+            params['sensor_id'] = sensor_id
+        if start is not None:
+            query += " AND timestamp >= :start"
+            params['start'] = int(start)
+        if end is not None:
+            query += " AND timestamp <= :end"
+            params['end'] = int(end)
+        query += " ORDER BY block_number, log_index, timestamp, sensor_id"
+        with self.lock:
+            return [Reading(*row) for row in self.connection.execute(query, params)]
+
+    def columns(self, contract, start, end):
+        """Kolom NewReading (sensor_id, timestamp, temperature_x10, humidity_x10) untuk start <= timestamp < end"""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT sensor_id, timestamp, temperature_x10, humidity_x10 FROM readings "
+                "WHERE contract = ? AND timestamp >= ? AND timestamp < ?",
+                (contract, int(start), int(end))).fetchall()
+        sensor_ids, timestamps, temperatures, humidities = zip(*rows) if rows else ((), (), (), ())
+        return {
+            'sensor_id': list(sensor_ids),
+            'timestamp': list(timestamps),
+            'temperature_x10': list(temperatures),
+            'humidity_x10': list(humidities),
+        }
+
+    def anchored_columns(self, contract, start, end):
+        """Kolom (leaf, sensor_id, timestamp, temperature_x10, humidity_x10) pembacaan batch yang proof-nya
+        valid dan root-nya sudah tercatat di chain, untuk start <= timestamp < end"""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT a.leaf, a.sensor_id, a.timestamp, a.temperature_x10, a.humidity_x10 "
+                "FROM anchored_readings a JOIN batches b "
+                "ON b.contract = a.contract AND b.merkle_root = a.merkle_root "
+                "WHERE a.contract = ? AND a.proof_ok = 1 AND a.timestamp >= ? AND a.timestamp < ?",
+                (contract, int(start), int(end))).fetchall()
+        leaves, sensor_ids, timestamps, temperatures, humidities = zip(*rows) if rows else ((),) * 5
+        return {
+            'leaf': list(leaves),
+            'sensor_id': list(sensor_ids),
+            'timestamp': list(timestamps),
+            'temperature_x10': list(temperatures),
+            'humidity_x10': list(humidities),
+        }
+
+    def last_anchored_timestamp(self, contract):
+        """Timestamp pembacaan terbaru yang sudah tercatat di chain (batch atau NewReading), None jika belum ada"""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT MAX(t) FROM (SELECT MAX(last_timestamp) AS t FROM batches WHERE contract = ? "
+                "UNION ALL SELECT MAX(timestamp) FROM readings WHERE contract = ?)",
+                (contract, contract)).fetchone()[0]
+
+
+class ChainReader:
+    """Sinkronisasi inkremental log NewReading/BatchAnchored dan file proof ke ChainIndex"""
+
+    def __init__(self, rpc, index, contract=DEFAULT_CONTRACT, page_blocks=PAGE_BLOCKS, workers=4,
+                 proof_path=DEFAULT_PROOF_PATH):
+        self.rpc = rpc
+        self.index = index
+        self.contract = contract.lower()
+        self.page_blocks = page_blocks
+        self.workers = workers
+        self.proof_path = proof_path
+
+    def fetch_range(self, from_block, to_block):
+        """(pembacaan, batch) dalam rentang blok; rentang dibelah dua jika node menolak karena hasil terlalu besar"""
+        try:
+            return decode_logs(self.rpc.get_logs(
+                self.contract, (NEW_READING_TOPIC, BATCH_ANCHORED_TOPIC), from_block, to_block))
+        except RpcError:
+            if to_block - from_block + 1 <= MIN_PAGE_BLOCKS:
+                raise
+            middle = (from_block + to_block) // 2
+            (readings, batches), (more_readings, more_batches) = \
+                self.fetch_range(from_block, middle), self.fetch_range(middle + 1, to_block)
+            return readings + more_readings, batches + more_batches
+
+    def start_block(self):
+        """Blok awal sinkronisasi; indeks direset jika chain berubah (misal node Hardhat di-restart)"""
+        last_block, last_hash = self.index.sync_state(self.contract)
+        if last_block is None:
+            return 0
+        if self.rpc.block_hash(last_block) != last_hash:
+            self.index.reset(self.contract)
+            return 0
+        return last_block + 1
+
+    def sync(self, progress=None, cancelled=lambda: False):
+        """Mengambil log baru lalu mengimpor proof baru; mengembalikan jumlah pembacaan baru.
+
+        Halaman diambil paralel tetapi disimpan berurutan, jadi blok terakhir di
+        indeks selalu berarti semua blok sebelumnya sudah lengkap.
+        """
+        added = self.sync_logs(progress, cancelled)
+        if not cancelled():
+            added += self.index.import_proofs(self.contract, self.proof_path)
+        return added
+
+    def sync_logs(self, progress=None, cancelled=lambda: False):
+        head = self.rpc.block_number()
+        start = self.start_block()
+        if start > head:
+            return 0
+        pages = [(page_start, min(page_start + self.page_blocks - 1, head))
+                 for page_start in range(start, head + 1, self.page_blocks)]
+
+        added = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.fetch_range, *page) for page in pages]
+            try:
+                for done, ((_, page_end), future) in enumerate(zip(pages, futures), start=1):
+                    readings, batches = future.result()
+                    if cancelled():
+                        break
+                    self.index.store_page(self.contract, readings, batches, page_end, self.rpc.block_hash(page_end))
+                    added += len(readings)
+                    if progress is not None:
+                        progress(done, len(pages), added)
+            finally:
+                for future in futures:
+                    future.cancel()
+        return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sinkronisasi event NewReading/BatchAnchored ke indeks SQLite lokal")
+    parser.add_argument("--rpc", default=DEFAULT_RPC_URL)
+    parser.add_argument("--contract", default=DEFAULT_CONTRACT)
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH)
+    parser.add_argument("--page-blocks", type=int, default=PAGE_BLOCKS)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--proofs", default=DEFAULT_PROOF_PATH, help="File proof batch dari tcp_server")
+    args = parser.parse_args()
+
+    index = ChainIndex(args.index)
+    reader = ChainReader(JsonRpcClient(args.rpc), index, args.contract, args.page_blocks, args.workers,
+                         args.proofs)
+    added = reader.sync(progress=lambda done, total, added: print(
+        f"\rHalaman {done}/{total}, {added} pembacaan baru", end="", flush=True))
+    print(f"\n{added} pembacaan baru, total {index.count(reader.contract)} di {args.index}")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
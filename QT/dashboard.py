@@ -0,0 +1,1453 @@
+import sys
+from startup_profile import profile
+profile.start()
+from PyQt6 import QtWidgets, QtCore, QtGui
+from PyQt6.QtWidgets import QMessageBox, QFileDialog, QInputDialog
+from PyQt6.QtCore import QTimer, QDateTime, QThread, pyqtSignal
+from ui_mainwindow import Ui_MainWindow
+from data_worker import DataWorker
+from downsample import minmax_downsample, visible_slice
+from series_store import SeriesStore
+from sensor_table_model import SensorTableModel
+from alert_rules import AlertEngine
+from history_cache import HistoryCache
+from metrics import Metrics, MetricsServer, StageTimer
+from chain_reader import ChainIndex, DEFAULT_CONTRACT, DEFAULT_RPC_URL
+from chain_history import AuditWorker, ChainHistoryModel, ChainSyncWorker
+from live_feed import LiveFeedClient, DEFAULT_LIVE_ADDRESS
+from tile_cache import TileCache, LEVEL_LABELS, choose_level
+from history_browser import TileWorker
+from poll_scheduler import PollScheduler
+from sensor_registry import SensorRegistry
+from local_time import TIMEZONE, format_local, nearest_index, to_local
+import collections
+import datetime
+import os
+import time
+import numpy as np
+
+# Modul berat (matplotlib, pandas, influxdb_client, openpyxl) diimport
+# saat pertama dibutuhkan agar jendela tampil lebih dulu
+profile.mark("import modul awal selesai")
+
+
+class MonitoringApp(QtWidgets.QMainWindow, Ui_MainWindow):
+    fetch_requested = pyqtSignal(object)  # Dikirim ke DataWorker di thread terpisah
+    preload_requested = pyqtSignal()  # Import modul query di thread worker
+    cache_load_requested = pyqtSignal()  # Warm start dari cache lokal di thread worker
+    live_batch_requested = pyqtSignal(object)  # Pembacaan live feed untuk disimpan worker
+    history_requested = pyqtSignal(object)  # Permintaan tile riwayat ke TileWorker
+
+    def __init__(self, history_cache=None):
+        super().__init__()
+        self.setupUi(self)
+
+        # Konfigurasi InfluxDB
+        self.influx_url = "http://localhost:8086"
+        self.influx_org = "INSTITUT TEKNOLOGI SEPULUH NOPEMBER"
+        self.influx_token = "GZKhRQMga9uSiicCSmv9TliMjGNC0lakXimPMnuhvMQc3MZrmNoG339JTJc0o0A0vBnVlpA_wzp_GCrUXL6MsA=="
+        self.influx_bucket = "Tank T-101"
+
+        # Inisialisasi variabel
+        self.client = None
+        self.query_api = None
+        self.update_interval = 10000  # 10 detik (interval dasar, disesuaikan oleh scheduler)
+        # Satu pemilik timer polling: tick tidak pernah dobel meski Start/Stop berulang
+        self.scheduler = PollScheduler(self.update_interval, parent=self)
+        self.scheduler.tick.connect(self.update_data)
+        self.temp_range = (24.0, 30.0)  # Default range suhu (min, max)
+        self.humidity_range = (50.0, 70.0)  # Default range kelembaban (min, max)
+        self.alert_cooldown = 300  # Cooldown 5 menit per aturan per sensor (dalam detik)
+        self.alert_lookback = datetime.timedelta(minutes=5)  # Saat full resync, hanya alert data terbaru
+        self.alert_engine = AlertEngine(self.temp_range, self.humidity_range, self.alert_cooldown)
+        self.alert_queue = collections.deque(maxlen=50)  # Alert yang belum ditutup operator
+
+        # Mode fetch inkremental: hanya ambil data setelah timestamp terakhir
+        self.fields = ("temperature_celsius", "humidity_percent")
+        self.window_duration = datetime.timedelta(hours=24)  # Rentang tampilan chart
+        self.resync_gap = datetime.timedelta(minutes=5)  # Jeda maksimum sebelum full resync
+        self.full_resync_requested = False  # Fetch pertama otomatis penuh jika store/cache kosong
+
+        # Satu penyimpanan data untuk chart, tabel, alert dan ekspor
+        self.sensor_ids = None  # Sensor yang dimonitor; None = semua sensor di bucket
+        self.sensor_id = "SHT20-001"  # Sensor yang sedang ditampilkan di chart dan tabel
+        self.store_capacity = 100_000  # Titik maksimum per sensor per field
+        self.store = SeriesStore(capacity=self.store_capacity, retention=self.window_duration)
+
+        # Metadata sensor (lokasi, tahap proses) dari tag InfluxDB; label header hanya diubah jika berubah
+        self.sensor_registry = SensorRegistry(ttl=600)
+        self.header_metadata = None  # (sensor_id, lokasi, tahap proses) yang sedang tampil
+
+        # Cache riwayat di disk: data terakhir langsung tampil saat aplikasi dibuka
+        self.history_cache = history_cache or HistoryCache(retention=datetime.timedelta(days=7))
+
+        # Query dan pengolahan data berjalan di thread worker agar GUI tidak freeze
+        self.fetch_request_id = 0
+        self.fetch_in_progress = False
+        self.worker_thread = QThread(self)
+        self.worker = DataWorker(self.store, self.fields, self.window_duration, self.resync_gap,
+                                 self.history_cache, self.sensor_registry)
+        self.worker.moveToThread(self.worker_thread)
+        self.fetch_requested.connect(self.worker.fetch)
+        self.cache_load_requested.connect(self.worker.load_cache)
+        self.preload_requested.connect(self.worker.preload)
+        self.worker.data_ready.connect(self.on_data_ready)
+        self.worker.fetch_failed.connect(self.on_fetch_failed)
+        self.worker.cache_loaded.connect(self.on_cache_loaded)
+        self.worker.cache_failed.connect(self.on_cache_failed)
+        self.live_batch_requested.connect(self.worker.ingest)
+        self.worker.live_ready.connect(self.on_live_ready)
+        self.worker.live_failed.connect(self.on_cache_failed)
+        self.worker_thread.start()
+
+        # Metrik setiap tahapan update_data: statusbar, log JSON dan endpoint Prometheus opsional
+        self.metrics = Metrics()
+        self.metrics_port = int(os.environ.get("SHT20_METRICS_PORT", 0)) or None  # Misal 9108
+        self.metrics_server = None
+        self.fetch_started = None
+
+        # Mode live: pembacaan di-push oleh tcp_server, InfluxDB hanya untuk backfill
+        self.live_feed = LiveFeedClient(os.environ.get("SHT20_LIVE_FEED", DEFAULT_LIVE_ADDRESS), self)
+        self.live_feed.readings_received.connect(self.on_live_readings)
+        self.live_feed.connected.connect(self.on_live_connected)
+        self.live_feed.disconnected.connect(self.on_live_disconnected)
+        self.live_feed.lagged.connect(self.request_backfill)
+        self.live_pending = []  # Pembacaan yang ditahan selama fetch/backfill berjalan
+        self.live_pending_limit = 100_000
+
+        # Riwayat panjang: tile min/mean/max per level dari InfluxDB, di-cache LRU di thread sendiri
+        self.history_request_id = 0
+        self.history_charts = {}  # field -> dict berisi ax, garis rata-rata dan area min-maks
+        self.history_prefetch = 0.5  # Rentang tambahan di kiri/kanan tampilan (fraksi lebar) untuk pan
+        self.history_thread = QThread(self)
+        self.history_worker = TileWorker(TileCache(max_tiles=512), self.fields)
+        self.history_worker.moveToThread(self.history_thread)
+        self.history_requested.connect(self.history_worker.load)
+        self.history_worker.tiles_ready.connect(self.on_history_ready)
+        self.history_worker.failed.connect(self.on_history_failed)
+        self.history_thread.start()
+
+        # Artist chart dibuat sekali lalu hanya datanya yang diperbarui
+        self.charts = {}  # field -> dict berisi ax, canvas, line, garis set point, dll
+        self.live_x_margin = 0.05  # Ruang kosong di kanan sumbu x (fraksi window)
+
+        # Ekspor berjalan di thread terpisah
+        self.export_thread = None
+        self.export_worker = None
+        self.export_sources = {
+            "Data di memori (tabel saat ini)": None,
+            "7 hari terakhir dari InfluxDB": 7,
+            "30 hari terakhir dari InfluxDB": 30,
+        }
+
+        # Riwayat on-chain (event NewReading) diindeks lokal, sinkronisasi di thread terpisah
+        self.chain_rpc_url = os.environ.get("SHT20_CHAIN_RPC", DEFAULT_RPC_URL)
+        self.chain_contract = os.environ.get("SHT20_CHAIN_CONTRACT", DEFAULT_CONTRACT).lower()
+        self.chain_index = ChainIndex()
+        self.chain_thread = None
+        self.chain_worker = None
+        self.audit_thread = None
+        self.audit_worker = None
+        self.audit_display_limit = 5_000  # Baris selisih maksimum di tabel audit
+
+        # Setup UI tambahan; chart (matplotlib) dibuat setelah first paint
+        self.setup_table()
+        self.setup_export_progress()
+        self.setup_alert_banner()
+        self.setup_sensor_selector()
+        self.setup_overview()
+        self.setup_history_browser()
+        self.setup_chain_history()
+        self.setup_audit()
+        self.setup_live_toggle()
+        self.setup_poll_status()
+        self.setup_metrics()
+
+        # Set nilai default untuk input range
+        self.tempMinInput.setText(str(self.temp_range[0]))
+        self.tempMaxInput.setText(str(self.temp_range[1]))
+        self.humidityMinInput.setText(str(self.humidity_range[0]))
+        self.humidityMaxInput.setText(str(self.humidity_range[1]))
+
+        # Hubungkan signal
+        self.startButton.clicked.connect(self.start_monitoring)
+        self.stopButton.clicked.connect(self.stop_monitoring)
+        self.setPointButton.clicked.connect(self.update_setpoints)
+        self.exportButton.clicked.connect(self.export_to_excel)
+        self.refreshButton.clicked.connect(self.request_full_resync)
+        self.refreshButton.clicked.connect(self.refresh_table)
+
+        # Awalnya nonaktifkan tombol stop
+        self.stopButton.setEnabled(False)
+
+        # Muat cache lokal; fetch pertama nanti hanya mengambil ekor yang belum ada.
+        # Setelah itu worker mengimpor pandas/influxdb_client di background.
+        self.cache_load_requested.emit()
+        self.preload_requested.emit()
+        profile.mark("jendela dibuat")
+
+    def on_first_paint(self):
+        """Dipanggil sekali setelah jendela pertama kali tampil"""
+        first_paint = profile.mark("first paint")
+        self.setup_charts()
+        profile.mark("chart siap")
+        profile.stop()
+        profile.print_report()
+        self.statusbar.showMessage(f"Jendela tampil dalam {first_paint * 1000:.0f} ms", 5000)
+
+    def setup_charts(self):
+        """Menyiapkan grafik untuk Tab 1"""
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
+        from matplotlib.figure import Figure
+
+        self.temp_figure = Figure()
+        self.temp_canvas = FigureCanvas(self.temp_figure)
+        self.temp_ax = self.temp_figure.add_subplot(111)
+        temp_toolbar = NavigationToolbar(self.temp_canvas, self)
+        temp_layout = QtWidgets.QVBoxLayout()
+        temp_layout.addWidget(temp_toolbar)
+        temp_layout.addWidget(self.temp_canvas)
+        self.temperatureChartView.setLayout(temp_layout)
+        self.setup_chart_artists("temperature_celsius", self.temp_ax, self.temp_canvas,
+                                 temp_toolbar, 'Suhu (°C)', self.temp_range)
+
+        self.humidity_figure = Figure()
+        self.humidity_canvas = FigureCanvas(self.humidity_figure)
+        self.humidity_ax = self.humidity_figure.add_subplot(111)
+        humidity_toolbar = NavigationToolbar(self.humidity_canvas, self)
+        humidity_layout = QtWidgets.QVBoxLayout()
+        humidity_layout.addWidget(humidity_toolbar)
+        humidity_layout.addWidget(self.humidity_canvas)
+        self.humidityChartView.setLayout(humidity_layout)
+        self.setup_chart_artists("humidity_percent", self.humidity_ax, self.humidity_canvas,
+                                 humidity_toolbar, 'Kelembaban (%)', self.humidity_range)
+
+        # Data yang sudah ada (misal dari cache) sebelum chart dibuat
+        for field in self.fields:
+            times, values = self.store.series(self.sensor_id, field)
+            if len(values):
+                self.update_chart(field, times, values)
+
+    def setup_metrics(self):
+        """Label histogram refresh di statusbar dan endpoint /metrics jika port diisi"""
+        self.metricsLabel = QtWidgets.QLabel(self)
+        self.statusbar.addPermanentWidget(self.metricsLabel)
+        if self.metrics_port:
+            try:
+                self.metrics_server = MetricsServer(self.metrics, self.metrics_port)
+                self.metrics_server.start()
+            except OSError as e:
+                self.statusbar.showMessage(f"Endpoint metrik tidak bisa dibuka: {str(e)}", 10000)
+
+    def update_metrics_label(self):
+        self.metricsLabel.setText(self.metrics.status_text())
+        self.metricsLabel.setToolTip(self.metrics.detail_text())
+
+    def setup_chart_artists(self, field, ax, canvas, toolbar, title, setpoint_range):
+        """Membuat artist chart sekali: garis data, garis set point, area range, legend"""
+        import matplotlib.dates as mdates
+        range_min, range_max = setpoint_range
+
+        # Garis data dibuat animated agar bisa di-blit tanpa menggambar ulang seluruh figure
+        line, = ax.plot([], [], 'b-', animated=True)
+        min_line = ax.axhline(y=range_min, color='r', linestyle='--', label='Range Min')
+        max_line = ax.axhline(y=range_max, color='r', linestyle='--', label='Range Max')
+        span = ax.axhspan(range_min, range_max, color='green', alpha=0.1)
+
+        # Tooltip hover: satu penanda dan satu anotasi, ikut di-blit bersama garis data
+        marker, = ax.plot([], [], 'o', color='orange', animated=True, visible=False)
+        annotation = ax.annotate("", xy=(0, 0), xytext=(10, 10), textcoords='offset points',
+                                 bbox=dict(boxstyle='round', fc='lightyellow', alpha=0.9),
+                                 animated=True, visible=False)
+
+        ax.legend()
+        ax.set_title(title)
+        ax.set_xlabel('Waktu (WIB)')
+        ax.set_ylabel(title.split(' ')[0])
+        ax.grid(True)
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S', tz=TIMEZONE))
+        ax.tick_params(axis='x', labelrotation=45)
+
+        chart = {
+            'field': field,
+            'ax': ax,
+            'canvas': canvas,
+            'toolbar': toolbar,
+            'title': title,
+            'line': line,
+            'min_line': min_line,
+            'max_line': max_line,
+            'span': span,
+            'background': None,
+            'times': None,  # Data lengkap
+            'values': None,
+            'marker': marker,
+            'annotation': annotation,
+            'hover_index': None,  # Indeks sampel (data lengkap) yang sedang ditampilkan tooltip
+        }
+        self.charts[field] = chart
+
+        # Setiap full draw: simpan background lalu gambar garis data di atasnya
+        canvas.mpl_connect('draw_event', lambda event, chart=chart: self.on_chart_draw(chart))
+
+        # Zoom/pan dari NavigationToolbar atau resize: hitung ulang downsampling
+        ax.callbacks.connect('xlim_changed', lambda axes, chart=chart: self.refresh_chart_line(chart))
+        canvas.mpl_connect('resize_event', lambda event, chart=chart: self.refresh_chart_line(chart))
+
+        canvas.mpl_connect('motion_notify_event', lambda event, chart=chart: self.on_chart_hover(chart, event))
+        canvas.mpl_connect('axes_leave_event', lambda event, chart=chart: self.hide_hover(chart))
+
+    def on_chart_hover(self, chart, event):
+        """Tooltip sampel terdekat: binary search pada data lengkap, hanya titik itu yang diformat"""
+        times = chart['times']
+        if event.inaxes is not chart['ax'] or event.xdata is None or times is None or not len(times):
+            self.hide_hover(chart)
+            return
+        import matplotlib.dates as mdates
+        target = np.datetime64(mdates.num2date(event.xdata).replace(tzinfo=None), 'ns')
+        index = nearest_index(times, target)
+        if index == chart['hover_index']:
+            return
+        chart['hover_index'] = index
+
+        time, value = times[index], chart['values'][index]
+        marker, annotation = chart['marker'], chart['annotation']
+        marker.set_data([time], [value])
+        annotation.xy = (mdates.date2num(time), value)
+        annotation.set_text(f"{chart['title'].split(' ')[0]}: {value:.2f}\nWaktu: {format_local(time)}")
+        # Di separuh kanan chart tooltip digeser ke kiri agar tidak terpotong
+        right_half = event.x > chart['ax'].bbox.x0 + chart['ax'].bbox.width / 2
+        annotation.set_horizontalalignment('right' if right_half else 'left')
+        annotation.set_position((-10 if right_half else 10, 10))
+        marker.set_visible(True)
+        annotation.set_visible(True)
+        self.blit_chart(chart)
+
+    def hide_hover(self, chart, redraw=True):
+        if chart['hover_index'] is None:
+            return
+        chart['hover_index'] = None
+        chart['marker'].set_visible(False)
+        chart['annotation'].set_visible(False)
+        if redraw:
+            self.blit_chart(chart)
+
+    def draw_animated(self, chart):
+        """Menggambar artist animated (garis data dan tooltip) di atas background"""
+        ax = chart['ax']
+        ax.draw_artist(chart['line'])
+        if chart['hover_index'] is not None:
+            ax.draw_artist(chart['marker'])
+            ax.draw_artist(chart['annotation'])
+
+    def blit_chart(self, chart):
+        """Pulihkan background lalu gambar ulang artist animated saja"""
+        canvas = chart['canvas']
+        if chart['background'] is None:
+            canvas.draw_idle()
+            return
+        canvas.restore_region(chart['background'])
+        self.draw_animated(chart)
+        canvas.blit(chart['ax'].bbox)
+
+    def on_chart_draw(self, chart):
+        """Dipanggil setelah full draw untuk menyimpan background blitting"""
+        canvas, ax = chart['canvas'], chart['ax']
+        chart['background'] = canvas.copy_from_bbox(ax.bbox)
+        self.draw_animated(chart)
+        canvas.blit(ax.bbox)
+
+    def setpoint_range(self, field):
+        """Range set point (min, max) untuk field tertentu"""
+        return self.temp_range if field == "temperature_celsius" else self.humidity_range
+
+    def update_setpoint_artists(self):
+        """Memindahkan garis dan area set point tanpa membuat ulang chart"""
+        for field, chart in self.charts.items():
+            range_min, range_max = self.setpoint_range(field)
+            chart['min_line'].set_ydata([range_min, range_min])
+            chart['max_line'].set_ydata([range_max, range_max])
+            chart['span'].remove()
+            chart['span'] = chart['ax'].axhspan(range_min, range_max, color='green', alpha=0.1)
+            if chart['times'] is not None and len(chart['times']):
+                chart['background'] = None
+                self.chart_limits_changed(chart, chart['times'], chart['values'])
+            chart['canvas'].draw_idle()
+
+    def setup_table(self):
+        """Menyiapkan tabel untuk Tab 2"""
+        self.table_model = SensorTableModel(self.temp_range, self.humidity_range, self)
+        self.tableWidget.setModel(self.table_model)
+        self.tableWidget.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Stretch)
+        self.tableWidget.setSortingEnabled(True)
+        self.tableWidget.sortByColumn(0, QtCore.Qt.SortOrder.AscendingOrder)
+
+    def setup_export_progress(self):
+        """Menyiapkan progress bar dan tombol batal ekspor di statusbar"""
+        self.exportProgress = QtWidgets.QProgressBar(self)
+        self.exportProgress.setMaximumWidth(250)
+        self.exportCancelButton = QtWidgets.QPushButton("Batal Ekspor", self)
+        self.exportCancelButton.clicked.connect(self.cancel_export)
+        self.statusbar.addPermanentWidget(self.exportProgress)
+        self.statusbar.addPermanentWidget(self.exportCancelButton)
+        self.exportProgress.hide()
+        self.exportCancelButton.hide()
+
+    def setup_alert_banner(self):
+        """Banner alert non-modal di atas chart (tidak menghentikan akuisisi data)"""
+        self.alertBanner = QtWidgets.QFrame(self.dashboard)
+        self.alertBanner.setStyleSheet(
+            "QFrame { background-color: #ffc8c8; border: 1px solid #d32f2f; border-radius: 4px; }")
+        banner_layout = QtWidgets.QHBoxLayout(self.alertBanner)
+        self.alertLabel = QtWidgets.QLabel(self.alertBanner)
+        self.alertLabel.setWordWrap(True)
+        self.alertCountLabel = QtWidgets.QLabel(self.alertBanner)
+        self.alertDismissButton = QtWidgets.QPushButton("Tutup", self.alertBanner)
+        self.alertDismissButton.clicked.connect(self.dismiss_alert)
+        banner_layout.addWidget(self.alertLabel, 1)
+        banner_layout.addWidget(self.alertCountLabel)
+        banner_layout.addWidget(self.alertDismissButton)
+        self.verticalLayout.insertWidget(1, self.alertBanner)
+        self.alertBanner.hide()
+
+    def setup_sensor_selector(self):
+        """Pilihan sensor yang ditampilkan di chart dan tabel"""
+        self.sensorSelector = QtWidgets.QComboBox(self.frame_5)
+        self.sensorSelector.setMinimumWidth(180)
+        self.sensorSelector.addItem(self.sensor_id)
+        self.horizontalLayout_3.insertWidget(0, QtWidgets.QLabel("Sensor:", self.frame_5))
+        self.horizontalLayout_3.insertWidget(1, self.sensorSelector)
+        self.sensorSelector.currentTextChanged.connect(self.select_sensor)
+
+    def setup_live_toggle(self):
+        """Pilihan mode live (push dari tcp_server) dan statusnya di statusbar"""
+        self.liveCheckBox = QtWidgets.QCheckBox("Mode Live", self.frame_5)
+        self.liveCheckBox.setChecked(True)
+        self.liveCheckBox.setToolTip(f"Terima data baru langsung dari live feed {self.live_feed.host}:"
+                                     f"{self.live_feed.port}; polling InfluxDB hanya jika feed terputus")
+        self.liveCheckBox.toggled.connect(self.toggle_live)
+        self.horizontalLayout_3.insertWidget(2, self.liveCheckBox)
+        self.liveLabel = QtWidgets.QLabel(self)
+        self.statusbar.addPermanentWidget(self.liveLabel)
+
+    def setup_poll_status(self):
+        """Status polling di statusbar; polling diperlambat saat tab tanpa data live dibuka"""
+        self.pollLabel = QtWidgets.QLabel(self)
+        self.statusbar.addPermanentWidget(self.pollLabel)
+        self.live_tabs = (self.dashboard, self.tab_2, self.overviewTab)
+        self.redraw_pending = False  # Data baru masuk saat tab live tidak terlihat
+        self.tabWidget.currentChanged.connect(self.update_poll_visibility)
+
+    def live_view_visible(self):
+        return self.tabWidget.currentWidget() in self.live_tabs
+
+    def update_poll_visibility(self):
+        """Data dan alert tetap diperbarui di tab lain; hanya chart/tabel yang ditunda"""
+        visible = self.live_view_visible()
+        self.scheduler.set_slow("tab", not visible)
+        if visible and self.redraw_pending:
+            self.redraw_live_views()
+        self.update_poll_label()
+
+    def redraw_live_views(self):
+        """Menggambar ulang chart, tabel data dan ringkasan dari store"""
+        self.redraw_pending = False
+        for field in self.fields:
+            times, values = self.store.series(self.sensor_id, field)
+            if len(values):
+                self.update_chart(field, times, values)
+        self.update_data_table(self.store.table_columns(self.sensor_id))
+        self.update_overview()
+
+    def update_poll_label(self):
+        self.pollLabel.setText(self.scheduler.status_text())
+
+    def changeEvent(self, event):
+        """Jendela diminimalkan: polling diperlambat, alert tetap berjalan"""
+        if event.type() == QtCore.QEvent.Type.WindowStateChange:
+            self.scheduler.set_slow("minimized", self.isMinimized())
+            self.update_poll_label()
+        super().changeEvent(event)
+
+    def setup_overview(self):
+        """Tab ringkasan semua sensor (nilai terakhir per sensor)"""
+        self.overviewTab = QtWidgets.QWidget()
+        overview_layout = QtWidgets.QVBoxLayout(self.overviewTab)
+        self.overviewTable = QtWidgets.QTableWidget(self.overviewTab)
+        self.overviewTable.setColumnCount(6)
+        self.overviewTable.setHorizontalHeaderLabels([
+            "Sensor ID",
+            "Lokasi",
+            "Tahap Proses",
+            "Suhu (°C)",
+            "Kelembaban (%)",
+            "Data Terakhir"
+        ])
+        self.overviewTable.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Stretch)
+        self.overviewTable.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.overviewTable.cellDoubleClicked.connect(
+            lambda row, column: self.sensorSelector.setCurrentText(self.overviewTable.item(row, 0).text()))
+        overview_layout.addWidget(self.overviewTable)
+        self.tabWidget.addTab(self.overviewTab, "Ringkasan Sensor")
+
+    def setup_history_browser(self):
+        """Tab riwayat data jangka panjang dengan pilihan rentang tanggal"""
+        self.historyTab = QtWidgets.QWidget()
+        history_layout = QtWidgets.QVBoxLayout(self.historyTab)
+        controls = QtWidgets.QHBoxLayout()
+        self.historySensorSelector = QtWidgets.QComboBox(self.historyTab)
+        self.historySensorSelector.setEditable(True)  # Sensor lama yang tidak ada di store bisa diketik
+        self.historySensorSelector.setMinimumWidth(180)
+        self.historySensorSelector.addItem(self.sensor_id)
+        self.historySensorSelector.currentTextChanged.connect(lambda text: self.history_debounce.start())
+        now = QDateTime.currentDateTime()
+        self.historyStartEdit = QtWidgets.QDateTimeEdit(now.addDays(-30), self.historyTab)
+        self.historyEndEdit = QtWidgets.QDateTimeEdit(now, self.historyTab)
+        for edit in (self.historyStartEdit, self.historyEndEdit):
+            edit.setCalendarPopup(True)
+            edit.setDisplayFormat("yyyy-MM-dd HH:mm")
+        self.historyShowButton = QtWidgets.QPushButton("Tampilkan", self.historyTab)
+        self.historyShowButton.clicked.connect(self.show_history)
+        self.historyLevelLabel = QtWidgets.QLabel(self.historyTab)
+        controls.addWidget(QtWidgets.QLabel("Sensor:", self.historyTab))
+        controls.addWidget(self.historySensorSelector)
+        controls.addWidget(QtWidgets.QLabel("Dari:", self.historyTab))
+        controls.addWidget(self.historyStartEdit)
+        controls.addWidget(QtWidgets.QLabel("Sampai:", self.historyTab))
+        controls.addWidget(self.historyEndEdit)
+        controls.addWidget(self.historyShowButton)
+        controls.addWidget(self.historyLevelLabel, 1)
+        history_layout.addLayout(controls)
+
+        # Chart (matplotlib) dibuat saat riwayat pertama kali ditampilkan
+        self.historyChartLayout = QtWidgets.QVBoxLayout()
+        history_layout.addLayout(self.historyChartLayout, 1)
+
+        # Zoom/pan memicu banyak xlim_changed; tile baru diminta setelah gerakan berhenti
+        self.history_debounce = QTimer(self)
+        self.history_debounce.setSingleShot(True)
+        self.history_debounce.setInterval(150)
+        self.history_debounce.timeout.connect(self.request_history_tiles)
+        self.tabWidget.addTab(self.historyTab, "Riwayat Data")
+
+    def setup_history_chart(self):
+        """Chart riwayat: garis rata-rata dan area min-maks, sumbu x dipakai bersama"""
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
+        from matplotlib.figure import Figure
+        import matplotlib.dates as mdates
+
+        self.history_figure = Figure()
+        self.history_canvas = FigureCanvas(self.history_figure)
+        temp_ax = self.history_figure.add_subplot(211)
+        humidity_ax = self.history_figure.add_subplot(212, sharex=temp_ax)
+        for field, ax, title in (("temperature_celsius", temp_ax, 'Suhu (°C)'),
+                                 ("humidity_percent", humidity_ax, 'Kelembaban (%)')):
+            line, = ax.plot([], [], 'b-', linewidth=1, label='Rata-rata')
+            ax.set_ylabel(title)
+            ax.grid(True)
+            self.history_charts[field] = {'ax': ax, 'line': line, 'band': None}
+        humidity_ax.set_xlabel('Waktu (WIB)')
+        locator = mdates.AutoDateLocator(tz=TIMEZONE)
+        humidity_ax.xaxis.set_major_locator(locator)
+        humidity_ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator, tz=TIMEZONE))
+        self.history_figure.tight_layout()
+
+        self.history_toolbar = NavigationToolbar(self.history_canvas, self)
+        self.historyChartLayout.addWidget(self.history_toolbar)
+        self.historyChartLayout.addWidget(self.history_canvas)
+        temp_ax.callbacks.connect('xlim_changed', lambda axes: self.history_debounce.start())
+        self.history_canvas.mpl_connect('resize_event', lambda event: self.history_debounce.start())
+
+    def show_history(self):
+        """Menampilkan rentang dari date picker; level dipilih otomatis dari lebar rentang"""
+        import matplotlib.dates as mdates
+        if not self.query_api:
+            QMessageBox.warning(self, "Peringatan", "Mulai monitoring dulu untuk membuka riwayat dari InfluxDB")
+            return
+        start = self.historyStartEdit.dateTime().toSecsSinceEpoch()
+        end = self.historyEndEdit.dateTime().toSecsSinceEpoch()
+        if end <= start:
+            QMessageBox.warning(self, "Peringatan", "Waktu akhir harus setelah waktu awal")
+            return
+        if not self.history_charts:
+            self.setup_history_chart()
+        x_start, x_end = mdates.date2num([datetime.datetime.fromtimestamp(t, datetime.timezone.utc)
+                                          for t in (start, end)])
+        self.history_charts["temperature_celsius"]['ax'].set_xlim(x_start, x_end)
+        self.request_history_tiles()
+
+    def request_history_tiles(self):
+        """Meminta tile untuk rentang yang terlihat (plus prefetch) pada level yang sesuai lebar chart"""
+        if not self.history_charts or not self.query_api:
+            return
+        import matplotlib.dates as mdates
+        self.history_debounce.stop()
+        ax = self.history_charts["temperature_celsius"]['ax']
+        start, end = (mdates.num2date(x).timestamp() for x in ax.get_xlim())
+        span = end - start
+        if span <= 0:
+            return
+        # Dua titik per piksel: min dan maks per kolom piksel tetap terlihat
+        level = choose_level(span, 2 * max(int(ax.bbox.width), 1))
+        margin = span * self.history_prefetch
+
+        self.history_request_id += 1
+        self.history_worker.latest_request = self.history_request_id
+        self.history_requested.emit({
+            'request_id': self.history_request_id,
+            'query_api': self.query_api,
+            'bucket': self.influx_bucket,
+            'sensor_id': self.historySensorSelector.currentText().strip(),
+            'level': level,
+            'start': int(start - margin),
+            'end': int(end + margin) + 1,
+            'now': time.time(),
+        })
+        self.historyLevelLabel.setText(f"Memuat resolusi {LEVEL_LABELS[level]}...")
+
+    def on_history_ready(self, payload):
+        """Mengganti data chart riwayat; batas sumbu x tidak diubah agar zoom/pan tetap"""
+        if payload['request_id'] != self.history_request_id:
+            return
+        points = 0
+        for field, chart in self.history_charts.items():
+            ax = chart['ax']
+            times, minimum, mean, maximum = payload['series'][field]
+            points += len(times)
+            chart['line'].set_data(times, mean)
+            if chart['band'] is not None:
+                chart['band'].remove()
+            chart['band'] = ax.fill_between(times, minimum, maximum, color='b', alpha=0.2, linewidth=0)
+            # Sumbu y mengikuti data kecuali user sedang zoom/pan lewat toolbar
+            if len(times) and not self.history_toolbar.mode:
+                low, high = float(np.nanmin(minimum)), float(np.nanmax(maximum))
+                pad = max((high - low) * 0.05, 0.5)
+                ax.set_ylim(low - pad, high + pad)
+        self.history_canvas.draw_idle()
+        self.historyLevelLabel.setText(
+            f"Resolusi {LEVEL_LABELS[payload['level']]} (garis: rata-rata, area: min-maks), "
+            f"{points} titik; tile: {payload['cached']} dari cache, {payload['fetched']} dari InfluxDB "
+            f"({payload['seconds'] * 1000:.0f} ms)")
+
+    def on_history_failed(self, request_id, message):
+        if request_id != self.history_request_id:
+            return
+        self.historyLevelLabel.setText("Gagal memuat riwayat")
+        self.statusbar.showMessage(f"Gagal memuat riwayat dari InfluxDB: {message}", 10000)
+
+    def setup_chain_history(self):
+        """Tab riwayat blockchain dari indeks lokal event NewReading"""
+        self.chainTab = QtWidgets.QWidget()
+        chain_layout = QtWidgets.QVBoxLayout(self.chainTab)
+        controls = QtWidgets.QHBoxLayout()
+        self.chainSensorFilter = QtWidgets.QComboBox(self.chainTab)
+        self.chainSensorFilter.setMinimumWidth(180)
+        self.chainSensorFilter.addItem("Semua sensor")
+        self.chainSensorFilter.currentTextChanged.connect(self.refresh_chain_history)
+        self.chainSyncButton = QtWidgets.QPushButton("Sinkronkan", self.chainTab)
+        self.chainSyncButton.clicked.connect(self.sync_chain_history)
+        self.chainCancelButton = QtWidgets.QPushButton("Batal", self.chainTab)
+        self.chainCancelButton.clicked.connect(self.cancel_chain_sync)
+        self.chainCancelButton.hide()
+        self.chainStatusLabel = QtWidgets.QLabel(self.chainTab)
+        controls.addWidget(QtWidgets.QLabel("Sensor:", self.chainTab))
+        controls.addWidget(self.chainSensorFilter)
+        controls.addWidget(self.chainSyncButton)
+        controls.addWidget(self.chainCancelButton)
+        controls.addWidget(self.chainStatusLabel, 1)
+        chain_layout.addLayout(controls)
+
+        self.chain_model = ChainHistoryModel(self)
+        self.chainTable = QtWidgets.QTableView(self.chainTab)
+        self.chainTable.setModel(self.chain_model)
+        self.chainTable.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
+        self.chainTable.horizontalHeader().setStretchLastSection(True)
+        chain_layout.addWidget(self.chainTable)
+        self.tabWidget.addTab(self.chainTab, "Riwayat Blockchain")
+        self.refresh_chain_history()
+
+    def refresh_chain_history(self):
+        """Memuat ulang tabel dari indeks lokal (tanpa RPC)"""
+        known = {self.chainSensorFilter.itemText(i) for i in range(self.chainSensorFilter.count())}
+        for sensor_id in self.chain_index.sensors(self.chain_contract):
+            if sensor_id not in known:
+                self.chainSensorFilter.addItem(sensor_id)
+        sensor_id = self.chainSensorFilter.currentText()
+        if self.chainSensorFilter.currentIndex() == 0:
+            sensor_id = None
+        self.chain_model.update_data(self.chain_index.readings(self.chain_contract, sensor_id))
+        last_block, _ = self.chain_index.sync_state(self.chain_contract)
+        synced = "belum disinkronkan" if last_block is None else f"tersinkron sampai blok {last_block}"
+        self.chainStatusLabel.setText(f"{self.chain_model.rowCount()} pembacaan, {synced}")
+
+    def sync_chain_history(self):
+        """Mengambil event NewReading baru dari node di QThread terpisah"""
+        if self.chain_thread is not None:
+            return
+        self.chain_worker = ChainSyncWorker(self.chain_rpc_url, self.chain_contract, self.chain_index)
+        self.chain_thread = QThread(self)
+        self.chain_worker.moveToThread(self.chain_thread)
+        self.chain_thread.started.connect(self.chain_worker.run)
+        self.chain_worker.progress.connect(self.on_chain_progress)
+        self.chain_worker.finished.connect(self.on_chain_finished)
+        self.chain_worker.failed.connect(self.on_chain_failed)
+        self.chainSyncButton.setEnabled(False)
+        self.chainCancelButton.show()
+        self.chainStatusLabel.setText(f"Menyinkronkan dari {self.chain_rpc_url}...")
+        self.chain_thread.start()
+
+    def cancel_chain_sync(self):
+        if self.chain_worker is not None:
+            self.chain_worker.cancel()
+
+    def on_chain_progress(self, done, total, added):
+        self.chainStatusLabel.setText(f"Menyinkronkan: halaman {done}/{total}, {added} pembacaan baru")
+
+    def finish_chain_sync(self):
+        """Membersihkan thread sinkronisasi blockchain"""
+        self.chain_thread.quit()
+        self.chain_thread.wait()
+        self.chain_thread = None
+        self.chain_worker = None
+        self.chainSyncButton.setEnabled(True)
+        self.chainCancelButton.hide()
+
+    def on_chain_finished(self, added):
+        self.finish_chain_sync()
+        self.refresh_chain_history()
+        self.statusbar.showMessage(f"Sinkronisasi blockchain selesai: {added} pembacaan baru", 5000)
+
+    def on_chain_failed(self, message):
+        self.finish_chain_sync()
+        self.refresh_chain_history()
+        QMessageBox.warning(self, "Error", f"Gagal membaca data blockchain: {message}")
+
+    def setup_audit(self):
+        """Tab audit rekonsiliasi InfluxDB vs blockchain"""
+        self.auditTab = QtWidgets.QWidget()
+        audit_layout = QtWidgets.QVBoxLayout(self.auditTab)
+        controls = QtWidgets.QHBoxLayout()
+        now = QDateTime.currentDateTime()
+        self.auditStartEdit = QtWidgets.QDateTimeEdit(now.addDays(-7), self.auditTab)
+        self.auditEndEdit = QtWidgets.QDateTimeEdit(now, self.auditTab)
+        for edit in (self.auditStartEdit, self.auditEndEdit):
+            edit.setCalendarPopup(True)
+            edit.setDisplayFormat("yyyy-MM-dd HH:mm")
+        self.auditButton = QtWidgets.QPushButton("Jalankan Audit", self.auditTab)
+        self.auditButton.clicked.connect(self.start_audit)
+        self.auditCancelButton = QtWidgets.QPushButton("Batal", self.auditTab)
+        self.auditCancelButton.clicked.connect(self.cancel_audit)
+        self.auditCancelButton.hide()
+        self.auditProgress = QtWidgets.QProgressBar(self.auditTab)
+        self.auditProgress.hide()
+        controls.addWidget(QtWidgets.QLabel("Dari:", self.auditTab))
+        controls.addWidget(self.auditStartEdit)
+        controls.addWidget(QtWidgets.QLabel("Sampai:", self.auditTab))
+        controls.addWidget(self.auditEndEdit)
+        controls.addWidget(self.auditButton)
+        controls.addWidget(self.auditCancelButton)
+        controls.addWidget(self.auditProgress, 1)
+        audit_layout.addLayout(controls)
+
+        self.auditSummaryLabel = QtWidgets.QLabel(
+            "Bandingkan data InfluxDB dengan indeks blockchain (sinkronkan di tab Riwayat Blockchain)",
+            self.auditTab)
+        self.auditSummaryLabel.setWordWrap(True)
+        audit_layout.addWidget(self.auditSummaryLabel)
+
+        self.auditTable = QtWidgets.QTableWidget(self.auditTab)
+        self.auditTable.setColumnCount(7)
+        self.auditTable.setHorizontalHeaderLabels([
+            "Jenis",
+            "Sensor ID",
+            "Waktu",
+            "Suhu InfluxDB (°C)",
+            "Suhu Blockchain (°C)",
+            "Kelembaban InfluxDB (%)",
+            "Kelembaban Blockchain (%)"
+        ])
+        self.auditTable.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Stretch)
+        self.auditTable.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        audit_layout.addWidget(self.auditTable)
+        self.tabWidget.addTab(self.auditTab, "Audit Blockchain")
+
+    def start_audit(self):
+        """Audit rentang yang dipilih di process pool lewat QThread terpisah"""
+        if self.audit_thread is not None:
+            return
+        start = self.auditStartEdit.dateTime().toSecsSinceEpoch()
+        end = self.auditEndEdit.dateTime().toSecsSinceEpoch()
+        if end <= start:
+            QMessageBox.warning(self, "Peringatan", "Waktu akhir harus setelah waktu awal")
+            return
+
+        config = {
+            'influx_url': self.influx_url,
+            'influx_org': self.influx_org,
+            'influx_token': self.influx_token,
+            'influx_bucket': self.influx_bucket,
+            'index_path': self.chain_index.path,
+            'contract': self.chain_contract,
+        }
+        self.audit_worker = AuditWorker(config, start, end)
+        self.audit_thread = QThread(self)
+        self.audit_worker.moveToThread(self.audit_thread)
+        self.audit_thread.started.connect(self.audit_worker.run)
+        self.audit_worker.progress.connect(self.on_audit_progress)
+        self.audit_worker.finished.connect(self.on_audit_finished)
+        self.audit_worker.failed.connect(self.on_audit_failed)
+
+        self.auditProgress.setRange(0, 0)  # Sibuk sampai chunk pertama selesai
+        self.auditProgress.show()
+        self.auditCancelButton.show()
+        self.auditButton.setEnabled(False)
+        self.auditSummaryLabel.setText("Menjalankan audit...")
+        self.audit_thread.start()
+
+    def cancel_audit(self):
+        if self.audit_worker is not None:
+            self.audit_worker.cancel()
+
+    def on_audit_progress(self, done, total, summary):
+        self.auditProgress.setRange(0, total)
+        self.auditProgress.setValue(done)
+        self.auditSummaryLabel.setText(summary)
+
+    def finish_audit(self):
+        """Membersihkan thread audit dan progress bar"""
+        self.audit_thread.quit()
+        self.audit_thread.wait()
+        self.audit_thread = None
+        self.audit_worker = None
+        self.auditProgress.hide()
+        self.auditCancelButton.hide()
+        self.auditButton.setEnabled(True)
+
+    def on_audit_finished(self, report):
+        from chain_audit import KIND_LABELS
+        self.finish_audit()
+        self.auditSummaryLabel.setText(report.summary())
+
+        samples = report.samples_frame().head(self.audit_display_limit)
+        # Konversi WIB dan format waktu sekali untuk semua baris
+        local_times = np.datetime_as_string(
+            to_local(samples['timestamp'].to_numpy(dtype='int64').astype('datetime64[s]')), unit='s')
+        self.auditTable.setRowCount(len(samples))
+        for row, sample in enumerate(samples.itertuples(index=False)):
+            values = [sample.temperature_x10_influx, sample.temperature_x10_chain,
+                      sample.humidity_x10_influx, sample.humidity_x10_chain]
+            cells = [KIND_LABELS[sample.kind], sample.sensor_id, local_times[row].replace('T', ' ')]
+            cells += ["-" if value != value else f"{value / 10:.1f}" for value in values]
+            for column, text in enumerate(cells):
+                self.auditTable.setItem(row, column, QtWidgets.QTableWidgetItem(text))
+
+    def on_audit_failed(self, message):
+        self.finish_audit()
+        self.auditSummaryLabel.setText("Audit gagal")
+        QMessageBox.warning(self, "Error", f"Gagal menjalankan audit: {message}")
+
+    def update_sensor_list(self):
+        """Menambahkan sensor baru yang muncul di data ke pilihan sensor"""
+        known = {self.sensorSelector.itemText(i) for i in range(self.sensorSelector.count())}
+        for sensor_id in sorted(set(self.store.sensors()) | set(self.sensor_registry.sensor_ids())):
+            if sensor_id not in known:
+                self.sensorSelector.addItem(sensor_id)
+                self.historySensorSelector.addItem(sensor_id)
+
+    def update_overview(self):
+        """Memperbarui tabel ringkasan; satu baris per sensor"""
+        sensors = self.store.sensors()
+        self.overviewTable.setRowCount(len(sensors))
+        for row, sensor_id in enumerate(sensors):
+            location, process_stage = self.sensor_registry.get(sensor_id) or ("N/A", "N/A")
+            temp = self.store.latest_point(sensor_id, "temperature_celsius")
+            humidity = self.store.latest_point(sensor_id, "humidity_percent")
+            last_times = [point[0] for point in (temp, humidity) if point is not None]
+            last_text = "-"
+            if last_times:
+                last_text = format_local(max(last_times))
+            texts = [
+                sensor_id,
+                location,
+                process_stage,
+                f"{temp[1]:.2f}" if temp is not None else "N/A",
+                f"{humidity[1]:.2f}" if humidity is not None else "N/A",
+                last_text,
+            ]
+            out_of_range = (temp is not None and not self.temp_range[0] <= temp[1] <= self.temp_range[1]) or \
+                (humidity is not None and not self.humidity_range[0] <= humidity[1] <= self.humidity_range[1])
+            for column, text in enumerate(texts):
+                item = QtWidgets.QTableWidgetItem(text)
+                if out_of_range:
+                    item.setBackground(QtGui.QColor(255, 200, 200))
+                self.overviewTable.setItem(row, column, item)
+
+    def select_sensor(self, sensor_id):
+        """Menampilkan sensor lain dari data yang sudah ada di store"""
+        if not sensor_id or sensor_id == self.sensor_id:
+            return
+        self.sensor_id = sensor_id
+        self.update_header()
+        for field in self.fields:
+            times, values = self.store.series(sensor_id, field)
+            if len(values):
+                self.update_chart(field, times, values)
+        self.refresh_table()
+
+    def update_header(self):
+        """Label lokasi, tahap proses dan sensor; widget hanya disentuh jika metadata berubah"""
+        header = (self.sensor_id,) + (self.sensor_registry.get(self.sensor_id) or ("N/A", "N/A"))
+        if header == self.header_metadata:
+            return
+        self.header_metadata = header
+        sensor_id, location, process_stage = header
+        self.locationLabel.setText(f"LOKASI: {location}")
+        self.processStageLabel.setText(f"PROSES: {process_stage}")
+        self.sensorIdLabel.setText(f"SENSOR ID: {sensor_id}")
+
+    def update_setpoints(self):
+        """Memperbarui range set point dari input pengguna"""
+        try:
+            temp_min = float(self.tempMinInput.text())
+            temp_max = float(self.tempMaxInput.text())
+            humidity_min = float(self.humidityMinInput.text())
+            humidity_max = float(self.humidityMaxInput.text())
+            
+            # Validasi range suhu
+            if temp_min >= temp_max:
+                QMessageBox.warning(self, "Peringatan", "Nilai minimum suhu harus lebih kecil dari maksimum")
+                return
+            if temp_min < 0 or temp_max > 50:
+                QMessageBox.warning(self, "Peringatan", "Suhu harus antara 0-50°C")
+                return
+                
+            # Validasi range kelembaban
+            if humidity_min >= humidity_max:
+                QMessageBox.warning(self, "Peringatan", "Nilai minimum kelembaban harus lebih kecil dari maksimum")
+                return
+            if humidity_min < 0 or humidity_max > 100:
+                QMessageBox.warning(self, "Peringatan", "Kelembaban harus antara 0-100%")
+                return
+                
+            self.temp_range = (temp_min, temp_max)
+            self.humidity_range = (humidity_min, humidity_max)
+            self.update_setpoint_artists()
+            self.table_model.set_ranges(self.temp_range, self.humidity_range)
+            QMessageBox.information(self, "Sukses", "Range set point berhasil diperbarui")
+
+            # Cek kondisi alert lagi berdasarkan data terbaru dengan set point baru
+            self.alert_engine.set_ranges(self.temp_range, self.humidity_range)
+            self.alert_engine.reset()  # Reset cooldown agar alert langsung muncul
+            latest_samples = []
+            for field in self.fields:
+                point = self.store.latest_point(self.sensor_id, field)
+                if point is not None:
+                    latest_samples.append((self.sensor_id, field, np.array([point[0]]), np.array([point[1]])))
+            self.check_alert_conditions(latest_samples)
+
+            
+        except ValueError:
+            QMessageBox.warning(self, "Peringatan", "Masukkan angka yang valid")
+
+    def start_monitoring(self):
+        """Memulai monitoring data"""
+        try:
+            from influxdb_client import InfluxDBClient
+            self.client = InfluxDBClient(
+                url=self.influx_url,
+                token=self.influx_token,
+                org=self.influx_org,
+                timeout=30_000
+            )
+            self.query_api = self.client.query_api()
+
+            try:
+                health = self.client.health()
+                if health.status == "pass":
+                    self.statusLabel.setText("STATUS: Terhubung ke InfluxDB ✔")
+                else:
+                    self.statusLabel.setText("STATUS: Masalah Koneksi ⚠")
+                    QMessageBox.warning(self, "Peringatan", f"Masalah koneksi InfluxDB: {health.message}")
+                    return
+            except Exception as health_error:
+                self.statusLabel.setText("STATUS: Gagal Cek Kesehatan ❌")
+                QMessageBox.warning(self, "Peringatan", f"Tidak bisa cek kesehatan InfluxDB: {str(health_error)}")
+                return
+
+            self.startButton.setEnabled(False)
+            self.stopButton.setEnabled(True)
+            self.update_poll_visibility()
+            self.scheduler.start()
+            self.update_poll_label()
+            if self.liveCheckBox.isChecked():
+                self.live_feed.start()
+
+        except Exception as e:
+            self.statusLabel.setText("STATUS: Gagal Koneksi ❌")
+            QMessageBox.critical(self, "Error", f"Gagal terhubung ke InfluxDB: {str(e)}")
+            if self.client:
+                self.client.close()
+            self.client = None
+            self.query_api = None
+
+    def stop_monitoring(self):
+        """Menghentikan monitoring"""
+        self.scheduler.stop()
+        self.update_poll_label()
+        self.cancel_fetch()
+        self.live_feed.stop()
+        self.live_pending.clear()
+        self.liveLabel.clear()
+        if self.client:
+            self.client.close()
+            self.client = None
+            self.query_api = None
+
+        self.statusLabel.setText("STATUS: Terputus ⛔")
+        self.startButton.setEnabled(True)
+        self.stopButton.setEnabled(False)
+        QMessageBox.information(self, "Info", "Monitoring dihentikan")
+
+    def check_alert_conditions(self, new_samples, since=None):
+        """Mengevaluasi aturan alert untuk batch sampel baru setiap sensor"""
+        alerts = []
+        for sensor_id, field, times, values in new_samples:
+            alerts.extend(self.alert_engine.evaluate(sensor_id, field, times, values, since))
+        for alert in sorted(alerts, key=lambda alert: alert.time):
+            self.alert_queue.append(alert)
+        if alerts:
+            self.show_alert_banner()
+
+    def show_alert_banner(self):
+        """Menampilkan alert terbaru di banner tanpa memblokir event loop"""
+        alert = self.alert_queue[-1]
+        self.alertLabel.setText(
+            f"[{format_local(alert.time).split(' ')[1]}] {alert.sensor_id}\n{alert.message}")
+        pending = len(self.alert_queue) - 1
+        self.alertCountLabel.setText(f"+{pending} alert lain" if pending else "")
+        self.alertBanner.show()
+        self.statusbar.showMessage(alert.message.splitlines()[0], 10000)
+
+    def dismiss_alert(self):
+        """Menutup alert terbaru; alert berikutnya di antrean ditampilkan"""
+        if self.alert_queue:
+            self.alert_queue.pop()
+        if self.alert_queue:
+            self.show_alert_banner()
+        else:
+            self.alertBanner.hide()
+
+    def request_full_resync(self):
+        """Meminta query penuh (seluruh window) pada tick berikutnya"""
+        self.full_resync_requested = True
+
+    def cancel_fetch(self):
+        """Membatalkan fetch yang sedang berjalan dan mengabaikan hasilnya"""
+        self.worker.cancel()
+        self.fetch_request_id += 1
+        self.fetch_in_progress = False
+
+    def update_data(self):
+        """Meminta worker mengambil data dari InfluxDB"""
+        if not self.query_api:
+            self.statusLabel.setText("STATUS: Query API tidak tersedia ❌")
+            QMessageBox.warning(self, "Peringatan", "Query API belum diinisialisasi")
+            return
+
+        # Jangan mulai fetch baru jika fetch sebelumnya belum selesai
+        if self.fetch_in_progress:
+            return
+
+        self.fetch_request_id += 1
+        self.fetch_in_progress = True
+        self.fetch_started = time.perf_counter()
+        self.fetch_requested.emit({
+            'request_id': self.fetch_request_id,
+            'query_api': self.query_api,
+            'bucket': self.influx_bucket,
+            'sensor_id': self.sensor_id,
+            'sensor_ids': self.sensor_ids,
+            'force_resync': self.full_resync_requested,
+        })
+        self.full_resync_requested = False
+
+    def on_fetch_failed(self, request_id, status, title, message):
+        """Menangani error dari worker"""
+        if request_id != self.fetch_request_id:
+            return
+        self.fetch_in_progress = False
+        self.scheduler.done(failed=True)
+        self.update_poll_label()
+        self.flush_live_pending()
+        self.statusLabel.setText(status)
+        # Selama InfluxDB bermasalah hanya kegagalan pertama yang memunculkan dialog
+        if self.scheduler.failures <= 1:
+            QMessageBox.warning(self, title, message)
+        else:
+            self.statusbar.showMessage(f"{title}: {message}", 10000)
+
+    def on_data_ready(self, payload):
+        """Menampilkan hasil fetch yang sudah diolah oleh worker"""
+        if payload['request_id'] != self.fetch_request_id:
+            return  # Hasil dari fetch yang sudah dibatalkan
+        self.fetch_in_progress = False
+        self.scheduler.done(payload['has_new_data'])
+        self.update_poll_label()
+        self.show_payload(payload, self.fetch_started)
+        self.flush_live_pending()
+
+    def on_live_ready(self, payload):
+        """Menampilkan pembacaan live feed yang sudah disimpan worker"""
+        self.show_payload(payload, payload['received'])
+
+    def show_payload(self, payload, started_at):
+        """Memperbarui chart, tabel, ringkasan dan alert dari payload worker"""
+        try:
+            self.update_header()
+
+            sensor_id = payload['sensor_id']
+            temp_times, temp_data = self.store.series(sensor_id, "temperature_celsius")
+            humidity_times, humidity_data = self.store.series(sensor_id, "humidity_percent")
+
+            timer = StageTimer()
+            for stage, seconds in payload['timings'].items():
+                timer.add(stage, seconds)
+
+            # Chart hanya digambar ulang jika sensor yang dipilih mendapat data baru
+            selected_new = any(sample[0] == self.sensor_id for sample in payload['new_samples'])
+            if sensor_id != self.sensor_id:
+                # Pilihan sensor berubah selama fetch berjalan; baca ulang dari store
+                sensor_id = self.sensor_id
+                temp_times, temp_data = self.store.series(sensor_id, "temperature_celsius")
+                humidity_times, humidity_data = self.store.series(sensor_id, "humidity_percent")
+                payload['table_data'] = self.store.table_columns(sensor_id) if selected_new else None
+            started = time.perf_counter()
+            if not self.live_view_visible():
+                # Tab lain sedang dibuka: store dan alert tetap diperbarui, redraw saat tab live kembali
+                self.redraw_pending = self.redraw_pending or payload['has_new_data'] or selected_new
+            else:
+                if selected_new and len(temp_data):
+                    self.update_chart("temperature_celsius", temp_times, temp_data)
+                if selected_new and len(humidity_data):
+                    self.update_chart("humidity_percent", humidity_times, humidity_data)
+                started = timer.measure('chart', started)
+
+                # Perbarui data tabel
+                if payload['table_data'] is not None:
+                    self.update_data_table(payload['table_data'])
+                    started = timer.measure('table', started)
+
+            if payload['has_new_data'] or payload['registry_changed']:
+                self.update_sensor_list()
+                if self.live_view_visible():
+                    self.update_overview()
+
+            # Check alert conditions; saat full resync data lama hanya mengisi state aturan
+            started = time.perf_counter()
+            since = None
+            if payload['full_resync']:
+                since = np.datetime64('now', 'ns') - np.timedelta64(self.alert_lookback)
+            self.check_alert_conditions(payload['new_samples'], since)
+            timer.measure('alerts', started)
+            timer.measure('total', started_at)
+            self.metrics.record_tick(payload['request_id'] or "live", payload['rows'], timer.timings)
+            self.update_metrics_label()
+
+            now = QDateTime.currentDateTime()
+            self.updateLabel.setText(f"Terakhir Diperbarui: {now.toString('dd MMMM yyyy - hh:mm:ss')}")
+
+        except Exception as e:
+            self.statusLabel.setText("STATUS: Error Pembaruan ⚠")
+            QMessageBox.warning(self, "Error", f"Error memperbarui data: {str(e)}")
+
+    def toggle_live(self, checked):
+        """Mengaktifkan/menonaktifkan mode live saat monitoring berjalan"""
+        if not self.query_api:
+            return
+        if checked:
+            self.live_feed.start()
+        else:
+            self.live_feed.stop()
+            self.live_pending.clear()
+            self.liveLabel.clear()
+            self.request_backfill()
+            self.scheduler.set_paused("live", False)
+            self.update_poll_label()
+
+    def on_live_connected(self):
+        """Live feed tersambung: polling berhenti, celah sejak fetch terakhir diambil sekali"""
+        self.scheduler.set_paused("live", True)
+        self.liveLabel.setText("LIVE ●")
+        self.liveLabel.setStyleSheet("color: #2e7d32;")
+        self.request_backfill()
+        self.update_poll_label()
+
+    def on_live_disconnected(self, reason):
+        """Kembali ke polling sampai live feed tersambung lagi"""
+        self.liveLabel.setText("LIVE ○ (polling)")
+        self.liveLabel.setStyleSheet("color: #d32f2f;")
+        self.liveLabel.setToolTip(reason)
+        self.scheduler.set_paused("live", False)
+        self.update_poll_label()
+
+    def request_backfill(self):
+        """Mengambil data yang terlewat dari InfluxDB (setelah reconnect atau feed tertinggal).
+
+        Jika fetch masih berjalan, scheduler menggabungkannya menjadi satu fetch susulan.
+        """
+        self.scheduler.trigger()
+
+    def on_live_readings(self, readings):
+        """Pembacaan ditahan selama fetch berjalan agar backfill (data lebih lama) masuk lebih dulu"""
+        if self.fetch_in_progress:
+            self.live_pending.extend(readings)
+            del self.live_pending[:-self.live_pending_limit]
+            return
+        self.live_batch_requested.emit({
+            'readings': readings,
+            'received': time.perf_counter(),
+            'sensor_id': self.sensor_id,
+            'sensor_ids': self.sensor_ids,
+        })
+
+    def flush_live_pending(self):
+        if self.live_pending and not self.fetch_in_progress:
+            readings, self.live_pending = self.live_pending, []
+            self.on_live_readings(readings)
+
+    def on_cache_loaded(self, payload):
+        """Menampilkan data dari cache lokal sebelum InfluxDB dihubungi"""
+        if not payload['points']:
+            return
+        self.update_header()
+        self.update_sensor_list()
+        self.redraw_live_views()
+
+        # Data cache hanya mengisi state aturan alert, tidak memicu alert
+        self.check_alert_conditions(payload['samples'], np.datetime64('now', 'ns'))
+        self.statusbar.showMessage(f"Cache lokal dimuat: {payload['points']} titik", 5000)
+
+    def on_cache_failed(self, message):
+        self.statusbar.showMessage(message, 10000)
+
+    def update_chart(self, field, times, values):
+        """Memperbarui data garis chart; full redraw hanya jika sumbu harus berubah"""
+        if field not in self.charts:
+            return  # Chart belum dibuat (sebelum first paint); digambar di setup_charts
+        try:
+            chart = self.charts[field]
+            canvas = chart['canvas']
+
+            # times berupa datetime64 UTC; konversi ke WIB dilakukan oleh DateFormatter
+            chart['times'], chart['values'] = times, values
+            self.hide_hover(chart, redraw=False)  # Indeks tooltip mengacu ke array lama
+
+            # Jika user sedang zoom/pan lewat toolbar, biarkan batas sumbu apa adanya
+            user_navigating = bool(chart['toolbar'].mode)
+            limits_changed = not user_navigating and self.chart_limits_changed(chart, times, values)
+            self.refresh_chart_line(chart)
+            if limits_changed:
+                canvas.draw_idle()
+            else:
+                self.blit_chart(chart)
+
+        except Exception as e:
+            QMessageBox.warning(self, "Error Grafik", f"Error memperbarui grafik: {str(e)}")
+
+    def refresh_chart_line(self, chart):
+        """Mengisi garis dengan data yang terlihat, di-downsample sesuai lebar chart dalam piksel"""
+        if chart['times'] is None:
+            return
+        import matplotlib.dates as mdates
+        ax = chart['ax']
+        x_start, x_end = ax.get_xlim()
+        t_start, t_end = (np.datetime64(mdates.num2date(x).replace(tzinfo=None), 'ns')
+                          for x in (x_start, x_end))
+        start, end = visible_slice(chart['times'], t_start, t_end)
+        n_buckets = max(int(ax.bbox.width), 1)
+        plot_times, plot_values = minmax_downsample(
+            chart['times'][start:end], chart['values'][start:end], n_buckets)
+        chart['line'].set_data(plot_times, plot_values)
+
+    def chart_limits_changed(self, chart, times, values):
+        """Menyesuaikan batas sumbu jika data keluar dari area tampilan"""
+        import matplotlib.dates as mdates
+        ax = chart['ax']
+        x_min, x_max = mdates.date2num([times[0], times[-1]])
+        y_min, y_max = float(np.nanmin(values)), float(np.nanmax(values))
+        cur_x_min, cur_x_max = ax.get_xlim()
+        cur_y_min, cur_y_max = ax.get_ylim()
+
+        if chart['background'] is not None and cur_x_min <= x_min and x_max <= cur_x_max \
+                and cur_y_min <= y_min and y_max <= cur_y_max:
+            return False
+
+        # Sisakan ruang di kanan agar titik baru tidak langsung memicu full redraw
+        span = max(x_max - x_min, 1 / 1440)
+        ax.set_xlim(x_min, x_max + span * self.live_x_margin)
+        range_min, range_max = self.setpoint_range(chart['field'])
+        low, high = min(y_min, range_min), max(y_max, range_max)
+        pad = max((high - low) * 0.1, 0.5)
+        ax.set_ylim(low - pad, high + pad)
+        return True
+
+    def update_data_table(self, table_data):
+        """Memperbarui tabel dengan kolom data yang sudah disiapkan oleh worker"""
+        try:
+            self.table_model.update_data(table_data)
+        except Exception as e:
+            QMessageBox.warning(self, "Error Tabel", f"Error memperbarui tabel: {str(e)}")
+
+    def refresh_table(self):
+        """Memperbarui tampilan tabel dengan data terbaru dari store"""
+        try:
+            self.table_model.update_data(self.store.table_columns(self.sensor_id))
+        except Exception as e:
+            # Tampilkan pesan error jika terjadi masalah
+            QMessageBox.warning(self, "Error", f"Gagal memperbarui tabel: {str(e)}")
+
+    def export_to_excel(self):
+        """Ekspor data ke Excel/CSV/Parquet di background dengan progress bar"""
+        from export_worker import ExportWorker, store_chunks, influx_chunks, build_export_query
+        if self.export_thread is not None:
+            QMessageBox.warning(self, "Peringatan", "Ekspor lain masih berjalan")
+            return
+
+        try:
+            source, ok = QInputDialog.getItem(
+                self, "Sumber Data", "Pilih data yang diekspor:",
+                list(self.export_sources), 0, False)
+            if not ok:
+                return
+            days = self.export_sources[source]
+
+            if days is None and self.table_model.rowCount() == 0:
+                QMessageBox.warning(self, "Peringatan", "Tidak ada data untuk diekspor")
+                return
+            if days is not None and not self.query_api:
+                QMessageBox.warning(self, "Peringatan", "Mulai monitoring dulu untuk ekspor dari InfluxDB")
+                return
+
+            file_name, selected_filter = QFileDialog.getSaveFileName(
+                self, "Simpan File", "",
+                "File Excel (*.xlsx);;File CSV (*.csv);;File Parquet (*.parquet)")
+
+            if not file_name:
+                return
+
+            file_format = 'xlsx'
+            if 'csv' in selected_filter:
+                file_format = 'csv'
+            elif 'parquet' in selected_filter:
+                file_format = 'parquet'
+            if not file_name.endswith('.' + file_format):
+                file_name += '.' + file_format
+
+            if days is None:
+                columns = self.store.table_columns(self.sensor_id)
+                chunks = store_chunks(columns)
+                total_rows = len(columns['time'])
+            else:
+                query = build_export_query(self.influx_bucket, self.sensor_id, days)
+                chunks = influx_chunks(self.query_api, query)
+                total_rows = 0  # Tidak diketahui sebelum query selesai
+
+            self.start_export(ExportWorker(chunks, total_rows, file_name, file_format,
+                                           self.temp_range, self.humidity_range))
+
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Gagal mengekspor data: {str(e)}")
+
+    def start_export(self, worker):
+        """Menjalankan ExportWorker di QThread baru"""
+        self.export_worker = worker
+        self.export_thread = QThread(self)
+        worker.moveToThread(self.export_thread)
+        self.export_thread.started.connect(worker.run)
+        worker.progress.connect(self.on_export_progress)
+        worker.finished.connect(self.on_export_finished)
+        worker.failed.connect(self.on_export_failed)
+        worker.cancelled.connect(self.on_export_cancelled)
+
+        # 0..0 = mode sibuk sampai jumlah baris diketahui
+        self.exportProgress.setRange(0, worker.total_rows)
+        self.exportProgress.setValue(0)
+        self.exportProgress.setFormat("%p%" if worker.total_rows else "Mengekspor...")
+        self.exportProgress.show()
+        self.exportCancelButton.show()
+        self.exportButton.setEnabled(False)
+        self.export_thread.start()
+
+    def cancel_export(self):
+        if self.export_worker is not None:
+            self.export_worker.cancel()
+
+    def on_export_progress(self, written, total):
+        if total:
+            self.exportProgress.setValue(written)
+        else:
+            self.exportProgress.setFormat(f"{written} baris")
+
+    def finish_export(self):
+        """Membersihkan thread ekspor dan progress bar"""
+        self.export_thread.quit()
+        self.export_thread.wait()
+        self.export_thread = None
+        self.export_worker = None
+        self.exportProgress.hide()
+        self.exportCancelButton.hide()
+        self.exportButton.setEnabled(True)
+
+    def on_export_finished(self, file_name):
+        self.finish_export()
+        QMessageBox.information(self, "Sukses", f"Data berhasil diekspor ke {file_name}")
+
+    def on_export_failed(self, message):
+        self.finish_export()
+        QMessageBox.warning(self, "Error", f"Gagal mengekspor data: {message}")
+
+    def on_export_cancelled(self):
+        self.finish_export()
+        self.statusbar.showMessage("Ekspor dibatalkan", 5000)
+
+    def closeEvent(self, event):
+        """Menghentikan thread worker saat jendela ditutup"""
+        self.scheduler.stop()
+        self.live_feed.stop()
+        self.cancel_fetch()
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+        self.history_worker.latest_request = -1  # Lewati permintaan tile yang masih antre
+        self.history_thread.quit()
+        self.history_thread.wait()
+        if self.export_thread is not None:
+            self.cancel_export()
+            self.export_thread.quit()
+            self.export_thread.wait()
+        if self.chain_thread is not None:
+            self.cancel_chain_sync()
+            self.chain_thread.quit()
+            self.chain_thread.wait()
+        if self.audit_thread is not None:
+            self.cancel_audit()
+            self.audit_thread.quit()
+            self.audit_thread.wait()
+        self.chain_index.close()
+        if self.client:
+            self.client.close()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        self.history_cache.close()
+        super().closeEvent(event)
+
+def main():
+    app = QtWidgets.QApplication(sys.argv)
+    window = MonitoringApp()
+    profile.watch_first_paint(window, window.on_first_paint)
+    window.show()
+    sys.exit(app.exec())
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
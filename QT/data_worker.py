@@ -0,0 +1,312 @@
+import datetime
+import time
+from PyQt6 import QtCore
+from PyQt6.QtCore import pyqtSignal, pyqtSlot
+import numpy as np
+from metrics import StageTimer
+
+
+class FetchCancelled(Exception):
+    """Dilempar saat fetch dibatalkan di tengah jalan"""
+
+
+class DataWorker(QtCore.QObject):
+    """Worker yang menjalankan query InfluxDB dan pengolahan data di luar thread GUI.
+
+    Worker ini menulis ke SeriesStore bersama dan menyiapkan data tabel sehingga
+    thread GUI hanya menerima hasil yang sudah siap ditampilkan.
+    Hanya satu fetch yang berjalan pada satu waktu karena semua slot dieksekusi
+    berurutan di event loop thread worker.
+    """
+
+    data_ready = pyqtSignal(object)  # payload dict hasil fetch
+    fetch_failed = pyqtSignal(int, str, str, str)  # request_id, status, judul, pesan
+    cache_loaded = pyqtSignal(object)  # payload dict hasil warm start dari cache lokal
+    cache_failed = pyqtSignal(str)  # pesan error cache (tidak menghentikan monitoring)
+    live_ready = pyqtSignal(object)  # payload dict seperti data_ready, dari pembacaan live feed
+    live_failed = pyqtSignal(str)  # pesan error pengolahan live feed
+
+    def __init__(self, store, fields, window_duration, resync_gap, cache=None, registry=None,
+                 late_overlap=datetime.timedelta(minutes=2)):
+        super().__init__()
+        self.store = store  # SeriesStore bersama dengan thread GUI
+        self.cache = cache  # HistoryCache opsional untuk warm start
+        self.registry = registry  # SensorRegistry opsional, dibaca thread GUI untuk label header
+        self.fields = fields
+        self.window_duration = window_duration  # Rentang tampilan chart
+        self.resync_gap = resync_gap  # Jeda maksimum sebelum full resync
+        # Fetch inkremental mengulang ekor sepanjang ini agar data yang tiba terlambat ikut terambil
+        self.late_overlap = late_overlap
+        self.last_fetch_time = None
+
+        # Dibaca dari thread worker, ditulis dari thread GUI (atomic di bawah GIL)
+        self.cancel_requested = False
+
+    def cancel(self):
+        """Meminta fetch yang sedang berjalan untuk berhenti (dipanggil dari thread GUI)"""
+        self.cancel_requested = True
+
+    def check_cancelled(self):
+        if self.cancel_requested:
+            raise FetchCancelled()
+
+    def window_start(self):
+        return np.datetime64('now', 'ns') - np.timedelta64(self.window_duration)
+
+    def needs_full_resync(self, force_resync, last_times):
+        """Menentukan apakah fetch ini harus mengambil seluruh window"""
+        if force_resync or not last_times:
+            return True
+        # Semua data (misal dari cache) lebih tua dari window: tidak ada yang bisa dipakai ulang
+        if max(last_times.values()) < self.window_start():
+            return True
+        if self.last_fetch_time is None:
+            # Fetch pertama setelah warm start cukup mengambil ekor yang belum ada
+            return False
+        # Jika ada jeda terlalu lama (misal koneksi putus), ambil ulang semua
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return now - self.last_fetch_time > self.resync_gap
+
+    def build_range_start(self, full_resync, last_times):
+        """Membuat argumen start untuk range() Flux"""
+        if full_resync:
+            return f"-{int(self.window_duration.total_seconds())}s"
+        # Start per series adalah timestamp terakhirnya dikurangi late_overlap, dibatasi paling jauh
+        # resync_gap ke belakang: sensor yang berhenti mengirim data tidak menyeret query seluruh
+        # fleet ke awal window. Titik di overlap yang sudah ada di store dibuang saat merge.
+        cutoff = np.datetime64('now', 'ns') - np.timedelta64(self.resync_gap)
+        overlap = np.timedelta64(self.late_overlap)
+        return min(max(last_time - overlap, cutoff) for last_time in last_times.values())
+
+    def build_query(self, bucket, range_start, sensor_ids):
+        """Satu query untuk semua sensor; sensor_ids None berarti semua sensor di bucket.
+
+        Pivot dilakukan di InfluxDB sehingga suhu dan kelembaban tiba dalam satu
+        baris per timestamp (setengah jumlah baris dan tanpa kolom _field/_value).
+        """
+        import flux_reader
+        from flux_query import FluxQuery
+        return FluxQuery(bucket, fields=self.fields) \
+            .range(range_start) \
+            .tags(sensor_id=sensor_ids) \
+            .where_exists() \
+            .pivot() \
+            .keep(flux_reader.PIVOT_COLUMNS) \
+            .build("raw")
+
+    @pyqtSlot()
+    def preload(self):
+        """Mengimpor modul query (pandas, influxdb_client) di thread worker selagi GUI tampil"""
+        import flux_reader
+
+    @pyqtSlot()
+    def load_cache(self):
+        """Warm start: mengisi store dari cache lokal sebelum fetch pertama ke InfluxDB"""
+        if self.cache is None:
+            return
+        try:
+            series, metadata = self.cache.load(self.window_start())
+            loaded = []
+            for (sensor_id, field), (times, values) in series.items():
+                if self.store.append(sensor_id, field, times, values):
+                    loaded.append((sensor_id, field, times, values))
+            for sensor_id, (location, process_stage) in metadata.items():
+                self.store.set_metadata(sensor_id, location, process_stage)
+            self.update_registry(metadata)
+            self.cache_loaded.emit({
+                'samples': loaded,
+                'points': sum(len(sample[2]) for sample in loaded),
+            })
+        except Exception as e:
+            self.cache_failed.emit(f"Gagal memuat cache lokal: {str(e)}")
+
+    def save_to_cache(self, new_samples, metadata):
+        """Menyimpan sampel baru ke cache lokal; error cache tidak menggagalkan fetch"""
+        if self.cache is None:
+            return
+        try:
+            self.cache.append(new_samples, metadata)
+            self.cache.maintain()
+        except Exception as e:
+            self.cache_failed.emit(f"Gagal menyimpan cache lokal: {str(e)}")
+
+    def update_registry(self, metadata):
+        """Metadata dari baris data terbaru; True jika ada sensor yang metadatanya berubah"""
+        return self.registry is not None and self.registry.update(metadata)
+
+    def refresh_registry(self, query_api, bucket):
+        """Memuat ulang registry jika TTL habis; error tidak menggagalkan fetch"""
+        if self.registry is None or not self.registry.is_stale():
+            return False
+        try:
+            return self.registry.refresh(query_api, bucket)
+        except Exception as e:
+            self.cache_failed.emit(f"Gagal memuat metadata sensor: {str(e)}")
+            return False
+
+    def store_parts(self, new_parts, metadata, replace=False):
+        """Menyimpan potongan (times, values) per (sensor_id, field) ke store.
+
+        replace=True (full resync) mengganti seluruh isi store sekaligus; selain itu
+        data di-merge sehingga titik terlambat di overlap ikut tersimpan.
+        Mengembalikan jumlah titik baru dan daftar (sensor_id, field, times, values)
+        yang timestamp-nya belum ada di store, untuk alert dan cache.
+        """
+        import flux_reader
+        series = {}
+        for (sensor_id, field), parts in new_parts.items():
+            times = np.concatenate([part[0] for part in parts])
+            values = np.concatenate([part[1] for part in parts])
+            series[(sensor_id, field)] = flux_reader.sort_by_time(times, values)
+
+        if replace:
+            fresh = {}
+            for key, (times, values) in series.items():
+                known = ~np.isin(times, self.store.series(*key)[0])
+                fresh[key] = (times[known], values[known])
+            self.store.replace(series)
+        else:
+            fresh = {key: self.store.merge(*key, *arrays) for key, arrays in series.items()}
+        added = 0
+        new_samples = []
+        for (sensor_id, field), (times, values) in fresh.items():
+            if len(times):
+                added += len(times)
+                new_samples.append((sensor_id, field, times, values))
+        for sensor_id, (location, process_stage) in metadata.items():
+            self.store.set_metadata(sensor_id, location, process_stage)
+        return added, new_samples
+
+    @pyqtSlot(object)
+    def ingest(self, batch):
+        """Menyimpan pembacaan dari live feed seperti hasil fetch, tanpa query InfluxDB"""
+        import pandas as pd
+        timer = StageTimer()
+        started = time.perf_counter()
+        try:
+            frame = pd.DataFrame.from_records(batch['readings'])
+            frame['time'] = pd.to_datetime(frame.get('timestamp'), utc=True, format='ISO8601', errors='coerce')
+            frame = frame.dropna(subset=['time', 'sensor_id'])
+            if batch['sensor_ids']:
+                frame = frame[frame['sensor_id'].isin(batch['sensor_ids'])]
+            new_parts = {}
+            metadata = {}
+            for sensor_id, sensor_frame in frame.groupby('sensor_id'):
+                last = sensor_frame.iloc[-1]
+                metadata[sensor_id] = (last.get('location', 'N/A'), last.get('process_stage', 'N/A'))
+                times = sensor_frame['time'].dt.tz_convert(None).to_numpy(dtype='datetime64[ns]')
+                for field in self.fields:
+                    if field in sensor_frame:
+                        values = pd.to_numeric(sensor_frame[field], errors='coerce').to_numpy(dtype='float64')
+                        valid = ~np.isnan(values)
+                        new_parts[(sensor_id, field)] = [(times[valid], values[valid])]
+            started = timer.measure('parse', started)
+
+            added, new_samples = self.store_parts(new_parts, metadata)
+            registry_changed = self.update_registry(metadata)
+            # Store tetap sinkron selama live feed tersambung, jadi tidak perlu full resync
+            self.last_fetch_time = datetime.datetime.now(datetime.timezone.utc)
+            started = timer.measure('store', started)
+            self.save_to_cache(new_samples, metadata)
+            started = timer.measure('cache', started)
+
+            sensor_id = batch['sensor_id']
+            table_data = None
+            if any(sample[0] == sensor_id for sample in new_samples):
+                table_data = self.store.table_columns(sensor_id)
+                timer.measure('pivot', started)
+
+            self.live_ready.emit({
+                'request_id': None,
+                'received': batch['received'],
+                'full_resync': False,
+                'has_new_data': bool(added),
+                'sensor_id': sensor_id,
+                'table_data': table_data,
+                'new_samples': new_samples,
+                'registry_changed': registry_changed,
+                'rows': len(frame),
+                'timings': dict(timer.timings),
+            })
+        except Exception as e:
+            self.live_failed.emit(f"Gagal mengolah data live: {str(e)}")
+
+    @pyqtSlot(object)
+    def fetch(self, request):
+        """Menjalankan satu siklus fetch; hasil dikirim lewat signal data_ready"""
+        import flux_reader
+        request_id = request['request_id']
+        self.cancel_requested = False
+        timer = StageTimer()
+        rows = 0
+        try:
+            started = time.perf_counter()
+            registry_changed = self.refresh_registry(request['query_api'], request['bucket'])
+            timer.measure('query', started)
+            last_times = self.store.last_times()
+            full_resync = self.needs_full_resync(request['force_resync'], last_times)
+            query = self.build_query(request['bucket'], self.build_range_start(full_resync, last_times),
+                                     request['sensor_ids'])
+
+            new_parts = {}  # (sensor_id, field) -> list array (times, values)
+            metadata = {}  # sensor_id -> (location, process_stage)
+
+            try:
+                started = time.perf_counter()
+                frames = flux_reader.stream_frames(request['query_api'], query)
+                for frame in frames:
+                    # Chunk pertama = round-trip query, berikutnya = parsing stream
+                    started = timer.measure('parse' if rows else 'query', started)
+                    rows += len(frame)
+                    self.check_cancelled()
+                    for sensor_id, sensor_frame in frame.groupby('sensor_id', observed=True):
+                        # Baris terakhir menang agar perpindahan lokasi/tahap terbaca
+                        last = sensor_frame.iloc[-1]
+                        metadata[sensor_id] = (last.get('location', 'N/A'), last.get('process_stage', 'N/A'))
+                        for field in self.fields:
+                            new_parts.setdefault((sensor_id, field), []).append(
+                                flux_reader.field_arrays(sensor_frame, field))
+                    started = timer.measure('group', started)
+                timer.measure('parse' if rows else 'query', started)
+            except FetchCancelled:
+                frames.close()
+                raise
+            except Exception as query_error:
+                self.fetch_failed.emit(request_id, "STATUS: Error Query ⚠", "Error Query",
+                                       f"Gagal menjalankan query: {str(query_error)}")
+                return
+            self.check_cancelled()
+
+            # Full resync mengganti isi store; titik yang sudah ada tidak dikirim ulang ke cache/alert
+            started = time.perf_counter()
+            added, new_samples = self.store_parts(new_parts, metadata, replace=full_resync)
+            registry_changed = self.update_registry(metadata) or registry_changed
+            self.last_fetch_time = datetime.datetime.now(datetime.timezone.utc)
+            started = timer.measure('store', started)
+            self.save_to_cache(new_samples, metadata)
+            started = timer.measure('cache', started)
+
+            sensor_id = request['sensor_id']
+            table_data = None
+            if any(sample[0] == sensor_id for sample in new_samples):
+                table_data = self.store.table_columns(sensor_id)
+                timer.measure('pivot', started)
+            self.check_cancelled()
+
+            self.data_ready.emit({
+                'request_id': request_id,
+                'full_resync': full_resync,
+                'has_new_data': bool(added),
+                'sensor_id': sensor_id,
+                'table_data': table_data,
+                'new_samples': new_samples,
+                'registry_changed': registry_changed,
+                'rows': rows,
+                'timings': dict(timer.timings),
+            })
+
+        except FetchCancelled:
+            return
+        except Exception as e:
+            self.fetch_failed.emit(request_id, "STATUS: Error Pembaruan ⚠", "Error",
+                                   f"Error memperbarui data: {str(e)}")
@@ -0,0 +1,51 @@
+import numpy as np
+
+
+def visible_slice(times, t_start, t_end):
+    """Indeks [awal, akhir) data yang terlihat, ditambah satu titik di luar tiap sisi
+    agar garis tetap tersambung sampai tepi chart"""
+    start = max(np.searchsorted(times, t_start, side='left') - 1, 0)
+    end = min(np.searchsorted(times, t_end, side='right') + 1, len(times))
+    return start, end
+
+
+def minmax_downsample(times, values, n_buckets):
+    """Downsampling min/max per bucket piksel.
+
+    Data dibagi menjadi n_buckets bucket dengan lebar waktu sama. Dari setiap
+    bucket diambil titik minimum dan maksimum sehingga spike tetap terlihat,
+    dan jumlah titik yang digambar paling banyak 2 * n_buckets + 2.
+    times harus terurut naik (datetime64), values float.
+    """
+    count = len(times)
+    if n_buckets < 1 or count <= 2 * n_buckets + 2:
+        return times, values
+
+    valid = ~np.isnan(values)
+    if not valid.all():
+        times, values = times[valid], values[valid]
+        count = len(times)
+        if count <= 2 * n_buckets + 2:
+            return times, values
+
+    t = times.astype('int64')
+    span = t[-1] - t[0]
+    if span <= 0:
+        return times[[0, -1]], values[[0, -1]]
+
+    # Dihitung dalam float64: (t - t[0]) * n_buckets dalam ns bisa overflow int64 untuk rentang berbulan-bulan
+    bucket = np.minimum((t - t[0]) / span * n_buckets, n_buckets - 1).astype('int64')
+
+    # Urutkan per bucket lalu per nilai: elemen pertama tiap bucket = min, terakhir = max
+    order = np.lexsort((values, bucket))
+    sorted_bucket = bucket[order]
+    is_first = np.empty(count, dtype=bool)
+    is_first[0] = True
+    is_first[1:] = sorted_bucket[1:] != sorted_bucket[:-1]
+    is_last = np.empty(count, dtype=bool)
+    is_last[-1] = True
+    is_last[:-1] = is_first[1:]
+
+    keep = np.concatenate([order[is_first], order[is_last], [0, count - 1]])
+    keep = np.unique(keep)  # unique juga mengurutkan sehingga urutan waktu terjaga
+    return times[keep], values[keep]
@@ -0,0 +1,182 @@
+import os
+import numpy as np
+import pandas as pd
+from PyQt6 import QtCore
+from PyQt6.QtCore import pyqtSignal, pyqtSlot
+import flux_reader
+from flux_query import FluxQuery
+from local_time import to_local
+from series_store import out_of_range_mask
+
+
+EXPORT_CHUNK_SIZE = 10_000  # Baris per chunk yang ditulis ke file
+HEADERS = ['Waktu', 'Lokasi', 'Tahap Proses', 'Suhu (°C)', 'Kelembaban (%)']
+
+
+class ExportCancelled(Exception):
+    """Dilempar saat ekspor dibatalkan pengguna"""
+
+
+def store_chunks(columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """Memecah kolom dari SeriesStore.table_columns menjadi DataFrame per chunk"""
+    times = columns['time']
+    for start in range(0, len(times), chunk_size):
+        end = start + chunk_size
+        yield pd.DataFrame({
+            'time': times[start:end],
+            'location': columns['location'],
+            'process_stage': columns['process_stage'],
+            'temperature_celsius': columns['temperature_celsius'][start:end],
+            'humidity_percent': columns['humidity_percent'][start:end],
+        })
+
+
+def build_export_query(bucket, sensor_id, days):
+    """Query Flux untuk ekspor langsung dari InfluxDB, sudah di-pivot per timestamp"""
+    return FluxQuery(bucket) \
+        .range(f"-{int(days)}d") \
+        .tags(sensor_id=sensor_id) \
+        .pivot() \
+        .keep(flux_reader.PIVOT_COLUMNS) \
+        .sort("_time") \
+        .build()
+
+
+def influx_chunks(query_api, query, chunk_size=EXPORT_CHUNK_SIZE):
+    """Chunk hasil query InfluxDB yang dibaca sebagai stream"""
+    for frame in flux_reader.stream_frames(query_api, query, chunk_size, flux_reader.PIVOT_COLUMNS):
+        frame['time'] = frame['time'].dt.tz_convert(None).to_numpy(dtype='datetime64[ns]')
+        for column in ('temperature_celsius', 'humidity_percent'):
+            if column not in frame:
+                frame[column] = np.nan
+        yield frame
+
+
+class ExportWorker(QtCore.QObject):
+    """Menulis data ke Excel/CSV/Parquet per chunk di thread terpisah"""
+
+    progress = pyqtSignal(int, int)  # baris tertulis, total baris (0 jika tidak diketahui)
+    finished = pyqtSignal(str)  # nama file
+    failed = pyqtSignal(str)  # pesan error
+    cancelled = pyqtSignal()
+
+    def __init__(self, chunks, total_rows, file_name, file_format, temp_range, humidity_range):
+        super().__init__()
+        self.chunks = chunks  # Iterator DataFrame (time UTC datetime64, location, ...)
+        self.total_rows = total_rows
+        self.file_name = file_name
+        self.file_format = file_format  # 'xlsx', 'csv' atau 'parquet'
+        self.temp_range = temp_range
+        self.humidity_range = humidity_range
+        self.cancel_requested = False
+
+    def cancel(self):
+        """Dipanggil dari thread GUI"""
+        self.cancel_requested = True
+
+    def prepare_chunk(self, frame):
+        """Mengubah waktu ke WIB (tanpa timezone) dan memberi nama kolom ekspor"""
+        local_times = to_local(frame['time'].to_numpy(dtype='datetime64[ns]'))
+        chunk = pd.DataFrame({
+            HEADERS[0]: local_times,
+            HEADERS[1]: frame['location'].astype(str).to_numpy(),
+            HEADERS[2]: frame['process_stage'].astype(str).to_numpy(),
+            HEADERS[3]: frame['temperature_celsius'].to_numpy(dtype='float64'),
+            HEADERS[4]: frame['humidity_percent'].to_numpy(dtype='float64'),
+        })
+        mask = out_of_range_mask(chunk[HEADERS[3]].to_numpy(), chunk[HEADERS[4]].to_numpy(),
+                                 self.temp_range, self.humidity_range)
+        return chunk, mask
+
+    def write_chunks(self, write_chunk):
+        written = 0
+        for frame in self.chunks:
+            if self.cancel_requested:
+                raise ExportCancelled()
+            chunk, mask = self.prepare_chunk(frame)
+            write_chunk(chunk, mask)
+            written += len(chunk)
+            self.progress.emit(written, self.total_rows)
+        return written
+
+    def export_xlsx(self):
+        """Excel mode write-only: baris langsung di-stream ke file, tidak disimpan di memori"""
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import PatternFill
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        highlight_fill = PatternFill(
+            start_color='FFFFC8C8',
+            end_color='FFFFC8C8',
+            fill_type='solid'
+        )
+        ws.append(HEADERS)
+
+        def write_chunk(chunk, mask):
+            times = chunk[HEADERS[0]].to_numpy(dtype='datetime64[us]').tolist()
+            columns = [times] + [chunk[header].tolist() for header in HEADERS[1:]]
+            for row_idx, row in enumerate(zip(*columns)):
+                row = [None if isinstance(value, float) and value != value else value for value in row]
+                if mask[row_idx]:
+                    cells = []
+                    for value in row:
+                        cell = WriteOnlyCell(ws, value=value)
+                        cell.fill = highlight_fill
+                        cells.append(cell)
+                    ws.append(cells)
+                else:
+                    ws.append(row)
+
+        self.write_chunks(write_chunk)
+        wb.save(self.file_name)
+
+    def export_csv(self):
+        with open(self.file_name, 'w', newline='', encoding='utf-8') as f:
+            header = [True]
+
+            def write_chunk(chunk, mask):
+                chunk.to_csv(f, header=header[0], index=False, date_format='%Y-%m-%d %H:%M:%S')
+                header[0] = False
+
+            self.write_chunks(write_chunk)
+
+    def export_parquet(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Ekspor Parquet membutuhkan paket pyarrow (pip install pyarrow)")
+
+        writer = None
+        try:
+            def write_chunk(chunk, mask):
+                nonlocal writer
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(self.file_name, table.schema)
+                writer.write_table(table)
+
+            self.write_chunks(write_chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            if self.file_format == 'xlsx':
+                self.export_xlsx()
+            elif self.file_format == 'csv':
+                self.export_csv()
+            else:
+                self.export_parquet()
+            self.finished.emit(self.file_name)
+        except ExportCancelled:
+            # Hapus file setengah jadi
+            if os.path.exists(self.file_name):
+                os.remove(self.file_name)
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
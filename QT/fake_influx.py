@@ -0,0 +1,172 @@
+import os
+import re
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+
+# Header CSV sesuai flux_reader.CSV_DIALECT (tanpa anotasi, kolom pertama kosong)
+RAW_HEADER = ",result,table,_time,_value,_field,_measurement,location,process_stage,sensor_id\n"
+PIVOT_HEADER = ",result,table,_time,location,process_stage,sensor_id,humidity_percent,temperature_celsius\n"
+FIELDS = ("temperature_celsius", "humidity_percent")
+SEGMENT_ROWS = 50_000  # Baris per file segmen
+
+
+class FakeResponse:
+    """Pengganti response HTTP dari query_raw: file-like yang dibaca bertahap"""
+
+    def __init__(self, paths, header):
+        self.paths = list(paths)
+        self.header = header.encode()
+        self.current = None
+        self.header_sent = False
+        self.closed = False
+
+    def read(self, size=-1):
+        if not self.header_sent:
+            self.header_sent = True
+            return self.header
+        while True:
+            if self.current is None:
+                if not self.paths:
+                    return b""
+                self.current = open(self.paths.pop(0), 'rb')
+            data = self.current.read(size)
+            if data:
+                return data
+            self.current.close()
+            self.current = None
+
+    def close(self):
+        if self.current is not None:
+            self.current.close()
+            self.current = None
+        self.closed = True
+
+
+class FakeQueryApi:
+    """Pengganti query_api InfluxDB untuk benchmark tanpa server.
+
+    Data disimpan sebagai segmen CSV di direktori sementara, terurut waktu.
+    query_raw() membaca argumen range(start: ...) dari query Flux dan hanya
+    mengirim segmen yang berakhir setelah start, mirip dengan InfluxDB yang
+    hanya membaca shard dalam rentang query. Baris di segmen batas yang lebih
+    lama dari start tetap terkirim; DataWorker membuangnya saat insert.
+    Query dengan pivot() (dipakai dashboard) dilayani dari segmen format pivot.
+    """
+
+    def __init__(self, directory=None):
+        self.owns_directory = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix="fake_influx_")
+        self.segments = {'raw': [], 'pivot': []}  # (waktu akhir, path)
+        self.queries = []
+        self.raw_header = RAW_HEADER
+
+    def close(self):
+        if self.owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def add_samples(self, sensor_ids, times, temperatures, humidities,
+                    location="Tank T-101", process_stage="Storage"):
+        """Menambahkan data (times datetime64[ns] UTC, sama untuk semua sensor) sebagai segmen baru"""
+        sensor_ids = list(sensor_ids)
+        count = len(times)
+        all_times = np.tile(times, len(sensor_ids))
+        all_sensors = np.repeat(np.array(sensor_ids, dtype=object), count)
+        all_temps = np.asarray(temperatures, dtype='float64').reshape(len(sensor_ids), count).ravel()
+        all_hums = np.asarray(humidities, dtype='float64').reshape(len(sensor_ids), count).ravel()
+        order = np.argsort(all_times, kind='stable')
+        all_times, all_sensors = all_times[order], all_sensors[order]
+        all_temps, all_hums = all_temps[order], all_hums[order]
+
+        # Timestamp terakhir dijadikan segmen sendiri agar query inkremental hanya membaca ekor
+        last_start = int(np.searchsorted(all_times, all_times[-1])) if len(all_times) else 0
+        bounds = sorted(set(range(0, len(all_times), SEGMENT_ROWS)) | {last_start})
+        for start, end in zip(bounds, bounds[1:] + [len(all_times)]):
+            times_text = np.char.add(np.datetime_as_string(all_times[start:end], unit='ns'), 'Z')
+            pivot = pd.DataFrame({
+                'blank': '', 'result': '_result', 'table': 0,
+                '_time': times_text,
+                'location': location,
+                'process_stage': process_stage,
+                'sensor_id': all_sensors[start:end],
+                'humidity_percent': all_hums[start:end],
+                'temperature_celsius': all_temps[start:end],
+            })
+            raw = pd.concat([
+                pd.DataFrame({
+                    'blank': '', 'result': '_result', 'table': 0,
+                    '_time': times_text,
+                    '_value': pivot[field],
+                    '_field': field,
+                    '_measurement': 'environment_monitoring',
+                    'location': location,
+                    'process_stage': process_stage,
+                    'sensor_id': pivot['sensor_id'],
+                }) for field in FIELDS
+            ])
+            last_time = all_times[end - 1]
+            for kind, frame in (('raw', raw), ('pivot', pivot)):
+                path = os.path.join(self.directory, f"{kind}_{len(self.segments[kind]):06d}.csv")
+                frame.to_csv(path, header=False, index=False)
+                self.segments[kind].append((last_time, path))
+
+    @classmethod
+    def synthetic(cls, n_sensors, points_per_series, end=None, interval=np.timedelta64(1, 's'), seed=0):
+        """Data sintetis: n_sensors sensor, points_per_series titik per field, berakhir di `end`"""
+        api = cls()
+        end = end if end is not None else np.datetime64('now', 'ns')
+        times = end - interval * np.arange(points_per_series)[::-1]
+        rng = np.random.default_rng(seed)
+        shape = (n_sensors, points_per_series)
+        temperatures = 27 + np.cumsum(rng.normal(0, 0.05, shape), axis=1)
+        humidities = 60 + np.cumsum(rng.normal(0, 0.1, shape), axis=1)
+        sensor_ids = [f"SHT20-{i + 1:03d}" for i in range(n_sensors)]
+        api.add_samples(sensor_ids, times, temperatures, humidities)
+        return api
+
+    @classmethod
+    def recorded(cls, raw_csv_path):
+        """Memutar ulang hasil query_raw yang direkam (CSV dengan header, tanpa anotasi)"""
+        api = cls()
+        path = os.path.join(api.directory, "raw_000000.csv")
+        with open(raw_csv_path) as source, open(path, 'w') as target:
+            api.raw_header = source.readline()
+            shutil.copyfileobj(source, target)
+        names = api.raw_header.rstrip('\r\n').split(',')
+        raw = pd.read_csv(path, header=None, names=names)
+        last_time = pd.to_datetime(raw['_time'], utc=True, format='ISO8601').max()
+        last_time = np.datetime64(last_time.tz_convert(None), 'ns')
+        api.segments['raw'].append((last_time, path))
+
+        # Query dashboard di-pivot di server; segmen pivot dibuat dari rekaman mentah
+        pivot = raw.pivot_table(index=['_time', 'location', 'process_stage', 'sensor_id'],
+                                columns='_field', values='_value', aggfunc='last').reset_index()
+        pivot = pivot.reindex(columns=PIVOT_HEADER.rstrip('\n').split(',')[3:])
+        pivot.insert(0, 'table', 0)
+        pivot.insert(0, 'result', '_result')
+        pivot.insert(0, 'blank', '')
+        pivot_path = os.path.join(api.directory, "pivot_000000.csv")
+        pivot.to_csv(pivot_path, header=False, index=False)
+        api.segments['pivot'].append((last_time, pivot_path))
+        return api
+
+    def range_start(self, query):
+        """Waktu mulai dari range(start: ...) pada query Flux"""
+        match = re.search(r'range\(start:\s*([^,)]+)', query)
+        if match is None:
+            return None
+        start = match.group(1).strip()
+        if start.startswith('-'):
+            seconds = int(re.sub(r'\D', '', start)) * {'s': 1, 'd': 86400}[start[-1]]
+            return np.datetime64('now', 'ns') - np.timedelta64(seconds, 's')
+        return np.datetime64(start.rstrip('Z'), 'ns')
+
+    def query_raw(self, query, dialect=None):
+        self.queries.append(query)
+        kind = 'pivot' if 'pivot(' in query else 'raw'
+        start = self.range_start(query)
+        paths = [path for last_time, path in self.segments[kind] if start is None or last_time >= start]
+        header = PIVOT_HEADER if kind == 'pivot' else self.raw_header
+        return FakeResponse(paths, header)
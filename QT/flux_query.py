@@ -0,0 +1,199 @@
+import datetime
+import numpy as np
+
+
+MEASUREMENT = "environment_monitoring"
+FIELDS = ("temperature_celsius", "humidity_percent")
+
+
+def flux_string(value):
+    """Literal string Flux; tanda kutip dan backslash di-escape"""
+    escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def flux_time(value):
+    """Literal waktu Flux dari durasi relatif ('-24h'), detik unix, datetime atau datetime64"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        value = np.datetime64(value, 'us')
+    elif isinstance(value, (int, float, np.integer, np.floating)):
+        value = np.datetime64(int(value), 's')
+    return np.datetime_as_string(np.datetime64(value, 'us'), unit='us') + 'Z'
+
+
+def flux_duration(seconds):
+    """Durasi Flux dalam detik bulat, minimal 1s"""
+    return f"{max(int(seconds), 1)}s"
+
+
+def window_for(span_seconds, points):
+    """Lebar aggregateWindow agar rentang span_seconds menghasilkan paling banyak `points` baris per field"""
+    return flux_duration(np.ceil(span_seconds / max(points, 1)))
+
+
+def predicate(column, values):
+    """Predikat filter untuk satu atau beberapa nilai.
+
+    Beberapa nilai ditulis sebagai rangkaian `or` (bukan contains()) agar
+    filter tetap di-push down ke storage engine InfluxDB.
+    """
+    if isinstance(values, (str, bytes)):
+        values = [values]
+    return " or ".join(f'r[{flux_string(column)}] == {flux_string(value)}' for value in values)
+
+
+class FluxQuery:
+    """Builder query Flux untuk data sensor.
+
+    Urutan tahapan mengikuti pola yang bisa di-push down InfluxDB: range,
+    filter measurement/field/tag, lalu agregasi dan pivot di server sehingga
+    baris yang dikirim ke dashboard sudah sedikit dan sudah digabung per timestamp.
+
+        FluxQuery(bucket).range("-1h").tags(sensor_id="SHT20-001") \\
+            .aggregate("1m").pivot().build("mean")
+    """
+
+    def __init__(self, bucket, measurement=MEASUREMENT, fields=FIELDS):
+        self.bucket = bucket
+        self.measurement = measurement
+        self.field_names = tuple(fields)
+        self.start = None
+        self.stop = None
+        self.tag_filters = []
+        self.exists = False
+        self.windows = []  # (every, fn, time_src); lebih dari satu fn digabung dengan union
+        self.last_only = False
+        self.pivoted = False
+        self.columns = None
+        self.sort_columns = None
+        self.tag_key = None
+
+    def range(self, start, stop=None):
+        self.start, self.stop = start, stop
+        return self
+
+    def fields(self, *fields):
+        self.field_names = fields
+        return self
+
+    def tags(self, **tags):
+        """Filter tag; nilai None diabaikan, list berarti salah satu dari nilai tersebut"""
+        for column, values in tags.items():
+            if values is None or (not isinstance(values, str) and not len(values)):
+                continue
+            self.tag_filters.append(predicate(column, values))
+        return self
+
+    def where_exists(self):
+        """Membuang baris tanpa nilai"""
+        self.exists = True
+        return self
+
+    def aggregate(self, every, fn="mean", time_src="_stop"):
+        """aggregateWindow di server; every berupa durasi Flux ('1m') atau detik"""
+        if not isinstance(every, str):
+            every = flux_duration(every)
+        self.windows.append((every, fn, time_src))
+        return self
+
+    def last(self):
+        """Hanya baris terakhir tiap series (dibaca langsung dari storage engine)"""
+        self.last_only = True
+        return self
+
+    def pivot(self):
+        """Suhu dan kelembaban dalam satu baris per timestamp (setara schema.fieldsAsCols())"""
+        self.pivoted = True
+        return self
+
+    def keep(self, columns):
+        """Hanya kolom ini, lalu semua baris dalam satu tabel agar skema CSV seragam untuk pandas"""
+        self.columns = columns
+        return self
+
+    def sort(self, *columns):
+        self.sort_columns = columns
+        return self
+
+    def tag_values(self, tag):
+        """Hanya nilai unik satu tag lewat schema.tagValues (dari indeks tag, tanpa membaca data).
+
+        Filter field, agregasi dan pivot tidak berlaku; filter tag tetap dipakai sebagai predikat.
+        """
+        self.tag_key = tag
+        return self
+
+    def source(self):
+        if self.start is None:
+            raise ValueError("range() wajib diisi")
+        stop = f", stop: {flux_time(self.stop)}" if self.stop is not None else ""
+        lines = [
+            f'from(bucket: {flux_string(self.bucket)})',
+            f'  |> range(start: {flux_time(self.start)}{stop})',
+            f'  |> filter(fn: (r) => r["_measurement"] == {flux_string(self.measurement)})',
+        ]
+        if self.field_names:
+            lines.append(f'  |> filter(fn: (r) => {predicate("_field", self.field_names)})')
+        lines += [f'  |> filter(fn: (r) => {tag_filter})' for tag_filter in self.tag_filters]
+        if self.exists:
+            lines.append('  |> filter(fn: (r) => exists r._value)')
+        return lines
+
+    def tail(self):
+        lines = []
+        if self.last_only:
+            lines.append('  |> last()')
+        if self.pivoted:
+            # Hasil beberapa agregat dibedakan per kolom "stat", jadi ikut menjadi kunci baris
+            row_key = '["_time", "stat"]' if len(self.windows) > 1 else '["_time"]'
+            lines.append(f'  |> pivot(rowKey: {row_key}, columnKey: ["_field"], valueColumn: "_value")')
+        if self.columns is not None:
+            names = ", ".join(flux_string(name) for name in self.columns)
+            lines += [f'  |> keep(columns: [{names}])', '  |> group()']
+        if self.sort_columns:
+            names = ", ".join(flux_string(name) for name in self.sort_columns)
+            lines.append(f'  |> sort(columns: [{names}])')
+        return lines
+
+    def build_tag_values(self):
+        if self.start is None:
+            raise ValueError("range() wajib diisi")
+        conditions = [f'r["_measurement"] == {flux_string(self.measurement)}']
+        conditions += [f'({tag_filter})' for tag_filter in self.tag_filters]
+        arguments = [
+            f'bucket: {flux_string(self.bucket)}',
+            f'tag: {flux_string(self.tag_key)}',
+            f'predicate: (r) => {" and ".join(conditions)}',
+            f'start: {flux_time(self.start)}',
+        ]
+        if self.stop is not None:
+            arguments.append(f'stop: {flux_time(self.stop)}')
+        lines = ['import "influxdata/influxdb/schema"', '', 'schema.tagValues(']
+        lines.append(",\n".join(f'    {argument}' for argument in arguments))
+        lines.append(')')
+        return "\n".join(lines) + "\n"
+
+    def build(self, yield_name=None):
+        if self.tag_key is not None:
+            return self.build_tag_values()
+        source = self.source()
+        if len(self.windows) > 1:
+            # Beberapa agregat dari satu pembacaan storage; kolom "stat" berisi nama fungsinya
+            branches = ",\n".join(
+                f'  data |> aggregateWindow(every: {every}, fn: {fn}, createEmpty: false, timeSrc: "{time_src}")'
+                f' |> set(key: "stat", value: "{fn}")'
+                for every, fn, time_src in self.windows)
+            lines = ["data = " + source[0]] + source[1:] + ["union(tables: [", branches, "])"]
+        else:
+            lines = source
+            for every, fn, time_src in self.windows:
+                lines.append(f'  |> aggregateWindow(every: {every}, fn: {fn}, createEmpty: false, '
+                             f'timeSrc: "{time_src}")')
+        lines += self.tail()
+        if yield_name:
+            lines.append(f'  |> yield(name: {flux_string(yield_name)})')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+from influxdb_client import Dialect
+
+
+# CSV tanpa anotasi: satu baris header lalu data, bisa langsung dibaca pandas
+CSV_DIALECT = Dialect(header=True, delimiter=",", annotations=[], date_time_format="RFC3339Nano")
+
+# Kolom hasil pivot (suhu dan kelembaban sudah dalam satu baris) dan nama kolom hasilnya
+PIVOT_COLUMNS = {
+    '_time': 'time',
+    'location': 'location',
+    'process_stage': 'process_stage',
+    'sensor_id': 'sensor_id',
+    'temperature_celsius': 'temperature_celsius',
+    'humidity_percent': 'humidity_percent',
+}
+
+DTYPES = {
+    'stat': 'category',
+    'location': 'category',
+    'process_stage': 'category',
+    'sensor_id': 'category',
+    'temperature_celsius': 'float64',
+    'humidity_percent': 'float64',
+}
+
+CHUNK_SIZE = 50_000  # Jumlah baris CSV per chunk
+
+
+def stream_frames(query_api, query, chunk_size=CHUNK_SIZE, columns=PIVOT_COLUMNS):
+    """Membaca hasil query sebagai stream CSV dan menghasilkan DataFrame per chunk.
+
+    Response HTTP dibaca bertahap oleh pandas sehingga memori puncak sebanding
+    dengan ukuran chunk, bukan dengan panjang rentang query.
+    """
+    response = query_api.query_raw(query, dialect=CSV_DIALECT)
+    try:
+        reader = pd.read_csv(
+            response,
+            usecols=lambda column: column in columns,
+            dtype={name: dtype for name, dtype in DTYPES.items() if name in columns},
+            chunksize=chunk_size,
+        )
+        for chunk in reader:
+            chunk = chunk.rename(columns=columns)
+            if 'time' in chunk:
+                chunk['time'] = pd.to_datetime(chunk['time'], utc=True, format='ISO8601')
+            yield chunk
+    except pd.errors.EmptyDataError:
+        return  # Query tidak mengembalikan data
+    finally:
+        response.close()
+
+
+def field_arrays(frame, field):
+    """Array waktu (datetime64[ns], UTC) dan nilai (float64) satu field dari baris hasil pivot.
+
+    Timestamp yang hanya punya field lain (nilai kosong setelah pivot) dilewati.
+    """
+    if field not in frame:
+        return np.empty(0, dtype='datetime64[ns]'), np.empty(0, dtype='float64')
+    values = frame[field].to_numpy(dtype='float64')
+    mask = ~np.isnan(values)
+    times = frame['time'].dt.tz_convert(None).to_numpy(dtype='datetime64[ns]')[mask]
+    return times, values[mask]
+
+
+def sort_by_time(times, values):
+    """Mengurutkan pasangan array berdasarkan waktu jika belum terurut"""
+    if len(times) > 1 and np.any(times[1:] < times[:-1]):
+        order = np.argsort(times, kind='stable')
+        return times[order], values[order]
+    return times, values
@@ -0,0 +1,49 @@
+import time
+from PyQt6 import QtCore
+from PyQt6.QtCore import pyqtSignal, pyqtSlot
+from tile_cache import load_view
+
+
+class TileWorker(QtCore.QObject):
+    """Memuat tile riwayat (min/mean/max) di thread sendiri agar zoom/pan tidak memblokir GUI.
+
+    Permintaan diproses berurutan; permintaan yang sudah digantikan oleh yang
+    lebih baru (latest_request) dilewati tanpa query.
+    """
+
+    tiles_ready = pyqtSignal(object)  # payload dict deret per field
+    failed = pyqtSignal(int, str)  # request_id, pesan error
+
+    def __init__(self, cache, fields):
+        super().__init__()
+        self.cache = cache  # TileCache, hanya diakses dari thread worker
+        self.fields = fields
+
+        # Ditulis dari thread GUI (atomic di bawah GIL)
+        self.latest_request = 0
+
+    def is_stale(self, request_id):
+        return request_id != self.latest_request
+
+    @pyqtSlot(object)
+    def load(self, request):
+        request_id = request['request_id']
+        if self.is_stale(request_id):
+            return
+        started = time.perf_counter()
+        try:
+            series, cached, fetched = load_view(
+                self.cache, request['query_api'], request['bucket'], request['sensor_id'], self.fields,
+                request['level'], request['start'], request['end'], request['now'],
+                cancelled=lambda: self.is_stale(request_id))
+        except Exception as e:
+            self.failed.emit(request_id, str(e))
+            return
+        self.tiles_ready.emit({
+            'request_id': request_id,
+            'level': request['level'],
+            'series': series,
+            'cached': cached,
+            'fetched': fetched,
+            'seconds': time.perf_counter() - started,
+        })
@@ -0,0 +1,124 @@
+import datetime
+import os
+import sqlite3
+import time
+import numpy as np
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".sht20_dashboard", "history_cache.sqlite3")
+
+
+class HistoryCache:
+    """Cache riwayat lokal di SQLite, dikunci per (sensor_id, field, time).
+
+    Dipakai untuk warm start: data yang sudah pernah diambil dimuat dari disk,
+    lalu hanya ekor yang belum ada diambil dari InfluxDB. Koneksi dibuat dan
+    dipakai di thread worker; close() baru dipanggil setelah thread itu berhenti.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, retention=datetime.timedelta(days=7),
+                 max_rows=5_000_000, compact_interval=datetime.timedelta(hours=6)):
+        self.path = path
+        self.retention = retention  # Data lebih lama dari ini dihapus
+        self.max_rows = max_rows  # Batas jumlah baris; yang terlama dihapus lebih dulu
+        self.compact_interval = compact_interval
+        self.last_maintenance = time.monotonic()
+        self.connection = None
+
+    def connect(self):
+        if self.connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS samples (
+                    sensor_id TEXT NOT NULL,
+                    field TEXT NOT NULL,
+                    time INTEGER NOT NULL,
+                    value REAL NOT NULL,
+                    PRIMARY KEY (sensor_id, field, time)
+                ) WITHOUT ROWID
+            """)
+            self.connection.execute("CREATE INDEX IF NOT EXISTS samples_time ON samples (time)")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS sensors (
+                    sensor_id TEXT PRIMARY KEY,
+                    location TEXT,
+                    process_stage TEXT
+                )
+            """)
+            self.connection.commit()
+        return self.connection
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def load(self, since):
+        """Memuat data sejak `since` (datetime64 UTC).
+
+        Mengembalikan (series, metadata): series (sensor_id, field) -> (times, values)
+        dan metadata sensor_id -> (location, process_stage).
+        """
+        connection = self.connect()
+        since_ns = int(np.datetime64(since, 'ns').astype('int64'))
+        series = {}
+        keys = connection.execute(
+            "SELECT DISTINCT sensor_id, field FROM samples WHERE time >= ?", (since_ns,)).fetchall()
+        for sensor_id, field in keys:
+            rows = connection.execute(
+                "SELECT time, value FROM samples WHERE sensor_id = ? AND field = ? AND time >= ? ORDER BY time",
+                (sensor_id, field, since_ns)).fetchall()
+            data = np.array(rows, dtype=[('time', 'int64'), ('value', 'float64')])
+            series[(sensor_id, field)] = (data['time'].astype('datetime64[ns]'), data['value'].copy())
+
+        metadata = {sensor_id: (location, process_stage) for sensor_id, location, process_stage
+                    in connection.execute("SELECT sensor_id, location, process_stage FROM sensors")}
+        return series, metadata
+
+    def append(self, samples, metadata):
+        """Menyimpan sampel baru [(sensor_id, field, times, values)] dan metadata sensor"""
+        connection = self.connect()
+        with connection:
+            for sensor_id, field, times, values in samples:
+                if not len(times):
+                    continue
+                connection.executemany(
+                    "INSERT OR REPLACE INTO samples (sensor_id, field, time, value) VALUES (?, ?, ?, ?)",
+                    ((sensor_id, field, t, v) for t, v in
+                     zip(times.astype('int64').tolist(), values.tolist())))
+            connection.executemany(
+                "INSERT OR REPLACE INTO sensors (sensor_id, location, process_stage) VALUES (?, ?, ?)",
+                ((sensor_id, str(location), str(process_stage))
+                 for sensor_id, (location, process_stage) in metadata.items()))
+
+    def evict(self):
+        """Menghapus data di luar retention dan di atas batas jumlah baris"""
+        connection = self.connect()
+        cutoff = (np.datetime64('now', 'ns') - np.timedelta64(self.retention)).astype('int64')
+        with connection:
+            connection.execute("DELETE FROM samples WHERE time < ?", (int(cutoff),))
+            count = connection.execute("SELECT COUNT(*) FROM samples").fetchone()[0]
+            excess = count - self.max_rows
+            if excess > 0:
+                oldest = connection.execute(
+                    "SELECT time FROM samples ORDER BY time LIMIT 1 OFFSET ?", (excess,)).fetchone()
+                if oldest is not None:
+                    connection.execute("DELETE FROM samples WHERE time < ?", (oldest[0],))
+
+    def compact(self):
+        """Mengembalikan ruang disk setelah eviction"""
+        connection = self.connect()
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        connection.execute("VACUUM")
+        connection.execute("PRAGMA optimize")
+
+    def maintain(self):
+        """Eviction dan compaction berkala; dipanggil setelah setiap fetch"""
+        if time.monotonic() - self.last_maintenance < self.compact_interval.total_seconds():
+            return
+        self.evict()
+        self.compact()
+        self.last_maintenance = time.monotonic()
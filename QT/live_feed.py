@@ -0,0 +1,113 @@
+import json
+from PyQt6 import QtCore, QtNetwork
+from PyQt6.QtCore import pyqtSignal
+
+
+DEFAULT_LIVE_ADDRESS = "127.0.0.1:7880"  # Live feed tcp_server (atau loadtest/live_publisher.py)
+FLUSH_INTERVAL_MS = 200  # Pembacaan yang datang berdekatan dikirim sebagai satu batch
+RECONNECT_MIN_MS = 1_000
+RECONNECT_MAX_MS = 30_000
+
+
+class LiveFeedClient(QtCore.QObject):
+    """Subscriber live feed NDJSON (satu objek SensorData per baris) di thread GUI.
+
+    QTcpSocket bekerja lewat event loop sehingga tidak perlu thread sendiri.
+    Pembacaan dikumpulkan selama FLUSH_INTERVAL_MS lalu dikirim sekaligus lewat
+    readings_received. Koneksi yang putus dicoba ulang dengan backoff.
+    """
+
+    readings_received = pyqtSignal(object)  # list dict SensorData
+    connected = pyqtSignal()
+    disconnected = pyqtSignal(str)  # alasan
+    lagged = pyqtSignal()  # Publisher melewatkan pembacaan; celahnya harus diambil dari InfluxDB
+
+    def __init__(self, address=DEFAULT_LIVE_ADDRESS, parent=None):
+        super().__init__(parent)
+        host, port = address.rsplit(":", 1)
+        self.host = host
+        self.port = int(port)
+        self.running = False
+        self.buffer = b""
+        self.pending = []
+        self.invalid_lines = 0
+        self.reconnect_delay = RECONNECT_MIN_MS
+
+        self.socket = QtNetwork.QTcpSocket(self)
+        self.socket.connected.connect(self.on_connected)
+        self.socket.disconnected.connect(self.on_disconnected)
+        self.socket.errorOccurred.connect(self.on_error)
+        self.socket.readyRead.connect(self.on_ready_read)
+
+        self.flush_timer = QtCore.QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush)
+        self.reconnect_timer = QtCore.QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.timeout.connect(self.connect_to_feed)
+
+    def is_connected(self):
+        return self.socket.state() == QtNetwork.QAbstractSocket.SocketState.ConnectedState
+
+    def start(self):
+        self.running = True
+        self.reconnect_delay = RECONNECT_MIN_MS
+        self.connect_to_feed()
+
+    def stop(self):
+        self.running = False
+        self.reconnect_timer.stop()
+        self.flush()
+        self.socket.abort()
+
+    def connect_to_feed(self):
+        if self.running and self.socket.state() == QtNetwork.QAbstractSocket.SocketState.UnconnectedState:
+            self.buffer = b""
+            self.socket.connectToHost(self.host, self.port)
+
+    def schedule_reconnect(self):
+        if self.running and not self.reconnect_timer.isActive():
+            self.reconnect_timer.start(self.reconnect_delay)
+            self.reconnect_delay = min(self.reconnect_delay * 2, RECONNECT_MAX_MS)
+
+    def on_connected(self):
+        self.reconnect_delay = RECONNECT_MIN_MS
+        self.connected.emit()
+
+    def on_disconnected(self):
+        self.flush()
+        self.disconnected.emit("Koneksi live feed terputus")
+        self.schedule_reconnect()
+
+    def on_error(self, error):
+        if error == QtNetwork.QAbstractSocket.SocketError.RemoteHostClosedError:
+            return  # Ditangani on_disconnected
+        if self.socket.state() != QtNetwork.QAbstractSocket.SocketState.ConnectedState:
+            self.disconnected.emit(self.socket.errorString())
+            self.schedule_reconnect()
+
+    def on_ready_read(self):
+        self.buffer += bytes(self.socket.readAll())
+        *lines, self.buffer = self.buffer.split(b"\n")
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                reading = json.loads(line)
+            except ValueError:
+                self.invalid_lines += 1
+                continue
+            if not isinstance(reading, dict):
+                self.invalid_lines += 1
+            elif 'lagged' in reading:
+                self.lagged.emit()
+            else:
+                self.pending.append(reading)
+        if self.pending and not self.flush_timer.isActive():
+            self.flush_timer.start(FLUSH_INTERVAL_MS)
+
+    def flush(self):
+        self.flush_timer.stop()
+        if self.pending:
+            readings, self.pending = self.pending, []
+            self.readings_received.emit(readings)
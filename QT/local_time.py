@@ -0,0 +1,40 @@
+import datetime
+import numpy as np
+import pytz
+
+
+TIMEZONE = pytz.timezone('Asia/Jakarta')
+
+# WIB tidak punya DST, jadi offset cukup dihitung sekali dan ditambahkan secara vektor
+LOCAL_OFFSET = np.timedelta64(int(TIMEZONE.utcoffset(datetime.datetime(2000, 1, 1)).total_seconds()), 's')
+
+
+def to_local(times):
+    """Array datetime64 UTC -> datetime64[ns] WIB (tanpa timezone), satu operasi vektor"""
+    return np.asarray(times, dtype='datetime64[ns]') + LOCAL_OFFSET
+
+
+def format_local(time, unit='s'):
+    """Satu timestamp datetime64 UTC sebagai teks WIB 'YYYY-MM-DD HH:MM:SS'"""
+    return np.datetime_as_string(np.datetime64(time, 'ns') + LOCAL_OFFSET, unit=unit).replace('T', ' ')
+
+
+def format_local_array(times, unit='s'):
+    """Array datetime64 UTC -> array teks WIB 'YYYY-MM-DD HH:MM:SS', dikonversi sekali untuk semua baris"""
+    text = np.datetime_as_string(to_local(times), unit=unit)
+    return np.char.replace(text, 'T', ' ') if len(text) else text
+
+
+def nearest_index(times, target):
+    """Indeks sampel terdekat ke `target` pada array waktu terurut (binary search), None jika kosong"""
+    count = len(times)
+    if not count:
+        return None
+    target = np.datetime64(target, 'ns')
+    index = int(np.searchsorted(times, target))
+    if index == 0:
+        return 0
+    if index == count:
+        return count - 1
+    before, after = times[index - 1], times[index]
+    return index - 1 if target - before <= after - target else index
@@ -0,0 +1,148 @@
+"""Leaf dan Merkle proof batch anchoring (sama dengan Fermentation.sol dan tcp_server/src/anchor.rs).
+
+Keccak-256 dihitung secara vektor dengan NumPy: satu permutasi Keccak-f[1600]
+dijalankan sekaligus untuk banyak pesan yang panjangnya sama, sehingga ribuan
+leaf atau proof bisa dicek tanpa library kripto tambahan.
+"""
+import numpy as np
+
+
+RATE = 136  # Byte per blok untuk Keccak-256
+
+ROUND_CONSTANTS = np.array([
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+], dtype=np.uint64)
+
+# Offset rotasi per lane (x, y), disimpan di indeks x + 5 * y
+ROTATIONS = np.array([
+    0, 1, 62, 28, 27,
+    36, 44, 6, 55, 20,
+    3, 10, 43, 25, 39,
+    41, 45, 15, 21, 8,
+    18, 2, 61, 56, 14,
+], dtype=np.uint64)[:, None]
+
+# Langkah pi: lane (x, y) pindah ke (y, 2x + 3y); PI_SOURCES[tujuan] = asal
+PI_SOURCES = np.argsort([y + 5 * ((2 * x + 3 * y) % 5) for y in range(5) for x in range(5)])
+
+BLOCK_MESSAGES = 8192  # Pesan per permutasi; state kecil tetap di cache CPU
+
+
+def keccak_f(state):
+    """Permutasi Keccak-f[1600] untuk state berbentuk (25, N) uint64, di tempat.
+
+    Shift 64 bit pada NumPy menghasilkan 0, jadi rotasi 0 tidak perlu kasus khusus.
+    """
+    lanes = state.reshape(5, 5, -1)  # (y, x, pesan)
+    for constant in ROUND_CONSTANTS:
+        columns = np.bitwise_xor.reduce(lanes, axis=0)
+        rotated = (columns << np.uint64(1)) | (columns >> np.uint64(63))
+        lanes ^= (columns[[4, 0, 1, 2, 3]] ^ rotated[[1, 2, 3, 4, 0]])[None]
+        moved = ((state << ROTATIONS) | (state >> (np.uint64(64) - ROTATIONS)))[PI_SOURCES].reshape(5, 5, -1)
+        lanes[:] = moved ^ (~moved[:, [1, 2, 3, 4, 0]] & moved[:, [2, 3, 4, 0, 1]])
+        state[0] ^= constant
+    return state
+
+
+def keccak256(messages):
+    """Keccak-256 untuk array byte (N, L) (semua pesan sama panjang); mengembalikan (N, 32) uint8"""
+    messages = np.asarray(messages, dtype=np.uint8)
+    count, length = messages.shape
+    padded = np.zeros((count, (length // RATE + 1) * RATE), dtype=np.uint8)
+    padded[:, :length] = messages
+    padded[:, length] ^= 0x01
+    padded[:, -1] ^= 0x80
+    lanes = padded.view('<u8').T.astype(np.uint64)  # (lane, pesan)
+    digests = np.empty((count, 32), dtype=np.uint8)
+    for first in range(0, count, BLOCK_MESSAGES):
+        part = lanes[:, first:first + BLOCK_MESSAGES]
+        state = np.zeros((25, part.shape[1]), dtype=np.uint64)
+        for block in range(0, part.shape[0], RATE // 8):
+            state[:RATE // 8] ^= part[block:block + RATE // 8]
+            keccak_f(state)
+        digests[first:first + BLOCK_MESSAGES] = np.ascontiguousarray(state[:4].T, dtype='<u8').view(np.uint8).reshape(-1, 32)
+    return digests
+
+
+def keccak256_bytes(data):
+    return keccak256(np.frombuffer(data, dtype=np.uint8).reshape(1, -1))[0].tobytes()
+
+
+def abi_word(value):
+    """Satu word ABI (int256/uint256, two's complement)"""
+    return (int(value) % (1 << 256)).to_bytes(32, 'big')
+
+
+def abi_string(text):
+    data = text.encode('utf-8')
+    return abi_word(len(data)) + data + bytes(-len(data) % 32)
+
+
+def encode_reading(sensor_id, location, process_stage, timestamp, temperature_x10, humidity_x10):
+    """abi.encode(string, string, string, uint256, int256, uint256) seperti Fermentation.readingLeaf"""
+    tails = [abi_string(str(text)) for text in (sensor_id, location, process_stage)]
+    offset = 6 * 32
+    head = b''
+    for tail in tails:
+        head += abi_word(offset)
+        offset += len(tail)
+    head += abi_word(timestamp) + abi_word(temperature_x10) + abi_word(humidity_x10)
+    return head + b''.join(tails)
+
+
+def hash_many(encoded):
+    """Keccak-256 untuk daftar bytes dengan panjang bebas; dikelompokkan per panjang"""
+    digests = np.empty((len(encoded), 32), dtype=np.uint8)
+    lengths = np.fromiter((len(data) for data in encoded), dtype=np.int64, count=len(encoded))
+    for length in np.unique(lengths):
+        rows = np.flatnonzero(lengths == length)
+        block = np.frombuffer(b''.join(encoded[row] for row in rows), dtype=np.uint8)
+        digests[rows] = keccak256(block.reshape(len(rows), int(length)))
+    return digests
+
+
+def reading_leaves(sensor_ids, locations, process_stages, timestamps, temperatures_x10, humidities_x10):
+    """Leaf (N, 32) untuk kolom-kolom pembacaan; nilai x10 harus sudah bilangan bulat"""
+    encoded = [encode_reading(*row) for row in zip(sensor_ids, locations, process_stages, timestamps,
+                                                   temperatures_x10, humidities_x10)]
+    return hash_many(encoded)
+
+
+def hash_pairs(a, b):
+    """keccak256(lebih kecil || lebih besar) per baris, sama dengan verifyReading"""
+    differs = a != b
+    first = differs.argmax(axis=1)
+    rows = np.arange(len(a))
+    a_first = (a[rows, first] < b[rows, first])[:, None]
+    pairs = np.concatenate([np.where(a_first, a, b), np.where(a_first, b, a)], axis=1)
+    return keccak256(pairs)
+
+
+def fold_proofs(leaves, proofs):
+    """Root hasil menerapkan proof ke leaf-nya; proofs berupa list array (depth, 32) per baris"""
+    roots = np.array(leaves, dtype=np.uint8).reshape(-1, 32)
+    depths = np.fromiter((len(proof) for proof in proofs), dtype=np.int64, count=len(proofs))
+    for depth in np.unique(depths):
+        rows = np.flatnonzero(depths == depth)
+        if not depth:
+            continue
+        siblings = np.stack([proofs[row] for row in rows])  # (baris, depth, 32)
+        nodes = roots[rows]
+        for level in range(int(depth)):
+            nodes = hash_pairs(nodes, siblings[:, level])
+        roots[rows] = nodes
+    return roots
+
+
+def from_hex(text):
+    """'0x..' (32 byte) -> array (32,) uint8"""
+    return np.frombuffer(bytes.fromhex(text[2:] if text.startswith('0x') else text), dtype=np.uint8)
+
+
+def to_hex(digest):
+    return '0x' + bytes(digest).hex()
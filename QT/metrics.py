@@ -0,0 +1,205 @@
+import collections
+import http.server
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+import numpy as np
+
+
+# Batas bucket histogram Prometheus (detik)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BARS = "▁▂▃▄▅▆▇█"
+DEFAULT_LOG_PATH = os.path.join(os.path.expanduser("~"), ".sht20_dashboard", "metrics.jsonl")
+
+# Urutan tahapan satu tick update_data
+STAGES = (
+    "query",     # Round-trip query sampai chunk pertama diterima
+    "parse",     # Pembacaan dan parsing CSV chunk berikutnya
+    "group",     # Pemisahan baris per sensor dan field
+    "store",     # Insert ke SeriesStore
+    "cache",     # Penulisan ke cache lokal
+    "pivot",     # Penggabungan suhu dan kelembaban per timestamp untuk tabel
+    "chart",     # update_chart kedua field
+    "table",     # update_data_table
+    "alerts",    # check_alert_conditions
+    "total",     # update_data sampai on_data_ready selesai
+)
+
+
+class StageTimer:
+    """Akumulasi durasi per tahapan untuk satu tick"""
+
+    def __init__(self):
+        self.timings = collections.defaultdict(float)  # tahapan -> detik
+
+    def add(self, stage, seconds):
+        self.timings[stage] += seconds
+
+    def measure(self, stage, started):
+        """Menambahkan waktu sejak `started` (perf_counter) dan mengembalikan waktu sekarang"""
+        now = time.perf_counter()
+        self.timings[stage] += now - started
+        return now
+
+
+class Histogram:
+    """Histogram kumulatif (format Prometheus) plus jendela bergulir untuk persentil"""
+
+    def __init__(self, window):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.recent = collections.deque(maxlen=window)
+
+    def observe(self, seconds):
+        self.counts[int(np.searchsorted(BUCKETS, seconds))] += 1
+        self.total += seconds
+        self.count += 1
+        self.recent.append(seconds)
+
+    def percentiles(self, *ps):
+        if not self.recent:
+            return [None] * len(ps)
+        return list(np.percentile(np.fromiter(self.recent, float), ps))
+
+    def sparkline(self):
+        """Histogram bergulir per bucket sebagai deret karakter blok"""
+        if not self.recent:
+            return ""
+        counts = np.bincount(np.searchsorted(BUCKETS, np.fromiter(self.recent, float)),
+                             minlength=len(BUCKETS) + 1)
+        used = np.flatnonzero(counts)
+        counts = counts[used[0]:used[-1] + 1]
+        levels = np.ceil(counts / counts.max() * (len(BARS) - 1)).astype(int)
+        return "".join(BARS[level] if count else " " for level, count in zip(levels, counts))
+
+
+class Metrics:
+    """Metrik hot path dashboard: histogram per tahapan, log terstruktur dan teks Prometheus.
+
+    Dipanggil dari thread GUI, dibaca dari thread endpoint HTTP; semua akses memakai lock.
+    """
+
+    def __init__(self, window=500, log_path=DEFAULT_LOG_PATH):
+        self.window = window  # Jumlah tick terakhir untuk persentil dan histogram di statusbar
+        self.histograms = {}
+        self.rows = collections.deque(maxlen=window)
+        self.ticks = 0
+        self.last_rows = 0
+        self.lock = threading.Lock()
+        self.logger = self.setup_logger(log_path) if log_path else None
+
+    @staticmethod
+    def setup_logger(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        logger = logging.getLogger("sht20.metrics")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        if not logger.handlers:
+            handler = logging.handlers.RotatingFileHandler(path, maxBytes=5_000_000, backupCount=3,
+                                                           encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+        return logger
+
+    def record_tick(self, request_id, rows, timings):
+        """Mencatat satu tick: timings tahapan -> detik, rows jumlah baris yang dibaca"""
+        with self.lock:
+            self.ticks += 1
+            self.last_rows = rows
+            self.rows.append(rows)
+            for stage, seconds in timings.items():
+                if stage not in self.histograms:
+                    self.histograms[stage] = Histogram(self.window)
+                self.histograms[stage].observe(seconds)
+        if self.logger is not None:
+            self.logger.info(json.dumps({
+                'ts': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                'request_id': request_id,
+                'rows': rows,
+                'ms': {stage: round(seconds * 1000, 3) for stage, seconds in timings.items()},
+            }))
+
+    def ordered_stages(self):
+        return [stage for stage in STAGES if stage in self.histograms] + \
+            sorted(set(self.histograms) - set(STAGES))
+
+    def status_text(self):
+        """Ringkasan singkat untuk statusbar"""
+        with self.lock:
+            histogram = self.histograms.get("total")
+            if histogram is None:
+                return ""
+            p50, p95 = histogram.percentiles(50, 95)
+            return (f"Refresh {histogram.sparkline()} p50 {p50 * 1000:.0f} ms · "
+                    f"p95 {p95 * 1000:.0f} ms · {self.last_rows} baris")
+
+    def detail_text(self):
+        """Tabel persentil semua tahapan (tooltip statusbar)"""
+        with self.lock:
+            lines = [f"{len(self.rows)} tick terakhir, rata-rata {np.mean(self.rows) if self.rows else 0:.0f} baris/tick",
+                     f"{'tahap':<8}{'p50':>9}{'p95':>9}{'max':>9}  histogram"]
+            for stage in self.ordered_stages():
+                histogram = self.histograms[stage]
+                p50, p95, p100 = histogram.percentiles(50, 95, 100)
+                lines.append(f"{stage:<8}{p50 * 1000:>7.1f}ms{p95 * 1000:>7.1f}ms{p100 * 1000:>7.1f}ms  "
+                             f"{histogram.sparkline()}")
+            return "\n".join(lines)
+
+    def prometheus_text(self):
+        """Eksposisi format teks Prometheus"""
+        lines = [
+            "# HELP sht20_stage_duration_seconds Durasi tahapan update_data",
+            "# TYPE sht20_stage_duration_seconds histogram",
+        ]
+        with self.lock:
+            for stage in self.ordered_stages():
+                histogram = self.histograms[stage]
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f'sht20_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'sht20_stage_duration_seconds_sum{{stage="{stage}"}} {histogram.total}')
+                lines.append(f'sht20_stage_duration_seconds_count{{stage="{stage}"}} {histogram.count}')
+            lines += [
+                "# HELP sht20_ticks_total Jumlah tick update_data yang selesai",
+                "# TYPE sht20_ticks_total counter",
+                f"sht20_ticks_total {self.ticks}",
+                "# HELP sht20_tick_rows Jumlah baris yang dibaca pada tick terakhir",
+                "# TYPE sht20_tick_rows gauge",
+                f"sht20_tick_rows {self.last_rows}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Endpoint HTTP lokal /metrics (format teks Prometheus) di thread daemon"""
+
+    def __init__(self, metrics, port, host="127.0.0.1"):
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Jangan tulis log akses ke stderr
+
+        self.server = http.server.ThreadingHTTPServer((host, port), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,130 @@
+import random
+from PyQt6 import QtCore
+from PyQt6.QtCore import pyqtSignal
+
+
+class PollScheduler(QtCore.QObject):
+    """Satu-satunya pemilik timer polling InfluxDB.
+
+    Timer single-shot dipasang ulang setelah setiap fetch selesai sehingga tick
+    tidak pernah tumpang-tindih. Permintaan tick saat fetch masih berjalan
+    digabung menjadi satu tick susulan. Interval menyesuaikan diri:
+    - ada data baru: kembali ke interval dasar
+    - tidak ada data baru: diperlambat bertahap sampai max_idle_interval
+    - fetch gagal: backoff eksponensial (dengan jitter) sampai max_backoff
+    - ada alasan perlambatan (jendela diminimalkan, tab tanpa data live
+      dibuka): minimal slow_interval, data dan alert tetap diperbarui
+    Polling dijeda selama ada alasan jeda (misal live feed tersambung).
+    """
+
+    tick = pyqtSignal()
+
+    def __init__(self, interval, max_idle_interval=60_000, max_backoff=300_000,
+                 slow_interval=60_000, parent=None, timer=None, rng=None):
+        super().__init__(parent)
+        self.base_interval = interval  # ms
+        self.max_idle_interval = max_idle_interval
+        self.max_backoff = max_backoff
+        self.slow_interval = slow_interval
+        self.interval = interval
+        self.failures = 0
+        self.running = False
+        self.busy = False  # Tick sudah dikirim, fetch belum selesai
+        self.pending = False  # Ada permintaan tick selama busy
+        self.slow_reasons = set()
+        self.pause_reasons = set()
+
+        self.rng = rng or random.Random()  # Sumber jitter; tes memberi seed tetap
+        # Timer bisa diganti (misal timer palsu di tes) selama punya start/stop/isActive/timeout
+        self.timer = timer or QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.trigger)
+
+    def start(self):
+        """Mulai polling dengan tick pertama langsung"""
+        self.running = True
+        self.busy = False
+        self.pending = False
+        self.failures = 0
+        self.interval = self.base_interval
+        self.trigger()
+
+    def stop(self):
+        self.running = False
+        self.busy = False
+        self.pending = False
+        self.timer.stop()
+
+    def trigger(self):
+        """Tick sekarang; jika fetch masih berjalan, satu tick susulan dijadwalkan setelahnya"""
+        if not self.running:
+            return
+        if self.busy:
+            self.pending = True
+            return
+        self.timer.stop()
+        self.busy = True
+        self.tick.emit()
+
+    def done(self, has_new_data=False, failed=False):
+        """Dipanggil setelah fetch selesai atau gagal; menentukan interval berikutnya"""
+        self.busy = False
+        if failed:
+            self.failures += 1
+            backoff = min(self.base_interval * 2 ** self.failures, self.max_backoff)
+            self.interval = int(backoff * self.rng.uniform(0.8, 1.2))
+        elif has_new_data:
+            self.failures = 0
+            self.interval = self.base_interval
+        else:
+            self.failures = 0
+            self.interval = min(int(self.interval * 1.5), max(self.max_idle_interval, self.base_interval))
+
+        if self.pending and not failed:
+            self.pending = False
+            self.trigger()
+        else:
+            self.pending = False
+            self.arm()
+
+    def arm(self):
+        if self.running and not self.busy and not self.pause_reasons:
+            self.timer.start(self.next_interval())
+
+    def next_interval(self):
+        if self.slow_reasons:
+            return max(self.interval, self.slow_interval)
+        return self.interval
+
+    def set_paused(self, reason, paused):
+        """Menambah/menghapus alasan jeda; saat jeda terakhir dilepas, data langsung dikejar"""
+        if paused:
+            self.pause_reasons.add(reason)
+            self.timer.stop()
+        elif reason in self.pause_reasons:
+            self.pause_reasons.discard(reason)
+            if not self.pause_reasons and not self.busy:
+                self.trigger()
+
+    def set_slow(self, reason, slow):
+        """Menambah/menghapus alasan perlambatan; timer yang aktif dipasang ulang"""
+        was_slow = bool(self.slow_reasons)
+        if slow:
+            self.slow_reasons.add(reason)
+        else:
+            self.slow_reasons.discard(reason)
+        if bool(self.slow_reasons) == was_slow:
+            return
+        if self.timer.isActive():
+            self.timer.start(self.next_interval())
+        elif was_slow:
+            self.arm()
+
+    def status_text(self):
+        if not self.running:
+            return ""
+        if self.pause_reasons:
+            return "Polling dijeda"
+        if self.failures:
+            return f"InfluxDB bermasalah, coba lagi dalam {self.next_interval() / 1000:.0f} s"
+        return f"Polling tiap {self.next_interval() / 1000:.0f} s"
@@ -0,0 +1,79 @@
+import time
+from flux_query import FluxQuery
+
+
+DEFAULT_TTL = 600  # Detik sebelum metadata dimuat ulang dari InfluxDB
+DEFAULT_LOOKBACK = "-30d"  # Sensor yang tidak mengirim data selama ini tidak dimuat
+
+METADATA_COLUMNS = {
+    '_time': 'time',
+    'sensor_id': 'sensor_id',
+    'location': 'location',
+    'process_stage': 'process_stage',
+}
+
+
+def build_sensor_ids_query(bucket, lookback=DEFAULT_LOOKBACK):
+    """Daftar sensor_id dari indeks tag InfluxDB (tanpa membaca data)"""
+    return FluxQuery(bucket).range(lookback).tag_values("sensor_id").build()
+
+
+def build_metadata_query(bucket, lookback=DEFAULT_LOOKBACK):
+    """Tag lokasi dan tahap proses terbaru per sensor: satu baris per series lewat last()"""
+    return FluxQuery(bucket, fields=("temperature_celsius",)) \
+        .range(lookback) \
+        .last() \
+        .keep(METADATA_COLUMNS) \
+        .build()
+
+
+class SensorRegistry:
+    """Metadata sensor (lokasi, tahap proses) yang dimuat sekali dari InfluxDB dan di-cache dengan TTL.
+
+    Ditulis dari thread worker dan dibaca dari thread GUI; isi dict tidak
+    pernah diubah di tempat, selalu diganti utuh (atomic di bawah GIL).
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, lookback=DEFAULT_LOOKBACK):
+        self.ttl = ttl
+        self.lookback = lookback
+        self.metadata = {}  # sensor_id -> (location, process_stage)
+        self.loaded_at = None  # time.monotonic() saat terakhir dimuat dari InfluxDB
+
+    def is_stale(self):
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl
+
+    def get(self, sensor_id):
+        return self.metadata.get(sensor_id)
+
+    def sensor_ids(self):
+        return sorted(self.metadata)
+
+    def update(self, metadata):
+        """Menggabungkan metadata sensor_id -> (location, process_stage); True jika ada yang berubah"""
+        changed = {sensor_id: (str(location), str(process_stage))
+                   for sensor_id, (location, process_stage) in metadata.items()
+                   if self.metadata.get(sensor_id) != (str(location), str(process_stage))}
+        if changed:
+            self.metadata = {**self.metadata, **changed}
+        return bool(changed)
+
+    def refresh(self, query_api, bucket):
+        """Memuat ulang dari InfluxDB; gagal atau tidak, percobaan berikutnya menunggu TTL"""
+        import pandas as pd
+        import flux_reader
+        self.loaded_at = time.monotonic()
+        metadata = {}
+        for frame in flux_reader.stream_frames(query_api, build_sensor_ids_query(bucket, self.lookback),
+                                               columns={'_value': 'sensor_id'}):
+            for sensor_id in frame['sensor_id'].astype(str):
+                metadata[sensor_id] = self.metadata.get(sensor_id, ("N/A", "N/A"))
+        frames = list(flux_reader.stream_frames(query_api, build_metadata_query(bucket, self.lookback),
+                                                columns=METADATA_COLUMNS))
+        if frames:
+            # Sensor yang pindah lokasi/tahap punya beberapa series; yang terbaru menang
+            frame = pd.concat(frames, ignore_index=True).astype({'sensor_id': str})
+            latest = frame.sort_values('time').drop_duplicates('sensor_id', keep='last')
+            for row in latest.itertuples(index=False):
+                metadata[row.sensor_id] = (str(row.location), str(row.process_stage))
+        return self.update(metadata)
@@ -0,0 +1,211 @@
+import numpy as np
+from PyQt6 import QtCore, QtGui
+from PyQt6.QtCore import Qt
+from local_time import format_local
+from series_store import out_of_range_mask
+
+
+class SensorTableModel(QtCore.QAbstractTableModel):
+    """Model tabel virtual di atas array kolom (waktu, lokasi, tahap proses, suhu, kelembaban).
+
+    Sel hanya diformat saat diminta view lewat data(), sehingga tidak ada objek
+    per-sel yang dibuat ulang setiap refresh. Baris di luar set point diwarnai
+    lewat BackgroundRole dari mask yang dihitung sekali secara vektor.
+    """
+
+    HEADERS = ["Waktu", "Lokasi", "Tahap Proses", "Suhu (°C)", "Kelembaban (%)"]
+    HIGHLIGHT = QtGui.QColor(255, 200, 200)
+
+    def __init__(self, temp_range, humidity_range, parent=None):
+        super().__init__(parent)
+        self.temp_range = temp_range
+        self.humidity_range = humidity_range
+        self.times = np.empty(0, dtype='datetime64[ns]')
+        self.locations = np.empty(0, dtype=object)
+        self.stages = np.empty(0, dtype=object)
+        self.temperatures = np.empty(0, dtype='float64')
+        self.humidities = np.empty(0, dtype='float64')
+        self.out_of_range = np.empty(0, dtype=bool)
+        self.order = None  # None = urutan waktu naik (urutan asli data)
+        self.sort_column = 0
+        self.sort_order = Qt.SortOrder.AscendingOrder
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        # Selama baris dihapus dari view yang diurutkan, jumlah baris mengikuti urutan tampilan
+        return len(self.times) if self.order is None else len(self.order)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row() if self.order is None else int(self.order[index.row()])
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            column = index.column()
+            if column == 0:
+                return format_local(self.times[row])
+            if column == 1:
+                return str(self.locations[row])
+            if column == 2:
+                return str(self.stages[row])
+            value = self.temperatures[row] if column == 3 else self.humidities[row]
+            return "N/A" if np.isnan(value) else f"{value:.2f}"
+
+        if role == Qt.ItemDataRole.BackgroundRole and self.out_of_range[row]:
+            return self.HIGHLIGHT
+        return None
+
+    def compute_mask(self, temperatures, humidities):
+        """Mask baris yang suhu atau kelembabannya di luar set point"""
+        return out_of_range_mask(temperatures, humidities, self.temp_range, self.humidity_range)
+
+    def set_ranges(self, temp_range, humidity_range):
+        """Memperbarui set point dan warna baris tanpa membangun ulang tabel"""
+        self.temp_range = temp_range
+        self.humidity_range = humidity_range
+        self.out_of_range = self.compute_mask(self.temperatures, self.humidities)
+        if len(self.times):
+            self.dataChanged.emit(self.index(0, 0),
+                                  self.index(len(self.times) - 1, len(self.HEADERS) - 1),
+                                  [Qt.ItemDataRole.BackgroundRole])
+
+    def update_data(self, columns):
+        """Mengganti isi model dengan snapshot kolom terbaru dari SeriesStore.
+
+        Jika data baru hanya berupa penambahan di ekor (dan pemangkasan di kepala
+        karena retention), view diberi tahu lewat beginRemoveRows/beginInsertRows
+        sehingga hanya baris baru yang digambar. Dengan urutan selain waktu naik,
+        baris baru lalu diurutkan lewat layoutChanged tanpa reset model. Baris lama
+        yang isinya berubah (misal lokasi sensor pindah) diberi tahu lewat dataChanged.
+        """
+        times = columns['time']
+        location = np.full(len(times), columns['location'], dtype=object) \
+            if np.isscalar(columns['location']) else columns['location']
+        stage = np.full(len(times), columns['process_stage'], dtype=object) \
+            if np.isscalar(columns['process_stage']) else columns['process_stage']
+        temperatures = columns['temperature_celsius']
+        humidities = columns['humidity_percent']
+        mask = self.compute_mask(temperatures, humidities)
+
+        old_count = len(self.times)
+        head = int(np.searchsorted(times, self.times[0])) if old_count and len(times) else -1
+        overlap = old_count - int(np.searchsorted(self.times, times[0])) if old_count and len(times) else 0
+        incremental = (
+            old_count and len(times) and head == 0
+            and overlap > 0 and overlap <= len(times)
+            and np.array_equal(self.times[old_count - overlap:], times[:overlap])
+        )
+
+        if not incremental:
+            self.beginResetModel()
+            self.set_columns(times, location, stage, temperatures, humidities, mask)
+            self.apply_sort()
+            self.endResetModel()
+            return
+
+        # Baris di kepala yang sudah keluar dari retention
+        removed = old_count - overlap
+        if removed:
+            self.remove_head(removed)
+        changed = self.changed_rows(location[:overlap], stage[:overlap],
+                                    temperatures[:overlap], humidities[:overlap])
+
+        # Baris baru di ekor; dengan urutan lain mereka ditambahkan di bawah lalu diurutkan
+        added = len(times) - overlap
+        if added:
+            self.beginInsertRows(QtCore.QModelIndex(), overlap, overlap + added - 1)
+            self.set_columns(times, location, stage, temperatures, humidities, mask)
+            if self.order is not None:
+                self.order = np.concatenate([self.order, np.arange(overlap, len(times))])
+            self.endInsertRows()
+        else:
+            self.set_columns(times, location, stage, temperatures, humidities, mask)
+
+        if self.order is not None and (added or changed.any()):
+            self.resort()
+        if changed.any():
+            rows = self.view_rows(np.flatnonzero(changed))
+            self.dataChanged.emit(self.index(int(rows.min()), 0),
+                                  self.index(int(rows.max()), len(self.HEADERS) - 1))
+
+    def remove_head(self, count):
+        """Membuang `count` baris sumber terlama; dengan urutan lain baris itu tersebar di view"""
+        if self.order is None:
+            self.beginRemoveRows(QtCore.QModelIndex(), 0, count - 1)
+            self.set_columns(self.times[count:], self.locations[count:], self.stages[count:],
+                             self.temperatures[count:], self.humidities[count:],
+                             self.out_of_range[count:])
+            self.endRemoveRows()
+            return
+        # Dihapus per blok baris view yang bersebelahan, dari bawah agar nomor baris di atasnya tetap
+        rows = np.flatnonzero(self.order < count)
+        for run in reversed(np.split(rows, np.flatnonzero(np.diff(rows) != 1) + 1)):
+            self.beginRemoveRows(QtCore.QModelIndex(), int(run[0]), int(run[-1]))
+            self.order = np.delete(self.order, run)
+            self.endRemoveRows()
+        self.set_columns(self.times[count:], self.locations[count:], self.stages[count:],
+                         self.temperatures[count:], self.humidities[count:],
+                         self.out_of_range[count:])
+        self.order = self.order - count
+
+    def changed_rows(self, locations, stages, temperatures, humidities):
+        """Mask baris sumber lama yang isinya berbeda dengan kolom baru (panjang sama)"""
+        changed = (self.locations != locations) | (self.stages != stages)
+        for old, new in ((self.temperatures, temperatures), (self.humidities, humidities)):
+            changed |= (old != new) & ~(np.isnan(old) & np.isnan(new))
+        return changed
+
+    def view_rows(self, source_rows):
+        """Nomor baris view untuk baris sumber"""
+        if self.order is None:
+            return np.asarray(source_rows)
+        positions = np.empty(len(self.order), dtype=np.int64)
+        positions[self.order] = np.arange(len(self.order))
+        return positions[source_rows]
+
+    def set_columns(self, times, locations, stages, temperatures, humidities, mask):
+        self.times = times
+        self.locations = locations
+        self.stages = stages
+        self.temperatures = temperatures
+        self.humidities = humidities
+        self.out_of_range = mask
+
+    def sort_key(self, column):
+        return [self.times, self.locations, self.stages,
+                self.temperatures, self.humidities][column]
+
+    def apply_sort(self):
+        """Menghitung urutan tampilan dengan argsort; urutan waktu naik tidak perlu indeks"""
+        if self.sort_column == 0 and self.sort_order == Qt.SortOrder.AscendingOrder:
+            self.order = None
+            return
+        order = np.argsort(self.sort_key(self.sort_column), kind='stable')
+        if self.sort_order == Qt.SortOrder.DescendingOrder:
+            order = order[::-1]
+        self.order = order
+
+    def resort(self):
+        """Menghitung ulang urutan; indeks persisten (seleksi, baris aktif) ikut ke baris sumbernya"""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        sources = [index.row() if self.order is None else int(self.order[index.row()]) for index in persistent]
+        self.apply_sort()
+        rows = self.view_rows(np.asarray(sources, dtype=np.int64))
+        self.changePersistentIndexList(persistent, [self.index(int(row), index.column())
+                                                    for row, index in zip(rows, persistent)])
+        self.layoutChanged.emit()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sort_column = column
+        self.sort_order = order
+        self.resort()
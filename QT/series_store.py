@@ -0,0 +1,235 @@
+import bisect
+import threading
+import numpy as np
+from flux_query import FIELDS
+
+
+def out_of_range_mask(temperatures, humidities, temp_range, humidity_range):
+    """Mask baris yang suhu atau kelembabannya di luar set point.
+
+    Hanya baris dengan kedua nilai tersedia yang dianggap di luar range.
+    """
+    with np.errstate(invalid='ignore'):
+        temp_out = (temperatures < temp_range[0]) | (temperatures > temp_range[1])
+        hum_out = (humidities < humidity_range[0]) | (humidities > humidity_range[1])
+    both = ~np.isnan(temperatures) & ~np.isnan(humidities)
+    return both & (temp_out | hum_out)
+
+
+class RingBuffer:
+    """Buffer melingkar berkapasitas tetap untuk satu deret waktu (waktu + nilai).
+
+    Waktu disimpan sebagai datetime64[ns] UTC dan harus bertambah. Data yang
+    timestamp-nya tidak lebih baru dari data terakhir dibuang saat insert,
+    sehingga fetch yang tumpang-tindih tidak menghasilkan duplikat.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.times = np.empty(capacity, dtype='datetime64[ns]')
+        self.values = np.empty(capacity, dtype='float64')
+        self.start = 0  # Posisi fisik data terlama
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _position(self, logical_index):
+        return (self.start + logical_index) % self.capacity
+
+    def last_time(self):
+        if not self.size:
+            return None
+        return self.times[self._position(self.size - 1)]
+
+    def last_value(self):
+        if not self.size:
+            return None
+        return float(self.values[self._position(self.size - 1)])
+
+    def append(self, times, values):
+        """Menambahkan data terurut; mengembalikan jumlah data yang benar-benar masuk"""
+        times = np.asarray(times, dtype='datetime64[ns]')
+        values = np.asarray(values, dtype='float64')
+        if not len(times):
+            return 0
+
+        # Dedup: buang data lama dan timestamp ganda dalam batch (ambil yang terakhir)
+        keep = np.ones(len(times), dtype=bool)
+        keep[:-1] = times[1:] != times[:-1]
+        last = self.last_time()
+        if last is not None:
+            keep &= times > last
+        times, values = times[keep], values[keep]
+
+        count = len(times)
+        if not count:
+            return 0
+        if count >= self.capacity:
+            times, values = times[-self.capacity:], values[-self.capacity:]
+            self.times[:] = times
+            self.values[:] = values
+            self.start = 0
+            self.size = self.capacity
+            return count
+
+        positions = (self.start + self.size + np.arange(count)) % self.capacity
+        self.times[positions] = times
+        self.values[positions] = values
+        overflow = max(0, self.size + count - self.capacity)
+        self.start = (self.start + overflow) % self.capacity
+        self.size = min(self.capacity, self.size + count)
+        return count
+
+    def merge(self, times, values):
+        """Menyisipkan data terurut yang boleh lebih lama dari data terakhir (fetch dengan overlap).
+
+        Hanya ekor buffer mulai dari timestamp pertama batch yang ditulis ulang.
+        Mengembalikan (times, values) yang timestamp-nya belum ada di buffer.
+        """
+        times = np.asarray(times, dtype='datetime64[ns]')
+        values = np.asarray(values, dtype='float64')
+        if not len(times):
+            return times, values
+        keep = np.ones(len(times), dtype=bool)
+        keep[:-1] = times[1:] != times[:-1]
+        times, values = times[keep], values[keep]
+
+        first = bisect.bisect_left(range(self.size), times[0],
+                                   key=lambda i: self.times[self._position(i)])
+        positions = self._position(np.arange(first, self.size))
+        tail_times, tail_values = self.times[positions], self.values[positions]
+        new = ~np.isin(times, tail_times)
+        if not new.any():
+            return times[new], values[new]
+
+        merged_times = np.concatenate([tail_times, times[new]])
+        merged_values = np.concatenate([tail_values, values[new]])
+        order = np.argsort(merged_times, kind='stable')
+        self.size = first
+        self.append(merged_times[order], merged_values[order])
+        return times[new], values[new]
+
+    def drop_before(self, cutoff):
+        """Membuang data dengan waktu lebih lama dari cutoff (pencarian biner)"""
+        first = bisect.bisect_left(range(self.size), cutoff,
+                                   key=lambda i: self.times[self._position(i)])
+        if first:
+            self.start = self._position(first)
+            self.size -= first
+
+    def snapshot(self):
+        """Salinan data berurutan dari yang terlama"""
+        end = self.start + self.size
+        if end <= self.capacity:
+            return self.times[self.start:end].copy(), self.values[self.start:end].copy()
+        tail = end - self.capacity
+        return (np.concatenate([self.times[self.start:], self.times[:tail]]),
+                np.concatenate([self.values[self.start:], self.values[:tail]]))
+
+
+class SeriesStore:
+    """Penyimpanan deret waktu untuk semua sensor, dikunci per (sensor_id, field).
+
+    Worker menulis dan thread GUI membaca, jadi semua akses memakai lock.
+    Chart, tabel, alert dan ekspor membaca dari struktur yang sama ini.
+    """
+
+    def __init__(self, capacity=100_000, retention=None):
+        self.capacity = capacity  # Jumlah titik maksimum per (sensor, field)
+        self.retention = retention  # timedelta; None berarti hanya dibatasi kapasitas
+        self.buffers = {}
+        self.metadata = {}  # sensor_id -> {'location': ..., 'process_stage': ...}
+        self.lock = threading.Lock()
+
+    def _buffer(self, sensor_id, field):
+        key = (sensor_id, field)
+        if key not in self.buffers:
+            self.buffers[key] = RingBuffer(self.capacity)
+        return self.buffers[key]
+
+    def append(self, sensor_id, field, times, values):
+        with self.lock:
+            buffer = self._buffer(sensor_id, field)
+            added = buffer.append(times, values)
+            if added and self.retention is not None:
+                buffer.drop_before(buffer.last_time() - np.timedelta64(self.retention))
+            return added
+
+    def merge(self, sensor_id, field, times, values):
+        """Seperti append, tetapi data terlambat di dalam ekor buffer ikut disisipkan"""
+        with self.lock:
+            buffer = self._buffer(sensor_id, field)
+            times, values = buffer.merge(times, values)
+            if len(times) and self.retention is not None:
+                buffer.drop_before(buffer.last_time() - np.timedelta64(self.retention))
+            return times, values
+
+    def replace(self, series):
+        """Mengganti seluruh isi store (full resync); mengembalikan jumlah titik per (sensor_id, field).
+
+        Buffer baru diisi di luar lock lalu dipasang dengan satu assignment, sehingga
+        thread GUI tidak pernah membaca store yang kosong atau setengah terisi.
+        """
+        buffers = {}
+        added = {}
+        for key, (times, values) in series.items():
+            buffer = RingBuffer(self.capacity)
+            added[key] = buffer.append(times, values)
+            if added[key] and self.retention is not None:
+                buffer.drop_before(buffer.last_time() - np.timedelta64(self.retention))
+            buffers[key] = buffer
+        with self.lock:
+            # Sensor tanpa data di window tetap terdaftar, dengan buffer kosong
+            for key in self.buffers:
+                buffers.setdefault(key, RingBuffer(self.capacity))
+            self.buffers = buffers
+        return added
+
+    def set_metadata(self, sensor_id, location, process_stage):
+        with self.lock:
+            self.metadata[sensor_id] = {'location': location, 'process_stage': process_stage}
+
+    def sensors(self):
+        with self.lock:
+            return sorted({sensor_id for sensor_id, _ in self.buffers})
+
+    def last_times(self):
+        """(sensor_id, field) -> timestamp terakhir untuk buffer yang berisi data"""
+        with self.lock:
+            return {key: buffer.last_time() for key, buffer in self.buffers.items() if len(buffer)}
+
+    def latest_point(self, sensor_id, field):
+        """(waktu, nilai) terakhir atau None"""
+        with self.lock:
+            buffer = self.buffers.get((sensor_id, field))
+            if buffer is None or not len(buffer):
+                return None
+            return buffer.last_time(), buffer.last_value()
+
+    def series(self, sensor_id, field):
+        """Array (times, values) berurutan untuk satu sensor dan field"""
+        with self.lock:
+            buffer = self.buffers.get((sensor_id, field))
+            if buffer is None:
+                return np.empty(0, dtype='datetime64[ns]'), np.empty(0, dtype='float64')
+            return buffer.snapshot()
+
+    def table_columns(self, sensor_id):
+        """Kolom tabel (waktu gabungan suhu dan kelembaban) sebagai array NumPy"""
+        columns = {field: self.series(sensor_id, field) for field in FIELDS}
+        with self.lock:
+            metadata = dict(self.metadata.get(sensor_id, {}))
+
+        times = np.union1d(*(columns[field][0] for field in FIELDS))
+        table = {
+            'time': times,
+            'location': metadata.get('location', 'N/A'),
+            'process_stage': metadata.get('process_stage', 'N/A'),
+        }
+        for field in FIELDS:
+            field_times, field_values = columns[field]
+            aligned = np.full(len(times), np.nan)
+            aligned[np.searchsorted(times, field_times)] = field_values
+            table[field] = aligned
+        return table
@@ -0,0 +1,96 @@
+import builtins
+import os
+import sys
+import threading
+import time
+
+
+class StartupProfile:
+    """Mencatat waktu import per modul dan tahapan startup sampai first paint.
+
+    Import diukur lewat pembungkus builtins.__import__ selama startup: hanya
+    import teratas (yang belum ada di sys.modules) yang dicatat, sudah termasuk
+    sub-import di dalamnya. Untuk rincian lengkap gunakan `python -X importtime`.
+    """
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.imports = []  # (nama modul, detik, nama thread)
+        self.marks = []  # (label, detik sejak t0)
+        self.original_import = builtins.__import__
+        self.local = threading.local()
+        self.timing = False
+
+    def start(self):
+        self.timing = True
+        builtins.__import__ = self.timed_import
+
+    def stop(self):
+        self.timing = False
+        builtins.__import__ = self.original_import
+
+    def timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        depth = getattr(self.local, 'depth', 0)
+        if not self.timing or depth or level or name in sys.modules:
+            self.local.depth = depth + 1
+            try:
+                return self.original_import(name, globals, locals, fromlist, level)
+            finally:
+                self.local.depth = depth
+
+        self.local.depth = 1
+        started = time.perf_counter()
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            self.local.depth = 0
+            self.imports.append((name, time.perf_counter() - started, threading.current_thread().name))
+
+    def mark(self, label):
+        """Mencatat tahapan startup (detik sejak proses mulai mengimpor)"""
+        elapsed = time.perf_counter() - self.t0
+        self.marks.append((label, elapsed))
+        return elapsed
+
+    def elapsed_ms(self, label):
+        for mark_label, elapsed in self.marks:
+            if mark_label == label:
+                return elapsed * 1000
+        return None
+
+    def report(self, min_ms=1.0):
+        """Laporan teks: import terlama lebih dulu, lalu tahapan startup"""
+        lines = ["Laporan startup (ms)", "  Import modul:"]
+        for name, seconds, thread in sorted(self.imports, key=lambda item: -item[1]):
+            if seconds * 1000 < min_ms:
+                continue
+            where = "" if thread == "MainThread" else f" [{thread}]"
+            lines.append(f"    {seconds * 1000:9.1f}  {name}{where}")
+        lines.append("  Tahapan:")
+        for label, elapsed in self.marks:
+            lines.append(f"    {elapsed * 1000:9.1f}  {label}")
+        return "\n".join(lines)
+
+    def print_report(self):
+        """Dicetak ke stdout jika SHT20_STARTUP_REPORT di-set"""
+        if os.environ.get("SHT20_STARTUP_REPORT"):
+            print(self.report(), flush=True)
+
+    def watch_first_paint(self, widget, callback):
+        """Memanggil callback sekali setelah widget pertama kali digambar"""
+        from PyQt6 import QtCore
+
+        class FirstPaintFilter(QtCore.QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QtCore.QEvent.Type.Paint:
+                    widget.removeEventFilter(self)
+                    # Tunda sampai paint event selesai diproses
+                    QtCore.QTimer.singleShot(0, callback)
+                return False
+
+        widget.paint_filter = FirstPaintFilter(widget)
+        widget.installEventFilter(widget.paint_filter)
+
+
+# Dibuat saat modul pertama kali diimport, sebelum modul berat lainnya
+profile = StartupProfile()
@@ -0,0 +1,96 @@
+import datetime
+import numpy as np
+from alert_rules import AlertEngine, DurationRule, ThresholdRule
+
+
+TEMP_RANGE = (25.0, 35.0)
+HUMIDITY_RANGE = (40.0, 70.0)
+
+
+def minutes(*values):
+    """Menit sejak epoch -> array datetime64[ns]"""
+    return np.array(values, dtype='int64').astype('datetime64[m]').astype('datetime64[ns]')
+
+
+def test_threshold_hysteresis_needs_clear_return():
+    rule = ThresholdRule("high", "temperature_celsius", 'high', 35.0, hysteresis=0.5)
+    state = {}
+    # 34.8 belum melewati batas hysteresis (34.5), jadi 36 berikutnya bukan alert baru
+    values = np.array([34.0, 36.0, 34.8, 36.0, 34.4, 36.0])
+    fired = rule.evaluate(minutes(0, 1, 2, 3, 4, 5), values, state)
+    np.testing.assert_array_equal(fired, [1, 5])
+    assert state['active']
+
+
+def test_threshold_state_carries_over_batches():
+    rule = ThresholdRule("low", "humidity_percent", 'low', 40.0, hysteresis=1.0)
+    state = {}
+    np.testing.assert_array_equal(rule.evaluate(minutes(0, 1), np.array([45.0, 39.0]), state), [1])
+    # Masih aktif dari batch sebelumnya: tidak memicu lagi
+    assert len(rule.evaluate(minutes(2, 3), np.array([40.5, 38.0]), state)) == 0
+    np.testing.assert_array_equal(rule.evaluate(minutes(4, 5), np.array([41.0, 39.0]), state), [1])
+
+
+def test_duration_fires_once_per_run():
+    rule = DurationRule("long", "temperature_celsius", 'high', 35.0, datetime.timedelta(minutes=3))
+    values = np.array([36.0, 36.0, 36.0, 36.0, 36.0, 30.0, 36.0, 36.0])
+    fired = rule.evaluate(minutes(0, 1, 2, 3, 4, 5, 6, 7), values, {})
+    np.testing.assert_array_equal(fired, [3])
+
+
+def test_duration_run_split_across_batches():
+    rule = DurationRule("long", "temperature_celsius", 'high', 35.0, datetime.timedelta(minutes=3))
+    state = {}
+    assert len(rule.evaluate(minutes(0, 1), np.array([36.0, 36.0]), state)) == 0
+    assert state['run_start'] == minutes(0)[0]
+    np.testing.assert_array_equal(rule.evaluate(minutes(2, 3, 4), np.array([36.0, 36.0, 36.0]), state), [1])
+    # Run yang sama sudah memicu alert di batch sebelumnya
+    assert len(rule.evaluate(minutes(5, 6), np.array([36.0, 36.0]), state)) == 0
+
+
+def test_batch_split_matches_single_batch():
+    times = minutes(*range(12))
+    values = np.array([30.0, 36.0, 36.0, 36.0, 36.0, 34.0, 30.0, 36.0, 36.0, 36.0, 36.0, 36.0])
+    single = AlertEngine(TEMP_RANGE, HUMIDITY_RANGE, cooldown=0)
+    split = AlertEngine(TEMP_RANGE, HUMIDITY_RANGE, cooldown=0)
+
+    expected = single.evaluate("SHT20-001", "temperature_celsius", times, values)
+    actual = []
+    for part in (slice(0, 2), slice(2, 7), slice(7, 12)):
+        actual += split.evaluate("SHT20-001", "temperature_celsius", times[part], values[part])
+
+    # Urutan dalam satu batch mengikuti urutan aturan, jadi dibandingkan setelah diurutkan
+    assert sorted((a.rule, a.time) for a in actual) == sorted((a.rule, a.time) for a in expected)
+    assert expected
+
+
+def test_cooldown_per_rule_and_sensor():
+    engine = AlertEngine(TEMP_RANGE, HUMIDITY_RANGE, cooldown=600)
+    times = minutes(0, 1, 2, 3)
+    values = np.array([36.0, 30.0, 36.0, 30.0])  # Masuk-keluar-masuk dalam 10 menit
+
+    alerts = engine.evaluate("SHT20-001", "temperature_celsius", times, values)
+    assert [a.rule for a in alerts if a.rule == "temperature_celsius_high"] == ["temperature_celsius_high"]
+
+    # Sensor lain tidak tertahan cooldown sensor pertama
+    other = engine.evaluate("SHT20-002", "temperature_celsius", times, values)
+    assert any(a.rule == "temperature_celsius_high" for a in other)
+
+    # Setelah cooldown habis alert yang sama boleh muncul lagi
+    later = engine.evaluate("SHT20-001", "temperature_celsius", minutes(20, 21), np.array([30.0, 36.0]))
+    assert any(a.rule == "temperature_celsius_high" for a in later)
+
+
+def test_since_only_updates_state():
+    engine = AlertEngine(TEMP_RANGE, HUMIDITY_RANGE, cooldown=0)
+    times = minutes(0, 1)
+    alerts = engine.evaluate("SHT20-001", "temperature_celsius", times, np.array([36.0, 36.0]), since=times[-1] + 1)
+    assert alerts == []
+    # Kondisi masih di luar range dari resync: tidak memicu alert threshold baru
+    later = engine.evaluate("SHT20-001", "temperature_celsius", minutes(2), np.array([36.0]))
+    assert not any(a.rule == "temperature_celsius_high" for a in later)
+
+
+def test_nan_samples_ignored():
+    engine = AlertEngine(TEMP_RANGE, HUMIDITY_RANGE)
+    assert engine.evaluate("SHT20-001", "humidity_percent", minutes(0, 1), np.array([np.nan, np.nan])) == []
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+from chain_audit import compare_frames, mark_pending, rows_in, to_fixed_point
+
+
+def frame(*rows):
+    """Baris (sensor_id, timestamp, temperature_x10, humidity_x10) -> frame seperti chain_frame"""
+    sensor_ids, timestamps, temperatures, humidities = zip(*rows) if rows else ((), (), (), ())
+    return pd.DataFrame({
+        'sensor_id': np.array(sensor_ids, dtype=object),
+        'timestamp': np.array(timestamps, dtype='int64'),
+        'temperature_x10': np.array(temperatures, dtype='float64'),
+        'humidity_x10': np.array(humidities, dtype='float64'),
+    })
+
+
+def kinds(merged, masks):
+    """kind -> daftar (sensor_id, timestamp) terurut"""
+    return {kind: sorted(zip(merged.loc[mask, 'sensor_id'], merged.loc[mask, 'timestamp']))
+            for kind, mask in masks.items()}
+
+
+def test_to_fixed_point_rounds_half_away_from_zero():
+    np.testing.assert_array_equal(to_fixed_point([27.55, 27.45, -0.05, -27.55, 65.25]),
+                                  [276.0, 275.0, -1.0, -276.0, 653.0])
+    assert np.isnan(to_fixed_point([np.nan])[0])
+
+
+def test_compare_classifies_missing_extra_mismatched():
+    influx = frame(("A", 1, 275, 650), ("A", 2, 276, 651), ("A", 3, 277, 652), ("B", 1, 300, 700))
+    chain = frame(("A", 1, 275, 650), ("A", 3, 278, 652), ("B", 1, 300, 700), ("B", 2, 301, 701))
+
+    matched, merged, masks = compare_frames(influx, chain)
+
+    assert matched == 2
+    assert kinds(merged, masks) == {
+        'missing': [("A", 2)],
+        'extra': [("B", 2)],
+        'mismatched': [("A", 3)],
+    }
+    row = merged.loc[masks['mismatched']].iloc[0]
+    assert (row['temperature_x10_influx'], row['temperature_x10_chain']) == (277, 278)
+
+
+def test_compare_pairs_duplicate_readings_one_to_one():
+    # Dua pembacaan di detik yang sama: satu cocok persis, satu berbeda nilai; chain punya satu tambahan
+    influx = frame(("A", 5, 275, 650), ("A", 5, 280, 650), ("A", 5, 275, 650))
+    chain = frame(("A", 5, 275, 650), ("A", 5, 281, 650), ("A", 5, 275, 650), ("A", 5, 290, 650))
+
+    matched, merged, masks = compare_frames(influx, chain)
+
+    assert matched == 2
+    assert masks['mismatched'].sum() == 1
+    assert masks['extra'].sum() == 1
+    assert masks['missing'].sum() == 0
+    assert len(merged) == 2  # Tanpa perkalian silang antar duplikat
+
+
+def test_compare_empty_chain_marks_everything_missing():
+    matched, merged, masks = compare_frames(frame(("A", 1, 275, 650), ("A", 2, 276, 651)), frame())
+    assert matched == 0
+    assert masks['missing'].sum() == 2 and not masks['extra'].any()
+
+
+def test_mark_pending_splits_missing_by_last_anchored():
+    influx = frame(("A", 10, 275, 650), ("A", 20, 276, 651), ("A", 30, 277, 652))
+    chain = frame(("A", 10, 275, 650))
+    _, merged, masks = compare_frames(influx, chain)
+
+    mark_pending(merged, masks, last_anchored=20)
+    assert kinds(merged, masks)['missing'] == [("A", 20)]
+    assert kinds(merged, masks)['pending'] == [("A", 30)]
+
+
+def test_mark_pending_without_anchors_keeps_missing():
+    _, merged, masks = compare_frames(frame(("A", 10, 275, 650)), frame())
+    mark_pending(merged, masks, last_anchored=None)
+    assert masks['missing'].sum() == 1 and not masks['pending'].any()
+
+
+def test_rows_in_pairs_duplicates_once():
+    legacy = frame(("A", 1, 275, 650), ("A", 1, 275, 650), ("A", 2, 276, 651))
+    anchored = frame(("A", 1, 275, 650), ("A", 2, 276, 652))
+    np.testing.assert_array_equal(rows_in(legacy, anchored), [True, False, False])
@@ -0,0 +1,139 @@
+import pytest
+import merkle
+from chain_reader import BATCH_ANCHORED_TOPIC, NEW_READING_TOPIC, ChainIndex, ChainReader, RpcError, decode_logs
+
+CONTRACT = "0x5fbdb2315678afecb367f032d93f642f64180aa3"
+
+
+def word(value):
+    return merkle.abi_word(value).hex()
+
+
+def new_reading_log(reading_id, block, sensor_id="SHT20-001", timestamp=1_700_000_000, temperature_x10=275,
+                    humidity_x10=652, log_index=0):
+    # Data event NewReading = abi.encode yang sama dengan readingLeaf
+    data = merkle.encode_reading(sensor_id, "Tank T-101", "Fermentasi", timestamp, temperature_x10, humidity_x10)
+    return {
+        'topics': [NEW_READING_TOPIC, '0x' + word(reading_id)],
+        'data': '0x' + data.hex(),
+        'blockNumber': hex(block),
+        'logIndex': hex(log_index),
+        'transactionHash': f"0x{block:064x}",
+    }
+
+
+def batch_anchored_log(batch_id, block, root, count, first_timestamp, last_timestamp):
+    return {
+        'topics': [BATCH_ANCHORED_TOPIC, '0x' + word(batch_id), root],
+        'data': '0x' + word(count) + word(first_timestamp) + word(last_timestamp),
+        'blockNumber': hex(block),
+        'logIndex': '0x1',
+        'transactionHash': f"0x{block:064x}",
+    }
+
+
+class StubRpc:
+    """Pengganti JsonRpcClient: log per blok, dan eth_getLogs ditolak untuk rentang lebih dari max_range blok"""
+
+    def __init__(self, logs, head, max_range=None):
+        self.logs = logs
+        self.head = head
+        self.max_range = max_range
+        self.chain_id = "a"  # Bagian dari block hash; diganti untuk mensimulasikan node yang di-restart
+        self.calls = []
+
+    def block_number(self):
+        return self.head
+
+    def block_hash(self, number):
+        return f"0x{self.chain_id}{number}"
+
+    def get_logs(self, address, topics, from_block, to_block):
+        assert address == CONTRACT
+        assert list(topics) == [NEW_READING_TOPIC, BATCH_ANCHORED_TOPIC]
+        self.calls.append((from_block, to_block))
+        if self.max_range is not None and to_block - from_block + 1 > self.max_range:
+            raise RpcError("query returned more than 10000 results", -32005)
+        return [log for log in self.logs if from_block <= int(log['blockNumber'], 16) <= to_block]
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = ChainIndex(str(tmp_path / "index" / "chain_index.sqlite3"))
+    yield index
+    index.close()
+
+
+def test_decode_logs_splits_readings_and_batches():
+    root = "0x" + "ab" * 32
+    removed = dict(new_reading_log(9, 3), removed=True)
+    readings, batches = decode_logs([
+        new_reading_log(7, 3, sensor_id="SHT20-002", temperature_x10=-15, log_index=2),
+        batch_anchored_log(4, 5, "0x" + "AB" * 32, 10, 100, 200),
+        removed,
+    ])
+
+    assert len(readings) == 1 and len(batches) == 1
+    reading = readings[0]
+    assert (reading.id, reading.block_number, reading.log_index) == (7, 3, 2)
+    assert (reading.sensor_id, reading.location, reading.process_stage) == ("SHT20-002", "Tank T-101", "Fermentasi")
+    assert (reading.timestamp, reading.temperature_x10, reading.humidity_x10) == (1_700_000_000, -15, 652)
+    assert reading.batch_id is None
+    batch = batches[0]
+    assert (batch.batch_id, batch.block_number, batch.merkle_root) == (4, 5, root)
+    assert (batch.count, batch.first_timestamp, batch.last_timestamp) == (10, 100, 200)
+
+
+def test_fetch_range_bisects_rejected_pages(index):
+    logs = [new_reading_log(i, block) for i, block in enumerate((0, 3, 4, 7))]
+    rpc = StubRpc(logs, head=7, max_range=2)
+    reader = ChainReader(rpc, index, CONTRACT, page_blocks=8, workers=1)
+
+    readings, _ = reader.fetch_range(0, 7)
+
+    assert [reading.id for reading in readings] == [0, 1, 2, 3]
+    # Rentang yang ditolak dibelah dua sampai muat
+    assert rpc.calls == [(0, 7), (0, 3), (0, 1), (2, 3), (4, 7), (4, 5), (6, 7)]
+
+
+def test_fetch_range_gives_up_at_single_block(index):
+    reader = ChainReader(StubRpc([new_reading_log(0, 0)], head=0, max_range=0), index, CONTRACT)
+    with pytest.raises(RpcError):
+        reader.fetch_range(0, 0)
+
+
+def test_sync_records_state_and_resumes(index):
+    rpc = StubRpc([new_reading_log(0, 1), new_reading_log(1, 4)], head=5)
+    reader = ChainReader(rpc, index, CONTRACT, page_blocks=2, workers=2, proof_path="missing.jsonl")
+
+    assert reader.sync() == 2
+    assert index.sync_state(CONTRACT) == (5, "0xa5")
+    assert index.count(CONTRACT) == 2
+
+    rpc.logs.append(new_reading_log(2, 7))
+    rpc.head = 8
+    rpc.calls.clear()
+    assert reader.sync() == 1
+    assert min(start for start, _ in rpc.calls) == 6  # Hanya blok setelah state terakhir
+    assert index.sync_state(CONTRACT) == (8, "0xa8")
+    assert [reading.id for reading in index.readings(CONTRACT)] == [0, 1, 2]
+
+
+def test_sync_resets_index_when_chain_changes(index):
+    rpc = StubRpc([new_reading_log(0, 1), new_reading_log(1, 2)], head=3)
+    reader = ChainReader(rpc, index, CONTRACT, proof_path="missing.jsonl")
+    reader.sync()
+
+    # Node Hardhat di-restart: hash blok terakhir berbeda, chain baru hanya punya satu pembacaan
+    rpc.chain_id = "b"
+    rpc.logs = [new_reading_log(0, 1, temperature_x10=300)]
+    assert reader.sync() == 1
+    assert index.sync_state(CONTRACT) == (3, "0xb3")
+    assert [reading.temperature_x10 for reading in index.readings(CONTRACT)] == [300]
+
+
+def test_sync_stops_when_cancelled(index):
+    rpc = StubRpc([new_reading_log(i, i) for i in range(6)], head=5)
+    reader = ChainReader(rpc, index, CONTRACT, page_blocks=2, workers=1, proof_path="missing.jsonl")
+    assert reader.sync(cancelled=lambda: True) == 0
+    assert index.sync_state(CONTRACT) == (None, None)
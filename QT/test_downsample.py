@@ -0,0 +1,84 @@
+import numpy as np
+from downsample import minmax_downsample, visible_slice
+
+
+def seconds(count):
+    return np.arange(count, dtype='int64').astype('datetime64[s]').astype('datetime64[ns]')
+
+
+def test_empty_input():
+    times, values = minmax_downsample(seconds(0), np.empty(0), 10)
+    assert len(times) == 0 and len(values) == 0
+
+
+def test_fewer_points_than_buckets_returned_unchanged():
+    times = seconds(5)
+    values = np.array([3.0, 1.0, 4.0, 1.0, 5.0])
+    out_times, out_values = minmax_downsample(times, values, 10)
+    assert out_times is times and out_values is values
+
+
+def test_keeps_spikes_and_endpoints():
+    times = seconds(1000)
+    values = np.zeros(1000)
+    values[137] = 50.0
+    values[642] = -50.0
+
+    out_times, out_values = minmax_downsample(times, values, 10)
+
+    assert len(out_times) <= 2 * 10 + 2
+    assert 50.0 in out_values and -50.0 in out_values
+    assert out_times[0] == times[0] and out_times[-1] == times[-1]
+    assert np.all(np.diff(out_times.astype('int64')) > 0)
+
+
+def test_nan_values_are_dropped():
+    times = seconds(100)
+    values = np.arange(100, dtype='float64')
+    values[::2] = np.nan
+
+    out_times, out_values = minmax_downsample(times, values, 5)
+
+    assert not np.isnan(out_values).any()
+    assert out_values.max() == 99.0 and out_values.min() == 1.0
+
+
+def test_nan_leaves_fewer_points_than_buckets():
+    times = seconds(50)
+    values = np.full(50, np.nan)
+    values[[3, 30]] = [1.0, 2.0]
+
+    out_times, out_values = minmax_downsample(times, values, 10)
+
+    np.testing.assert_array_equal(out_times, times[[3, 30]])
+    np.testing.assert_array_equal(out_values, [1.0, 2.0])
+
+
+def test_single_timestamp_span():
+    times = np.full(30, np.datetime64(0, 'ns'))
+    out_times, out_values = minmax_downsample(times, np.arange(30.0), 5)
+    np.testing.assert_array_equal(out_values, [0.0, 29.0])
+
+
+def test_visible_slice_includes_one_point_past_each_edge():
+    times = seconds(10)
+    assert visible_slice(times, times[3], times[6]) == (2, 8)
+    assert visible_slice(times, times[0], times[9]) == (0, 10)
+
+
+def test_multi_month_span_does_not_overflow():
+    # 180 hari dalam ns: (t - t[0]) * n_buckets melewati batas int64
+    times = (np.arange(100_000, dtype='int64') * 155_520_000_000).astype('datetime64[ns]')
+    values = np.zeros(100_000)
+    values[50_000] = 50.0
+    values[99_000] = -50.0
+
+    out_times, out_values = minmax_downsample(times, values, 800)
+
+    assert len(out_times) <= 2 * 800 + 2
+    assert 50.0 in out_values and -50.0 in out_values
+    assert out_times[0] == times[0] and out_times[-1] == times[-1]
+    # Setiap bucket terwakili: tidak ada celah lebih dari dua lebar bucket
+    gaps = np.diff(out_times.astype('int64'))
+    assert np.all(gaps > 0)
+    assert gaps.max() <= 2 * (times[-1] - times[0]).astype('int64') / 800
@@ -0,0 +1,74 @@
+import pytest
+from flux_query import FluxQuery
+
+
+def test_tag_values_query():
+    query = FluxQuery("Tank T-101").range("-30d").tags(location=["A", "B"]).tag_values("sensor_id").build()
+    assert query == (
+        'import "influxdata/influxdb/schema"\n'
+        '\n'
+        'schema.tagValues(\n'
+        '    bucket: "Tank T-101",\n'
+        '    tag: "sensor_id",\n'
+        '    predicate: (r) => r["_measurement"] == "environment_monitoring"'
+        ' and (r["location"] == "A" or r["location"] == "B"),\n'
+        '    start: -30d\n'
+        ')\n'
+    )
+
+
+def test_raw_pivot_query():
+    query = FluxQuery("Tank T-101").range("-1h").tags(sensor_id="SHT20-001", location=None) \
+        .where_exists().pivot().keep({'_time': 'time', 'sensor_id': 'sensor_id'}).build("raw")
+    assert query == (
+        'from(bucket: "Tank T-101")\n'
+        '  |> range(start: -1h)\n'
+        '  |> filter(fn: (r) => r["_measurement"] == "environment_monitoring")\n'
+        '  |> filter(fn: (r) => r["_field"] == "temperature_celsius" or r["_field"] == "humidity_percent")\n'
+        '  |> filter(fn: (r) => r["sensor_id"] == "SHT20-001")\n'
+        '  |> filter(fn: (r) => exists r._value)\n'
+        '  |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")\n'
+        '  |> keep(columns: ["_time", "sensor_id"])\n'
+        '  |> group()\n'
+        '  |> yield(name: "raw")\n'
+    )
+
+
+def test_multiple_aggregates_pivot_on_stat():
+    query = FluxQuery("b").range(0, 3600).fields("humidity_percent") \
+        .aggregate(60, "min").aggregate("1m", "max").pivot().sort("_time").build()
+    assert query == (
+        'data = from(bucket: "b")\n'
+        '  |> range(start: 1970-01-01T00:00:00.000000Z, stop: 1970-01-01T01:00:00.000000Z)\n'
+        '  |> filter(fn: (r) => r["_measurement"] == "environment_monitoring")\n'
+        '  |> filter(fn: (r) => r["_field"] == "humidity_percent")\n'
+        'union(tables: [\n'
+        '  data |> aggregateWindow(every: 60s, fn: min, createEmpty: false, timeSrc: "_stop")'
+        ' |> set(key: "stat", value: "min"),\n'
+        '  data |> aggregateWindow(every: 1m, fn: max, createEmpty: false, timeSrc: "_stop")'
+        ' |> set(key: "stat", value: "max")\n'
+        '])\n'
+        '  |> pivot(rowKey: ["_time", "stat"], columnKey: ["_field"], valueColumn: "_value")\n'
+        '  |> sort(columns: ["_time"])\n'
+    )
+
+
+def test_single_aggregate_and_escaped_tags():
+    query = FluxQuery('Tank "A"').range("-2h").tags(sensor_id=["S\\1", "S2"]).aggregate("5m").build()
+    lines = query.splitlines()
+    assert lines[0] == 'from(bucket: "Tank \\"A\\"")'
+    assert lines[4] == '  |> filter(fn: (r) => r["sensor_id"] == "S\\\\1" or r["sensor_id"] == "S2")'
+    assert lines[5] == '  |> aggregateWindow(every: 5m, fn: mean, createEmpty: false, timeSrc: "_stop")'
+    assert len(lines) == 6
+
+
+def test_last_before_keep():
+    query = FluxQuery("b", fields=("temperature_celsius",)).range("-30d").last().keep({'_time': 'time'}).build()
+    assert query.splitlines()[-3:] == ['  |> last()', '  |> keep(columns: ["_time"])', '  |> group()']
+
+
+def test_range_is_required():
+    with pytest.raises(ValueError):
+        FluxQuery("b").build()
+    with pytest.raises(ValueError):
+        FluxQuery("b").tag_values("sensor_id").build()
@@ -0,0 +1,85 @@
+import io
+import numpy as np
+import pandas as pd
+import pytest
+
+flux_reader = pytest.importorskip("flux_reader")  # Butuh influxdb_client untuk dialek CSV
+
+# Format CSV tanpa anotasi dari InfluxDB: kolom pertama kosong, lalu result/table
+CSV = (
+    ",result,table,_time,location,process_stage,sensor_id,temperature_celsius,humidity_percent\n"
+    ",raw,0,2024-05-01T00:00:00Z,Tank T-101,Fermentasi,SHT20-001,27.5,65.2\n"
+    ",raw,0,2024-05-01T00:00:01.5Z,Tank T-101,Fermentasi,SHT20-001,27.6,\n"
+    ",raw,0,2024-05-01T00:00:02Z,Tank T-101,Fermentasi,SHT20-002,,66.0\n"
+    ",raw,0,2024-05-01T00:00:03Z,Tank T-102,Pematangan,SHT20-002,28.0,64.0\n"
+    ",raw,0,2024-05-01T00:00:04Z,Tank T-102,Pematangan,SHT20-001,28.1,63.9\n"
+)
+
+
+class Response(io.BytesIO):
+    """Response HTTP palsu; mencatat apakah sudah ditutup"""
+
+    closed_by_reader = False
+
+    def close(self):
+        self.closed_by_reader = True
+        super().close()
+
+
+class QueryApi:
+    def __init__(self, body):
+        self.response = Response(body.encode())
+        self.queries = []
+
+    def query_raw(self, query, dialect=None):
+        self.queries.append((query, dialect))
+        return self.response
+
+
+def test_stream_frames_reads_in_chunks():
+    api = QueryApi(CSV)
+    frames = list(flux_reader.stream_frames(api, "query", chunk_size=2))
+
+    assert [len(frame) for frame in frames] == [2, 2, 1]
+    assert api.queries == [("query", flux_reader.CSV_DIALECT)]
+    assert api.response.closed_by_reader
+    frame = pd.concat(frames, ignore_index=True)
+    assert list(frame.columns) == ['time', 'location', 'process_stage', 'sensor_id',
+                                   'temperature_celsius', 'humidity_percent']
+    assert str(frame['time'].dt.tz) == "UTC"
+    assert frame['time'].iloc[1] == pd.Timestamp("2024-05-01T00:00:01.5Z")
+    assert frames[0]['sensor_id'].dtype == 'category'
+    assert np.isnan(frame['humidity_percent'].iloc[1])
+
+
+def test_stream_frames_selects_and_renames_columns():
+    frames = list(flux_reader.stream_frames(QueryApi(CSV), "query", columns={'sensor_id': 'sensor'}))
+    assert len(frames) == 1
+    assert list(frames[0].columns) == ['sensor']
+    assert list(frames[0]['sensor'].astype(str)) == ["SHT20-001", "SHT20-001", "SHT20-002", "SHT20-002", "SHT20-001"]
+
+
+def test_stream_frames_empty_response():
+    api = QueryApi("")
+    assert list(flux_reader.stream_frames(api, "query")) == []
+    assert api.response.closed_by_reader
+
+
+def test_field_arrays_skip_missing_values():
+    frame = pd.concat(flux_reader.stream_frames(QueryApi(CSV), "query"), ignore_index=True)
+    times, values = flux_reader.field_arrays(frame, 'temperature_celsius')
+    assert times.dtype == np.dtype('datetime64[ns]')
+    np.testing.assert_array_equal(values, [27.5, 27.6, 28.0, 28.1])
+    assert times[0] == np.datetime64('2024-05-01T00:00:00', 'ns')
+
+    empty_times, empty_values = flux_reader.field_arrays(frame, 'pressure')
+    assert len(empty_times) == 0 and len(empty_values) == 0
+
+
+def test_sort_by_time_only_when_needed():
+    times = np.array([3, 1, 2], dtype='datetime64[s]')
+    values = np.array([30.0, 10.0, 20.0])
+    sorted_times, sorted_values = flux_reader.sort_by_time(times, values)
+    np.testing.assert_array_equal(sorted_values, [10.0, 20.0, 30.0])
+    ordered = np.sort(times)
+    assert flux_reader.sort_by_time(ordered, values)[0] is ordered
@@ -0,0 +1,96 @@
+import numpy as np
+import merkle
+from chain_reader import BATCH_ANCHORED_TOPIC, NEW_READING_TOPIC
+
+
+def reading(i):
+    """Pembacaan contoh seperti di tes tcp_server/src/anchor.rs"""
+    return (f"SHT20-{i % 3 + 1:03d}", "Tank T-101", "Fermentasi", 1_700_000_000 + i, 275 - i, 652)
+
+
+def merkle_tree(leaves):
+    """Pohon seperti anchor.rs merkle_tree: pasangan terurut, node ganjil di ujung naik tanpa di-hash"""
+    proofs = [[] for _ in leaves]
+    positions = list(range(len(leaves)))
+    level = [bytes(leaf) for leaf in leaves]
+    while len(level) > 1:
+        for leaf, position in enumerate(positions):
+            if position ^ 1 < len(level):
+                proofs[leaf].append(level[position ^ 1])
+            positions[leaf] = position // 2
+        level = [merkle.keccak256_bytes(min(pair) + max(pair)) if len(pair) == 2 else pair[0]
+                 for pair in (level[i:i + 2] for i in range(0, len(level), 2))]
+    return level[0], proofs
+
+
+def test_keccak_known_vectors():
+    assert merkle.keccak256_bytes(b'').hex() == \
+        "c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470"
+    assert merkle.keccak256_bytes(b'abc').hex() == \
+        "4e03657aea45a94fc7d47ba826c8d667c0d1e6e33a64a036ec44f58fa12d6c45"
+    assert merkle.keccak256_bytes(b'transfer(address,uint256)')[:4].hex() == "a9059cbb"
+
+
+def test_keccak_event_topics():
+    signature = b'NewReading(uint256,string,string,string,uint256,int256,uint256)'
+    assert merkle.to_hex(merkle.keccak256_bytes(signature)) == NEW_READING_TOPIC
+    signature = b'BatchAnchored(uint256,bytes32,uint256,uint256,uint256)'
+    assert merkle.to_hex(merkle.keccak256_bytes(signature)) == BATCH_ANCHORED_TOPIC
+
+
+def test_hash_many_matches_single_messages():
+    # Panjang campuran, termasuk pas di batas blok (136) dan lebih dari satu blok
+    messages = [b'', b'a' * 135, b'b' * 136, b'c' * 137, b'd' * 300, b'e' * 136]
+    digests = merkle.hash_many(messages)
+    for message, digest in zip(messages, digests):
+        assert digest.tobytes() == merkle.keccak256_bytes(message)
+
+
+def test_encode_reading_matches_abi_layout():
+    encoded = merkle.encode_reading("SHT20-001", "Tank", "Fermentasi", 1_700_000_000, -15, 652)
+    words = [encoded[i:i + 32] for i in range(0, len(encoded), 32)]
+
+    # Offset string dihitung dari awal head (6 word)
+    assert [int.from_bytes(word, 'big') for word in words[:3]] == [192, 256, 320]
+    assert int.from_bytes(words[3], 'big') == 1_700_000_000
+    assert words[4] == bytes.fromhex("ff" * 31 + "f1")  # int256 -15, two's complement
+    assert int.from_bytes(words[5], 'big') == 652
+    assert int.from_bytes(words[6], 'big') == len("SHT20-001")
+    assert words[7] == b"SHT20-001" + bytes(23)
+    assert len(encoded) == 12 * 32
+
+
+def test_reading_leaves_match_single_leaf():
+    rows = [reading(i) for i in range(5)]
+    leaves = merkle.reading_leaves(*zip(*rows))
+    for row, leaf in zip(rows, leaves):
+        assert leaf.tobytes() == merkle.keccak256_bytes(merkle.encode_reading(*row))
+
+
+def test_proofs_round_trip_to_root():
+    for size in (1, 2, 3, 7, 8, 100):
+        leaves = merkle.reading_leaves(*zip(*(reading(i) for i in range(size))))
+        root, proofs = merkle_tree(leaves)
+        proof_arrays = [np.frombuffer(b''.join(proof), dtype=np.uint8).reshape(-1, 32) for proof in proofs]
+        roots = merkle.fold_proofs(leaves, proof_arrays)
+        assert all(row.tobytes() == root for row in roots)
+
+
+def test_hash_pairs_is_order_independent():
+    leaves = merkle.reading_leaves(*zip(*(reading(i) for i in range(4))))
+    np.testing.assert_array_equal(merkle.hash_pairs(leaves[:2], leaves[2:]),
+                                  merkle.hash_pairs(leaves[2:], leaves[:2]))
+    expected = merkle.keccak256_bytes(min(leaves[0].tobytes(), leaves[2].tobytes()) +
+                                      max(leaves[0].tobytes(), leaves[2].tobytes()))
+    assert merkle.hash_pairs(leaves[:1], leaves[2:3])[0].tobytes() == expected
+
+
+def test_changed_value_is_rejected():
+    rows = [reading(i) for i in range(10)]
+    leaves = merkle.reading_leaves(*zip(*rows))
+    root, proofs = merkle_tree(leaves)
+    tampered = list(rows[4])
+    tampered[4] += 1
+    leaf = merkle.reading_leaves(*zip(tampered))
+    proof = np.frombuffer(b''.join(proofs[4]), dtype=np.uint8).reshape(-1, 32)
+    assert merkle.fold_proofs(leaf, [proof])[0].tobytes() != root
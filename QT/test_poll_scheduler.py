@@ -0,0 +1,212 @@
+import random
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+from poll_scheduler import PollScheduler  # noqa: E402
+
+
+class Signal:
+    def __init__(self):
+        self.slots = []
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+    def emit(self):
+        for slot in self.slots:
+            slot()
+
+
+class FakeClock:
+    """Waktu palsu dalam ms; advance() menembakkan timer yang jatuh tempo"""
+
+    def __init__(self):
+        self.now = 0
+        self.timers = []
+
+    def timer(self):
+        timer = FakeTimer(self)
+        self.timers.append(timer)
+        return timer
+
+    def advance(self, ms):
+        target = self.now + ms
+        while True:
+            due = [timer for timer in self.timers if timer.deadline is not None and timer.deadline <= target]
+            if not due:
+                break
+            timer = min(due, key=lambda timer: timer.deadline)
+            self.now = timer.deadline
+            timer.deadline = None
+            timer.timeout.emit()
+        self.now = target
+
+
+class FakeTimer:
+    def __init__(self, clock):
+        self.clock = clock
+        self.deadline = None
+        self.timeout = Signal()
+
+    def setSingleShot(self, single_shot):
+        assert single_shot
+
+    def start(self, ms):
+        self.deadline = self.clock.now + ms
+
+    def stop(self):
+        self.deadline = None
+
+    def isActive(self):
+        return self.deadline is not None
+
+    def remaining(self):
+        return None if self.deadline is None else self.deadline - self.clock.now
+
+
+class FixedJitter:
+    def __init__(self, factor):
+        self.factor = factor
+
+    def uniform(self, low, high):
+        assert (low, high) == (0.8, 1.2)
+        return self.factor
+
+
+def scheduler(clock, interval=1_000, **kwargs):
+    poll = PollScheduler(interval, timer=clock.timer(), **kwargs)
+    ticks = []
+    poll.tick.connect(lambda: ticks.append(clock.now))
+    return poll, ticks
+
+
+def test_interval_resets_on_new_data_and_slows_when_idle():
+    clock = FakeClock()
+    poll, ticks = scheduler(clock, max_idle_interval=3_000)
+    poll.start()
+    assert ticks == [0] and poll.busy
+
+    poll.done(has_new_data=True)
+    assert poll.timer.remaining() == 1_000
+    clock.advance(1_000)
+    assert ticks == [0, 1_000]
+
+    intervals = []
+    for _ in range(5):
+        poll.done(has_new_data=False)
+        intervals.append(poll.timer.remaining())
+        clock.advance(poll.timer.remaining())
+    assert intervals == [1_500, 2_250, 3_000, 3_000, 3_000]
+
+    poll.done(has_new_data=True)
+    assert poll.timer.remaining() == 1_000
+
+
+def test_backoff_doubles_with_jitter_up_to_max():
+    clock = FakeClock()
+    poll, _ = scheduler(clock, max_backoff=10_000, rng=FixedJitter(1.2))
+    poll.start()
+    intervals = []
+    for _ in range(5):
+        poll.done(failed=True)
+        intervals.append(poll.timer.remaining())
+        clock.advance(poll.timer.remaining())
+    assert intervals == [2_400, 4_800, 9_600, 12_000, 12_000]
+    assert poll.status_text() == "InfluxDB bermasalah, coba lagi dalam 12 s"
+
+    poll.done(has_new_data=False)
+    assert poll.failures == 0
+
+
+def test_backoff_jitter_stays_in_bounds():
+    clock = FakeClock()
+    poll, _ = scheduler(clock, max_backoff=300_000, rng=random.Random(7))
+    poll.start()
+    seen = set()
+    for failures in range(1, 12):
+        poll.done(failed=True)
+        backoff = min(1_000 * 2 ** failures, 300_000)
+        assert 0.8 * backoff <= poll.timer.remaining() <= 1.2 * backoff
+        seen.add(poll.timer.remaining() / backoff)
+        clock.advance(poll.timer.remaining())
+    assert len(seen) > 1  # Jitter benar-benar bervariasi
+
+
+def test_triggers_while_busy_coalesce_into_one_tick():
+    clock = FakeClock()
+    poll, ticks = scheduler(clock)
+    poll.start()
+    poll.trigger()
+    poll.trigger()
+    clock.advance(5_000)  # Timer tidak aktif selama fetch berjalan
+    assert ticks == [0]
+
+    poll.done(has_new_data=True)
+    assert ticks == [0, 5_000]  # Satu tick susulan langsung, bukan dua
+    assert not poll.timer.isActive()
+    poll.done(has_new_data=True)
+    assert poll.timer.remaining() == 1_000
+
+
+def test_pending_tick_waits_for_backoff_after_failure():
+    clock = FakeClock()
+    poll, ticks = scheduler(clock, rng=FixedJitter(1.0))
+    poll.start()
+    poll.trigger()
+    poll.done(failed=True)
+    assert ticks == [0] and not poll.pending
+    assert poll.timer.remaining() == 2_000
+
+
+def test_pause_reasons_stack_and_last_release_catches_up():
+    clock = FakeClock()
+    poll, ticks = scheduler(clock)
+    poll.start()
+    poll.done(has_new_data=True)
+
+    poll.set_paused("live", True)
+    poll.set_paused("other", True)
+    assert not poll.timer.isActive()
+    assert poll.status_text() == "Polling dijeda"
+    clock.advance(60_000)
+    poll.trigger()  # Backfill tetap bisa dipicu manual
+    assert ticks == [0, 60_000]
+    poll.done(has_new_data=True)
+    assert not poll.timer.isActive()  # Tidak dipasang ulang selama dijeda
+
+    poll.set_paused("live", False)
+    assert ticks == [0, 60_000] and not poll.timer.isActive()
+    poll.set_paused("missing", False)  # Alasan yang tidak ada diabaikan
+    poll.set_paused("other", False)
+    assert ticks == [0, 60_000, 60_000]
+
+
+def test_slow_reasons_stretch_interval_until_all_released():
+    clock = FakeClock()
+    poll, _ = scheduler(clock, slow_interval=30_000)
+    poll.start()
+    poll.done(has_new_data=True)
+    assert poll.timer.remaining() == 1_000
+
+    poll.set_slow("tab", True)
+    assert poll.timer.remaining() == 30_000  # Timer aktif dipasang ulang
+    poll.set_slow("minimized", True)
+    poll.set_slow("tab", False)
+    assert poll.timer.remaining() == 30_000
+    assert poll.status_text() == "Polling tiap 30 s"
+
+    poll.set_slow("minimized", False)
+    assert poll.timer.remaining() == 1_000
+    assert poll.status_text() == "Polling tiap 1 s"
+
+
+def test_stop_cancels_timer_and_ignores_triggers():
+    clock = FakeClock()
+    poll, ticks = scheduler(clock)
+    poll.start()
+    poll.done(has_new_data=True)
+    poll.stop()
+    clock.advance(10_000)
+    poll.trigger()
+    assert ticks == [0]
+    assert poll.status_text() == ""
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+QtCore = pytest.importorskip("PyQt6.QtCore")
+from PyQt6.QtCore import Qt  # noqa: E402
+from sensor_table_model import SensorTableModel  # noqa: E402
+
+
+def columns(seconds, temperatures, location="Tank T-101"):
+    times = np.array(seconds, dtype='int64').astype('datetime64[s]').astype('datetime64[ns]')
+    return {
+        'time': times,
+        'location': location,
+        'process_stage': "Fermentasi",
+        'temperature_celsius': np.array(temperatures, dtype='float64'),
+        'humidity_percent': np.full(len(times), 60.0),
+    }
+
+
+class Recorder:
+    """Mencatat nama signal model yang dipancarkan"""
+
+    def __init__(self, model):
+        self.events = []
+        for name in ("modelReset", "rowsInserted", "rowsRemoved", "layoutChanged", "dataChanged"):
+            getattr(model, name).connect(lambda *args, name=name: self.events.append((name, args)))
+
+    def names(self):
+        return [name for name, _ in self.events]
+
+
+def temperatures(model):
+    return [model.data(model.index(row, 3)) for row in range(model.rowCount())]
+
+
+def test_append_in_time_order_inserts_and_removes_rows():
+    model = SensorTableModel((25.0, 35.0), (40.0, 70.0))
+    model.update_data(columns([1, 2, 3], [30.0, 31.0, 32.0]))
+    recorder = Recorder(model)
+
+    # Retention membuang detik 1, detik 4 dan 5 baru
+    model.update_data(columns([2, 3, 4, 5], [31.0, 32.0, 33.0, 34.0]))
+
+    assert recorder.names() == ["rowsRemoved", "rowsInserted"]
+    assert temperatures(model) == ["31.00", "32.00", "33.00", "34.00"]
+
+
+def test_sorted_update_resorts_without_reset():
+    model = SensorTableModel((25.0, 35.0), (40.0, 70.0))
+    model.update_data(columns([1, 2, 3, 4], [30.0, 34.0, 31.0, 33.0]))
+    model.sort(3, Qt.SortOrder.DescendingOrder)
+    assert temperatures(model) == ["34.00", "33.00", "31.00", "30.00"]
+
+    selected = QtCore.QPersistentModelIndex(model.index(1, 3))  # 33.00 (detik 4)
+    recorder = Recorder(model)
+    model.update_data(columns([2, 3, 4, 5, 6], [34.0, 31.0, 33.0, 36.0, 32.0]))
+
+    assert "modelReset" not in recorder.names()
+    assert recorder.names().count("rowsRemoved") == 1
+    assert "rowsInserted" in recorder.names() and "layoutChanged" in recorder.names()
+    assert temperatures(model) == ["36.00", "34.00", "33.00", "32.00", "31.00"]
+    # Indeks persisten tetap menunjuk baris sumber yang sama
+    assert selected.row() == 2 and model.data(model.index(selected.row(), 3)) == "33.00"
+
+
+def test_location_change_emits_data_changed():
+    model = SensorTableModel((25.0, 35.0), (40.0, 70.0))
+    model.update_data(columns([1, 2, 3], [30.0, 31.0, 32.0]))
+    recorder = Recorder(model)
+
+    model.update_data(columns([1, 2, 3, 4], [30.0, 31.0, 32.0, 33.0], location="Tank T-102"))
+
+    assert "modelReset" not in recorder.names()
+    changed = [args for name, args in recorder.events if name == "dataChanged"]
+    assert len(changed) == 1
+    top_left, bottom_right = changed[0][:2]
+    assert (top_left.row(), bottom_right.row()) == (0, 2)
+    assert model.data(model.index(0, 1)) == "Tank T-102"
+
+
+def test_unchanged_snapshot_emits_nothing():
+    model = SensorTableModel((25.0, 35.0), (40.0, 70.0))
+    model.update_data(columns([1, 2, 3], [30.0, np.nan, 32.0]))
+    model.sort(3, Qt.SortOrder.AscendingOrder)
+    recorder = Recorder(model)
+
+    model.update_data(columns([1, 2, 3], [30.0, np.nan, 32.0]))
+
+    assert recorder.names() == []
+
+
+def test_signals_pass_model_tester():
+    QtTest = pytest.importorskip("PyQt6.QtTest")
+    warnings = []
+    previous = QtCore.qInstallMessageHandler(lambda mode, context, message: warnings.append(message))
+    try:
+        model = SensorTableModel((25.0, 35.0), (40.0, 70.0))
+        tester = QtTest.QAbstractItemModelTester(  # noqa: F841  (harus tetap hidup selama tes)
+            model, QtTest.QAbstractItemModelTester.FailureReportingMode.Warning)
+        model.update_data(columns(range(0, 20), np.linspace(20.0, 40.0, 20)))
+        model.sort(3, Qt.SortOrder.DescendingOrder)
+        for start in range(5, 30, 5):
+            model.update_data(columns(range(start, start + 20), np.sin(np.arange(start, start + 20)) * 10 + 30))
+        model.sort(0, Qt.SortOrder.AscendingOrder)
+        model.update_data(columns(range(28, 40), np.full(12, 30.0), location="Tank T-102"))
+    finally:
+        QtCore.qInstallMessageHandler(previous)
+
+    assert warnings == []
+    assert model.rowCount() == 12
@@ -0,0 +1,98 @@
+import datetime
+import numpy as np
+from series_store import RingBuffer, SeriesStore
+
+
+def seconds(*values):
+    """Detik sejak epoch -> array datetime64[ns]"""
+    return np.array(values, dtype='int64').astype('datetime64[s]').astype('datetime64[ns]')
+
+
+def test_append_wraps_around_and_keeps_newest():
+    buffer = RingBuffer(4)
+    assert buffer.append(seconds(1, 2, 3), [1.0, 2.0, 3.0]) == 3
+    assert buffer.append(seconds(4, 5, 6), [4.0, 5.0, 6.0]) == 3
+
+    times, values = buffer.snapshot()
+    assert len(buffer) == 4
+    assert buffer.start != 0  # Data terlama sudah tidak di indeks fisik 0
+    np.testing.assert_array_equal(times, seconds(3, 4, 5, 6))
+    np.testing.assert_array_equal(values, [3.0, 4.0, 5.0, 6.0])
+    assert buffer.last_time() == seconds(6)[0]
+    assert buffer.last_value() == 6.0
+
+
+def test_append_batch_larger_than_capacity():
+    buffer = RingBuffer(3)
+    buffer.append(seconds(1), [1.0])
+    assert buffer.append(seconds(2, 3, 4, 5, 6), [2.0, 3.0, 4.0, 5.0, 6.0]) == 5
+
+    times, values = buffer.snapshot()
+    np.testing.assert_array_equal(times, seconds(4, 5, 6))
+    np.testing.assert_array_equal(values, [4.0, 5.0, 6.0])
+
+
+def test_append_drops_old_and_duplicate_timestamps():
+    buffer = RingBuffer(8)
+    buffer.append(seconds(1, 2, 3), [1.0, 2.0, 3.0])
+    # Fetch yang tumpang-tindih: 2 dan 3 sudah ada, 4 muncul dua kali (yang terakhir dipakai)
+    assert buffer.append(seconds(2, 3, 4, 4), [0.0, 0.0, 4.0, 4.5]) == 1
+
+    times, values = buffer.snapshot()
+    np.testing.assert_array_equal(times, seconds(1, 2, 3, 4))
+    np.testing.assert_array_equal(values, [1.0, 2.0, 3.0, 4.5])
+
+
+def test_drop_before_across_wrap():
+    buffer = RingBuffer(4)
+    buffer.append(seconds(1, 2, 3, 4), [1.0, 2.0, 3.0, 4.0])
+    buffer.append(seconds(5, 6), [5.0, 6.0])
+    buffer.drop_before(seconds(5)[0])
+
+    times, values = buffer.snapshot()
+    np.testing.assert_array_equal(times, seconds(5, 6))
+    np.testing.assert_array_equal(values, [5.0, 6.0])
+
+
+def test_store_retention_trims_old_samples():
+    store = SeriesStore(capacity=16, retention=datetime.timedelta(seconds=10))
+    store.append("SHT20-001", "temperature_celsius", seconds(0, 5, 12, 20), [1.0, 2.0, 3.0, 4.0])
+
+    times, values = store.series("SHT20-001", "temperature_celsius")
+    np.testing.assert_array_equal(times, seconds(12, 20))
+    np.testing.assert_array_equal(values, [3.0, 4.0])
+
+
+def test_replace_swaps_contents_and_keeps_known_sensors():
+    store = SeriesStore(capacity=4)
+    store.append("SHT20-001", "temperature_celsius", seconds(1, 2), [1.0, 2.0])
+
+    added = store.replace({("SHT20-002", "temperature_celsius"): (seconds(1, 2, 3, 4, 5), np.arange(5.0))})
+
+    assert added == {("SHT20-002", "temperature_celsius"): 5}
+    assert sorted(store.sensors()) == ["SHT20-001", "SHT20-002"]
+    assert len(store.series("SHT20-001", "temperature_celsius")[0]) == 0
+    times, _ = store.series("SHT20-002", "temperature_celsius")
+    np.testing.assert_array_equal(times, seconds(2, 3, 4, 5))
+
+
+def test_merge_inserts_late_samples_and_returns_only_new():
+    buffer = RingBuffer(5)
+    buffer.append(seconds(1, 2, 4, 5), [1.0, 2.0, 4.0, 5.0])
+    # Overlap mulai dari 2: 2, 4, 5 sudah ada, 3 terlambat, 6 baru
+    times, values = buffer.merge(seconds(2, 3, 4, 5, 6), [0.0, 3.0, 0.0, 0.0, 6.0])
+
+    np.testing.assert_array_equal(times, seconds(3, 6))
+    np.testing.assert_array_equal(values, [3.0, 6.0])
+    stored_times, stored_values = buffer.snapshot()
+    np.testing.assert_array_equal(stored_times, seconds(2, 3, 4, 5, 6))
+    np.testing.assert_array_equal(stored_values, [2.0, 3.0, 4.0, 5.0, 6.0])
+
+
+def test_merge_without_new_samples_leaves_buffer():
+    buffer = RingBuffer(4)
+    buffer.append(seconds(1, 2, 3), [1.0, 2.0, 3.0])
+    times, _ = buffer.merge(seconds(2, 3), [9.0, 9.0])
+
+    assert len(times) == 0
+    np.testing.assert_array_equal(buffer.snapshot()[1], [1.0, 2.0, 3.0])
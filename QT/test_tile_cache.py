@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+from tile_cache import (LEVELS, TILE_BUCKETS, TileCache, assemble, choose_level, split_tiles, tile_indices,
+                        tile_runs, tile_span)
+
+FIELDS = ("temperature_celsius",)
+
+
+def series(seconds):
+    """Deret (times, min, mean, max) dengan nilai = detik"""
+    times = np.array(seconds, dtype='int64').astype('datetime64[s]').astype('datetime64[ns]')
+    values = np.array(seconds, dtype='float64')
+    return {FIELDS[0]: (times, values - 1, values, values + 1)}
+
+
+def test_choose_level_boundaries():
+    assert choose_level(10 * 800, 800) == 10
+    assert choose_level(10 * 800 + 1, 800) == 60
+    assert choose_level(3600 * 800, 800) == 3600
+    assert choose_level(3600 * 800 * 10, 800) == LEVELS[-1]
+
+
+def test_tile_indices_at_level_boundaries():
+    span = tile_span(60)
+    assert span == 60 * TILE_BUCKETS
+    # end eksklusif: rentang yang berakhir tepat di batas tidak menyentuh tile berikutnya
+    assert list(tile_indices(60, 0, span)) == [0]
+    assert list(tile_indices(60, span, 2 * span)) == [1]
+    assert list(tile_indices(60, span - 1, span + 1)) == [0, 1]
+    assert list(tile_indices(60, 3 * span + 5, 3 * span + 6)) == [3]
+    # Tiap level punya grid tile sendiri
+    assert list(tile_indices(3600, 0, span)) == [0]
+
+
+def test_tile_runs_groups_consecutive_indices():
+    assert tile_runs([]) == []
+    assert tile_runs([3, 4, 5, 8, 10, 11]) == [(3, 6), (8, 9), (10, 12)]
+
+
+def test_split_tiles_puts_boundary_bucket_in_next_tile():
+    span = tile_span(10)
+    tiles = split_tiles(series([span - 10, span, 2 * span - 10, 2 * span]), 10, 0, 3)
+
+    assert sorted(tiles) == [0, 1, 2]
+    assert list(tiles[0][FIELDS[0]][2]) == [span - 10]
+    assert list(tiles[1][FIELDS[0]][2]) == [span, 2 * span - 10]
+    assert list(tiles[2][FIELDS[0]][2]) == [2 * span]
+
+
+def test_assemble_trims_to_view():
+    span = tile_span(10)
+    tiles = split_tiles(series(np.arange(0, 2 * span, 10)), 10, 0, 2)
+    assembled = assemble([tiles[0], tiles[1]], FIELDS, span - 20, span + 20)
+
+    times, low, mean, high = assembled[FIELDS[0]]
+    np.testing.assert_array_equal(mean, [span - 20, span - 10, span, span + 10])
+    np.testing.assert_array_equal(high - low, 2.0)
+    assert assemble([], FIELDS, 0, span)[FIELDS[0]][0].dtype == np.dtype('datetime64[ns]')
+
+
+def test_lru_evicts_least_recently_used():
+    cache = TileCache(max_tiles=3)
+    for index in range(3):
+        cache.put("SHT20-001", 10, index, {'tile': index})
+
+    assert cache.get("SHT20-001", 10, 0) == {'tile': 0}  # 0 jadi yang terbaru dipakai
+    cache.put("SHT20-001", 10, 3, {'tile': 3})
+
+    assert len(cache) == 3
+    assert cache.get("SHT20-001", 10, 1) is None
+    assert [key[2] for key in cache.tiles] == [2, 0, 3]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_put_existing_key_refreshes_order():
+    cache = TileCache(max_tiles=2)
+    cache.put("SHT20-001", 10, 0, {})
+    cache.put("SHT20-001", 60, 0, {})  # Level lain = kunci lain
+    cache.put("SHT20-001", 10, 0, {'updated': True})
+    cache.put("SHT20-002", 10, 0, {})
+
+    assert list(cache.tiles) == [("SHT20-001", 10, 0), ("SHT20-002", 10, 0)]
+    assert cache.get("SHT20-001", 10, 0) == {'updated': True}
+
+
+def test_load_view_caches_only_complete_tiles():
+    pytest.importorskip("influxdb_client")
+    import io
+    from tile_cache import load_view
+
+    class QueryApi:
+        def __init__(self):
+            self.queries = []
+
+        def query_raw(self, query, dialect=None):
+            self.queries.append(query)
+            return io.BytesIO(b"")
+
+    span = tile_span(10)
+    cache = TileCache()
+    api = QueryApi()
+    now = 2 * span + 10  # Tile 2 masih berjalan; tile 1 lengkap termasuk satu bucket jeda
+
+    _, cached, queried = load_view(cache, api, "b", "SHT20-001", FIELDS, 10, 0, 3 * span, now)
+    assert (cached, queried) == (0, 3)
+    assert len(api.queries) == 1  # Tile berurutan diambil dalam satu query
+    assert sorted(key[2] for key in cache.tiles) == [0, 1]
+
+    _, cached, queried = load_view(cache, api, "b", "SHT20-001", FIELDS, 10, 0, 3 * span, now)
+    assert (cached, queried) == (2, 1)
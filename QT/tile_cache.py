@@ -0,0 +1,178 @@
+import collections
+import numpy as np
+
+
+# Level piramida (detik per bucket), dari yang paling halus
+LEVELS = (10, 60, 900, 3600)
+LEVEL_LABELS = {10: "10 detik", 60: "1 menit", 900: "15 menit", 3600: "1 jam"}
+TILE_BUCKETS = 1000  # Bucket per tile; satu tile level 1 jam mencakup ~41 hari
+STATS = ("min", "mean", "max")
+
+# Kolom hasil query tile (sudah di-pivot: satu baris per bucket per statistik)
+TILE_COLUMNS = {
+    '_time': 'time',
+    'stat': 'stat',
+    'temperature_celsius': 'temperature_celsius',
+    'humidity_percent': 'humidity_percent',
+}
+
+
+def choose_level(span_seconds, max_points):
+    """Level paling halus yang jumlah bucket-nya di rentang tampilan tidak melebihi max_points"""
+    for level in LEVELS:
+        if span_seconds / level <= max_points:
+            return level
+    return LEVELS[-1]
+
+
+def tile_span(level):
+    """Lebar satu tile dalam detik"""
+    return level * TILE_BUCKETS
+
+
+def tile_indices(level, start, end):
+    """Indeks tile yang mencakup [start, end) (detik unix)"""
+    span = tile_span(level)
+    return range(int(start // span), int((end - 1) // span) + 1)
+
+
+def tile_runs(indices):
+    """Mengelompokkan indeks tile menjadi rentang berurutan [(awal, akhir)] agar satu query per rentang"""
+    runs = []
+    for index in indices:
+        if runs and runs[-1][1] == index:
+            runs[-1][1] = index + 1
+        else:
+            runs.append([index, index + 1])
+    return [tuple(run) for run in runs]
+
+
+def build_tile_query(bucket, sensor_id, fields, level, start, stop):
+    """Query Flux min/mean/max per bucket `level` detik untuk [start, stop) (detik unix).
+
+    Agregasi dilakukan di InfluxDB sehingga yang dikirim hanya tiga nilai per
+    bucket per field, berapa pun jumlah titik mentahnya.
+    """
+    from flux_query import FluxQuery
+    query = FluxQuery(bucket, fields=fields).range(start, stop).tags(sensor_id=sensor_id).where_exists()
+    for stat in STATS:
+        query.aggregate(level, stat, time_src="_start")
+    return query.pivot().keep(TILE_COLUMNS).build("tiles")
+
+
+def empty_series():
+    return (np.empty(0, dtype='datetime64[ns]'),) + tuple(np.empty(0, dtype='float64') for _ in STATS)
+
+
+def frame_series(frame, fields):
+    """Mengubah baris (time, stat, field...) menjadi field -> (times, min, mean, max) terurut"""
+    series = {}
+    for field in fields:
+        rows = frame[['time', 'stat', field]].dropna() if field in frame else frame.iloc[:0]
+        if not len(rows):
+            series[field] = empty_series()
+            continue
+        table = rows.pivot_table(index='time', columns='stat', values=field, aggfunc='first', observed=True)
+        table = table.sort_index()
+        times = table.index.tz_convert(None).to_numpy(dtype='datetime64[ns]')
+        series[field] = (times,) + tuple(
+            table[stat].to_numpy(dtype='float64') if stat in table else np.full(len(times), np.nan)
+            for stat in STATS)
+    return series
+
+
+def split_tiles(series, level, first, last):
+    """Memotong deret hasil satu query menjadi tile first..last-1: index -> field -> deret"""
+    span = tile_span(level)
+    tiles = {index: {} for index in range(first, last)}
+    for field, arrays in series.items():
+        seconds = arrays[0].astype('datetime64[s]').astype('int64')
+        bounds = np.searchsorted(seconds, np.arange(first, last + 1) * span, side='left')
+        for offset, index in enumerate(range(first, last)):
+            lo, hi = bounds[offset], bounds[offset + 1]
+            tiles[index][field] = tuple(array[lo:hi] for array in arrays)
+    return tiles
+
+
+class TileCache:
+    """Cache LRU tile piramida, dikunci per (sensor_id, level, indeks tile).
+
+    Tile yang belum lengkap (masih mencakup waktu sekarang) tidak disimpan
+    agar data baru tetap terambil saat tampilan digeser ke ujung kanan.
+    """
+
+    def __init__(self, max_tiles=512):
+        self.max_tiles = max_tiles
+        self.tiles = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def get(self, sensor_id, level, index):
+        key = (sensor_id, level, index)
+        tile = self.tiles.get(key)
+        if tile is None:
+            self.misses += 1
+            return None
+        self.tiles.move_to_end(key)
+        self.hits += 1
+        return tile
+
+    def put(self, sensor_id, level, index, tile):
+        key = (sensor_id, level, index)
+        self.tiles[key] = tile
+        self.tiles.move_to_end(key)
+        while len(self.tiles) > self.max_tiles:
+            self.tiles.popitem(last=False)
+
+    def clear(self):
+        self.tiles.clear()
+
+
+def assemble(tiles, fields, start, end):
+    """Menggabungkan tile berurutan lalu memotongnya ke [start, end) (detik unix)"""
+    series = {}
+    start_ns = np.datetime64(int(start), 's').astype('datetime64[ns]')
+    end_ns = np.datetime64(int(end), 's').astype('datetime64[ns]')
+    for field in fields:
+        parts = [tile[field] for tile in tiles if field in tile]
+        if not parts:
+            series[field] = empty_series()
+            continue
+        arrays = tuple(np.concatenate([part[column] for part in parts]) for column in range(len(STATS) + 1))
+        lo = np.searchsorted(arrays[0], start_ns, side='left')
+        hi = np.searchsorted(arrays[0], end_ns, side='left')
+        series[field] = tuple(array[lo:hi] for array in arrays)
+    return series
+
+
+def load_view(cache, query_api, bucket, sensor_id, fields, level, start, end, now, cancelled=lambda: False):
+    """Deret min/mean/max untuk rentang tampilan; tile yang belum ada diambil dari InfluxDB.
+
+    Mengembalikan (series, jumlah tile dari cache, jumlah tile yang di-query).
+    """
+    import pandas as pd
+    import flux_reader
+    end = min(end, now)
+    if end <= start:
+        return {field: empty_series() for field in fields}, 0, 0
+
+    indices = list(tile_indices(level, start, end))
+    tiles = {index: cache.get(sensor_id, level, index) for index in indices}
+    missing = [index for index, tile in tiles.items() if tile is None]
+    span = tile_span(level)
+    for first, last in tile_runs(missing):
+        if cancelled():
+            break
+        query = build_tile_query(bucket, sensor_id, fields, level, first * span, last * span)
+        frames = list(flux_reader.stream_frames(query_api, query, columns=TILE_COLUMNS))
+        frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=list(TILE_COLUMNS.values()))
+        for index, tile in split_tiles(frame_series(frame, fields), level, first, last).items():
+            tiles[index] = tile
+            if (index + 1) * span + level <= now:
+                cache.put(sensor_id, level, index, tile)
+
+    ready = [tiles[index] for index in indices if tiles[index] is not None]
+    return assemble(ready, fields, start, end), len(indices) - len(missing), len(missing)
@@ -61,7 +61,7 @@ class Ui_MainWindow(object):
 "    border-radius: 4px;\n"
 "    min-width: 60px;\n"
 "}\n"
-"QTableWidget {\n"
+"QTableView {\n"
 "    alternate-background-color: #f9f9f9;\n"
 "    selection-background-color: #e0f7fa;\n"
 "}\n"
@@ -280,7 +280,7 @@ class Ui_MainWindow(object):
         self.exportButton.setObjectName("exportButton")
         self.horizontalLayout_6.addWidget(self.exportButton)
         self.verticalLayout_7.addWidget(self.frame_10)
-        self.tableWidget = QtWidgets.QTableWidget(parent=self.tab_2)
+        self.tableWidget = QtWidgets.QTableView(parent=self.tab_2)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
@@ -292,8 +292,6 @@ class Ui_MainWindow(object):
 "    padding: 4px;\n"
 "}")
         self.tableWidget.setObjectName("tableWidget")
-        self.tableWidget.setColumnCount(0)
-        self.tableWidget.setRowCount(0)
         self.verticalLayout_7.addWidget(self.tableWidget)
         self.tabWidget.addTab(self.tab_2, "")
         self.verticalLayout_8.addWidget(self.tabWidget)
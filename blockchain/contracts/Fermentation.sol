@@ -11,7 +11,19 @@ contract Fermentation {
         uint256 humidity;   // in percent * 10 (65.2% = 652)
     }
 
+    // One Merkle root per batch of readings instead of one transaction per reading.
+    // Leaves are readingLeaf(...); inner nodes hash the sorted pair, so proofs
+    // need no left/right flags.
+    struct Batch {
+        bytes32 merkleRoot;
+        uint64 firstTimestamp;
+        uint64 lastTimestamp;
+        uint32 count;
+    }
+
     SensorData[] public sensorReadings;
+    Batch[] public batches;
+    mapping(bytes32 => uint256) public batchIdByRoot; // batch id + 1, 0 = not anchored
     address public owner;
 
     event NewReading(
@@ -24,6 +36,14 @@ contract Fermentation {
         uint256 humidity
     );
 
+    event BatchAnchored(
+        uint256 indexed batchId,
+        bytes32 indexed merkleRoot,
+        uint256 count,
+        uint256 firstTimestamp,
+        uint256 lastTimestamp
+    );
+
     constructor() {
         owner = msg.sender;
     }
@@ -61,4 +81,71 @@ contract Fermentation {
     function getReadingCount() public view returns (uint256) {
         return sensorReadings.length;
     }
+
+    function anchorBatch(
+        bytes32 _merkleRoot,
+        uint256 _count,
+        uint256 _firstTimestamp,
+        uint256 _lastTimestamp
+    ) public {
+        require(msg.sender == owner, "Only owner can anchor batches");
+        require(_count > 0, "Empty batch");
+        require(batchIdByRoot[_merkleRoot] == 0, "Root already anchored");
+
+        batches.push(Batch({
+            merkleRoot: _merkleRoot,
+            firstTimestamp: uint64(_firstTimestamp),
+            lastTimestamp: uint64(_lastTimestamp),
+            count: uint32(_count)
+        }));
+        batchIdByRoot[_merkleRoot] = batches.length;
+
+        emit BatchAnchored(
+            batches.length - 1,
+            _merkleRoot,
+            _count,
+            _firstTimestamp,
+            _lastTimestamp
+        );
+    }
+
+    function getBatchCount() public view returns (uint256) {
+        return batches.length;
+    }
+
+    function readingLeaf(
+        string memory _sensorId,
+        string memory _location,
+        string memory _processStage,
+        uint256 _timestamp,
+        int256 _temperature,
+        uint256 _humidity
+    ) public pure returns (bytes32) {
+        return keccak256(abi.encode(
+            _sensorId,
+            _location,
+            _processStage,
+            _timestamp,
+            _temperature,
+            _humidity
+        ));
+    }
+
+    function verifyReading(
+        bytes32 _merkleRoot,
+        bytes32 _leaf,
+        bytes32[] calldata _proof
+    ) public view returns (bool) {
+        if (batchIdByRoot[_merkleRoot] == 0) {
+            return false;
+        }
+        bytes32 node = _leaf;
+        for (uint256 i = 0; i < _proof.length; i++) {
+            bytes32 sibling = _proof[i];
+            node = node < sibling
+                ? keccak256(abi.encodePacked(node, sibling))
+                : keccak256(abi.encodePacked(sibling, node));
+        }
+        return node == _merkleRoot;
+    }
 }
\ No newline at end of file
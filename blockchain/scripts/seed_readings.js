@@ -0,0 +1,37 @@
+// Mengisi kontrak Fermentation di node Hardhat lokal dengan pembacaan sintetis
+// untuk menguji QT/chain_reader.py dan tab Riwayat Blockchain.
+//
+//   npx hardhat node
+//   npx hardhat run scripts/deploy.js --network localhost
+//   READINGS=500 npx hardhat run scripts/seed_readings.js --network localhost
+//   python QT/chain_reader.py
+async function main() {
+  const address = process.env.CONTRACT || "0x5FbDB2315678afecb367f032d93F642f64180aa3";
+  const count = parseInt(process.env.READINGS || "200", 10);
+  const sensors = parseInt(process.env.SENSORS || "3", 10);
+
+  const fermentation = await ethers.getContractAt("Fermentation", address);
+  const start = Math.floor(Date.now() / 1000) - count * 10;
+  const before = await fermentation.getReadingCount();
+
+  for (let i = 0; i < count; i++) {
+    const sensorId = `SHT20-${String((i % sensors) + 1).padStart(3, "0")}`;
+    // Nilai disimpan x10 (fixed point satu desimal), sama seperti yang dibaca DApp
+    const temperature = Math.round((27 + 3 * Math.sin(i / 20)) * 10);
+    const humidity = Math.round((60 + 8 * Math.cos(i / 30)) * 10);
+    const tx = await fermentation.addReading(
+      sensorId, "Tank T-101", "Fermentasi", start + i * 10, temperature, humidity
+    );
+    await tx.wait();
+  }
+
+  const after = await fermentation.getReadingCount();
+  console.log(`Pembacaan on-chain: ${before} -> ${after}`);
+}
+
+main()
+  .then(() => process.exit(0))
+  .catch((error) => {
+    console.error("\n⚠️  Seed error:", error.message);
+    process.exit(1);
+  });
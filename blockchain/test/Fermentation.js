@@ -0,0 +1,201 @@
+const { loadFixture } = require("@nomicfoundation/hardhat-toolbox/network-helpers");
+const { expect } = require("chai");
+
+const abiCoder = ethers.AbiCoder.defaultAbiCoder();
+
+// Same leaf and tree layout as tcp_server/src/anchor.rs
+function readingLeaf(r) {
+  return ethers.keccak256(abiCoder.encode(
+    ["string", "string", "string", "uint256", "int256", "uint256"],
+    [r.sensorId, r.location, r.processStage, r.timestamp, r.temperature, r.humidity]
+  ));
+}
+
+function hashPair(a, b) {
+  return BigInt(a) <= BigInt(b)
+    ? ethers.keccak256(ethers.concat([a, b]))
+    : ethers.keccak256(ethers.concat([b, a]));
+}
+
+function merkleTree(leaves) {
+  const proofs = leaves.map(() => []);
+  const positions = leaves.map((_, i) => i);
+  let level = leaves;
+  while (level.length > 1) {
+    positions.forEach((position, leaf) => {
+      const sibling = position ^ 1;
+      if (sibling < level.length) {
+        proofs[leaf].push(level[sibling]);
+      }
+      positions[leaf] = position >> 1;
+    });
+    const next = [];
+    for (let i = 0; i < level.length; i += 2) {
+      next.push(i + 1 < level.length ? hashPair(level[i], level[i + 1]) : level[i]);
+    }
+    level = next;
+  }
+  return { root: level[0], proofs };
+}
+
+function makeReadings(count, offset = 0) {
+  const start = 1_700_000_000;
+  return Array.from({ length: count }, (_, i) => ({
+    sensorId: `SHT20-${String(((i + offset) % 3) + 1).padStart(3, "0")}`,
+    location: "Tank T-101",
+    processStage: "Fermentasi",
+    timestamp: start + i + offset,
+    temperature: 275 - ((i + offset) % 40),
+    humidity: 652,
+  }));
+}
+
+describe("Fermentation", function () {
+  async function deployFermentationFixture() {
+    const [owner, otherAccount] = await ethers.getSigners();
+    const Fermentation = await ethers.getContractFactory("Fermentation");
+    const fermentation = await Fermentation.deploy();
+    return { fermentation, owner, otherAccount };
+  }
+
+  async function anchor(fermentation, readings) {
+    const { root, proofs } = merkleTree(readings.map(readingLeaf));
+    const timestamps = readings.map((r) => r.timestamp);
+    const tx = await fermentation.anchorBatch(
+      root, readings.length, Math.min(...timestamps), Math.max(...timestamps)
+    );
+    const receipt = await tx.wait();
+    return { root, proofs, receipt };
+  }
+
+  describe("Readings", function () {
+    it("Should store a reading and emit NewReading", async function () {
+      const { fermentation } = await loadFixture(deployFermentationFixture);
+      const [r] = makeReadings(1);
+
+      await expect(fermentation.addReading(
+        r.sensorId, r.location, r.processStage, r.timestamp, r.temperature, r.humidity
+      )).to.emit(fermentation, "NewReading")
+        .withArgs(0, r.sensorId, r.location, r.processStage, r.timestamp, r.temperature, r.humidity);
+      expect(await fermentation.getReadingCount()).to.equal(1);
+    });
+  });
+
+  describe("Batch anchoring", function () {
+    it("Should compute the same leaf as the anchoring service", async function () {
+      const { fermentation } = await loadFixture(deployFermentationFixture);
+      const r = { ...makeReadings(1)[0], temperature: -15 };
+
+      expect(await fermentation.readingLeaf(
+        r.sensorId, r.location, r.processStage, r.timestamp, r.temperature, r.humidity
+      )).to.equal(readingLeaf(r));
+    });
+
+    it("Should anchor a root and verify every reading in the batch", async function () {
+      const { fermentation } = await loadFixture(deployFermentationFixture);
+      const readings = makeReadings(13);
+      const { root, proofs } = await anchor(fermentation, readings);
+
+      expect(await fermentation.getBatchCount()).to.equal(1);
+      expect(await fermentation.batchIdByRoot(root)).to.equal(1);
+      for (let i = 0; i < readings.length; i++) {
+        expect(await fermentation.verifyReading(root, readingLeaf(readings[i]), proofs[i])).to.be.true;
+      }
+    });
+
+    it("Should reject a reading whose values were changed", async function () {
+      const { fermentation } = await loadFixture(deployFermentationFixture);
+      const readings = makeReadings(8);
+      const { root, proofs } = await anchor(fermentation, readings);
+      const tampered = { ...readings[3], temperature: readings[3].temperature + 1 };
+
+      expect(await fermentation.verifyReading(root, readingLeaf(tampered), proofs[3])).to.be.false;
+    });
+
+    it("Should reject a root that was never anchored", async function () {
+      const { fermentation } = await loadFixture(deployFermentationFixture);
+      const readings = makeReadings(4);
+      const { root, proofs } = merkleTree(readings.map(readingLeaf));
+
+      expect(await fermentation.verifyReading(root, readingLeaf(readings[0]), proofs[0])).to.be.false;
+    });
+
+    it("Should emit BatchAnchored", async function () {
+      const { fermentation } = await loadFixture(deployFermentationFixture);
+      const readings = makeReadings(5);
+      const { root } = merkleTree(readings.map(readingLeaf));
+
+      await expect(fermentation.anchorBatch(root, 5, readings[0].timestamp, readings[4].timestamp))
+        .to.emit(fermentation, "BatchAnchored")
+        .withArgs(0, root, 5, readings[0].timestamp, readings[4].timestamp);
+    });
+
+    it("Should revert for other accounts, empty batches and repeated roots", async function () {
+      const { fermentation, otherAccount } = await loadFixture(deployFermentationFixture);
+      const { root } = await anchor(fermentation, makeReadings(3));
+
+      await expect(fermentation.connect(otherAccount).anchorBatch(ethers.ZeroHash, 1, 0, 0))
+        .to.be.revertedWith("Only owner can anchor batches");
+      await expect(fermentation.anchorBatch(ethers.ZeroHash, 0, 0, 0)).to.be.revertedWith("Empty batch");
+      await expect(fermentation.anchorBatch(root, 3, 0, 0)).to.be.revertedWith("Root already anchored");
+    });
+  });
+
+  // Gas and throughput per batch size versus one addReading per sample.
+  // BENCH_BATCH_SIZES=1,10,100,1000,5000 npx hardhat test test/Fermentation.js
+  describe("Benchmark", function () {
+    this.timeout(0);
+
+    it("Should report gas and throughput per batch size", async function () {
+      const { fermentation } = await loadFixture(deployFermentationFixture);
+      const sizes = (process.env.BENCH_BATCH_SIZES || "1,10,100,1000").split(",").map(Number);
+      const rounds = parseInt(process.env.BENCH_ROUNDS || "5", 10);
+      const rows = [];
+
+      // Baseline: one transaction per reading
+      const single = makeReadings(rounds, 1_000_000);
+      let started = performance.now();
+      let gas = 0n;
+      for (const r of single) {
+        const tx = await fermentation.addReading(
+          r.sensorId, r.location, r.processStage, r.timestamp, r.temperature, r.humidity
+        );
+        gas += (await tx.wait()).gasUsed;
+      }
+      let seconds = (performance.now() - started) / 1000;
+      rows.push({
+        mode: "addReading",
+        batchSize: 1,
+        gasPerTx: Number(gas / BigInt(rounds)),
+        gasPerReading: Number(gas / BigInt(rounds)),
+        readingsPerSecond: Math.round(rounds / seconds),
+      });
+
+      let offset = 0;
+      for (const size of sizes) {
+        started = performance.now();
+        gas = 0n;
+        let verifyGas = 0n;
+        for (let round = 0; round < rounds; round++) {
+          const readings = makeReadings(size, offset);
+          offset += size;
+          const { root, proofs, receipt } = await anchor(fermentation, readings);
+          gas += receipt.gasUsed;
+          verifyGas += await fermentation.verifyReading.estimateGas(root, readingLeaf(readings[0]), proofs[0]);
+        }
+        seconds = (performance.now() - started) / 1000;
+        rows.push({
+          mode: "anchorBatch",
+          batchSize: size,
+          gasPerTx: Number(gas / BigInt(rounds)),
+          gasPerReading: Number(gas / BigInt(rounds * size)),
+          verifyGas: Number(verifyGas / BigInt(rounds)),
+          readingsPerSecond: Math.round((rounds * size) / seconds),
+        });
+      }
+
+      console.table(rows);
+      expect(rows[rows.length - 1].gasPerReading).to.be.lessThan(rows[0].gasPerReading);
+    });
+  });
+});
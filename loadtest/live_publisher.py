@@ -0,0 +1,148 @@
+"""Publisher pengganti live feed tcp_server (port 7880) untuk menguji mode live dashboard.
+
+Protokolnya sama dengan tcp_server: setiap subscriber menerima satu objek JSON
+SensorData per baris (NDJSON). Pembacaan berasal dari sensor virtual dan/atau
+dari payload yang diterima di --accept (protokol port 7878), sehingga
+tcp_loadgen.py bisa dipakai sebagai sumber data. --drop-every memutus semua
+subscriber secara berkala untuk menguji reconnect dan backfill.
+
+Contoh:
+  python live_publisher.py --sensors 5 --interval 1
+  python live_publisher.py --sensors 0 --accept 7878
+  python tcp_loadgen.py simulate --sensors 200 --interval 1 --duration 60
+  python live_publisher.py --sensors 3 --interval 0.5 --drop-every 30
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from tcp_loadgen import VirtualSensor
+
+
+class Publisher:
+    """Fan-out: satu antrean berukuran tetap per subscriber"""
+
+    def __init__(self, queue_size):
+        self.queue_size = queue_size
+        self.subscribers = {}  # writer -> asyncio.Queue
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, payload):
+        line = (json.dumps(payload) + "\n").encode()
+        self.published += 1
+        for writer, queue in list(self.subscribers.items()):
+            try:
+                queue.put_nowait(line)
+            except asyncio.QueueFull:
+                # Sama dengan broadcast channel tcp_server: subscriber yang tertinggal diberi tanda lagged
+                self.dropped += 1
+                queue.get_nowait()
+                queue.put_nowait((json.dumps({"lagged": 1}) + "\n").encode())
+
+    async def handle_subscriber(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        queue = asyncio.Queue(self.queue_size)
+        self.subscribers[writer] = queue
+        print(f"Subscriber {peer} terhubung ({len(self.subscribers)} aktif)", flush=True)
+        try:
+            while True:
+                line = await queue.get()
+                if line is None:
+                    break  # Diputus oleh drop_all
+                writer.write(line)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.subscribers.pop(writer, None)
+            writer.close()
+            print(f"Subscriber {peer} terputus ({len(self.subscribers)} aktif)", flush=True)
+
+    def drop_all(self):
+        for queue in list(self.subscribers.values()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+    async def handle_reading(self, reader, writer):
+        """Protokol port 7878: satu objek JSON lalu balasan, seperti tcp_server"""
+        try:
+            data = await reader.read(1024)
+            payload = json.loads(data.decode())
+            if not isinstance(payload, dict) or not {"timestamp", "sensor_id"} <= payload.keys():
+                raise ValueError("field wajib tidak ada")
+            self.publish(payload)
+            writer.write(b"OK: Data published to live feed")
+        except (UnicodeDecodeError, ValueError) as e:
+            writer.write(f"ERROR: Invalid JSON - {e}".encode())
+        await writer.drain()
+        writer.close()
+
+
+async def run_sensors(publisher, sensors, interval, rng):
+    while True:
+        for sensor in sensors:
+            publisher.publish(sensor.reading(rng))
+        await asyncio.sleep(interval)
+
+
+async def drop_periodically(publisher, every):
+    while True:
+        await asyncio.sleep(every)
+        print(f"Memutus {len(publisher.subscribers)} subscriber", flush=True)
+        publisher.drop_all()
+
+
+async def report(publisher, every):
+    started = time.monotonic()
+    while True:
+        await asyncio.sleep(every)
+        elapsed = time.monotonic() - started
+        print(f"{publisher.published} pembacaan ({publisher.published / elapsed:.1f}/detik), "
+              f"{len(publisher.subscribers)} subscriber, {publisher.dropped} tertinggal", flush=True)
+
+
+async def main_async(args):
+    publisher = Publisher(args.queue_size)
+    server = await asyncio.start_server(publisher.handle_subscriber, args.host, args.port)
+    print(f"Live feed di {args.host}:{args.port}", flush=True)
+    tasks = [asyncio.create_task(report(publisher, args.progress))]
+    if args.accept:
+        await asyncio.start_server(publisher.handle_reading, args.host, args.accept)
+        print(f"Menerima SensorData di {args.host}:{args.accept}", flush=True)
+    if args.sensors:
+        rng = random.Random(args.seed)
+        sensors = [VirtualSensor(index, args.sensor_prefix, rng) for index in range(args.sensors)]
+        tasks.append(asyncio.create_task(run_sensors(publisher, sensors, args.interval, rng)))
+    if args.drop_every:
+        tasks.append(asyncio.create_task(drop_periodically(publisher, args.drop_every)))
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publisher pengganti live feed tcp_server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7880)
+    parser.add_argument("--sensors", type=int, default=3, help="Jumlah sensor virtual (0 = tidak ada)")
+    parser.add_argument("--interval", type=float, default=1.0, help="Detik antar pembacaan per sensor")
+    parser.add_argument("--sensor-prefix", default="SHT20-")
+    parser.add_argument("--accept", type=int, default=None,
+                        help="Port untuk menerima SensorData (protokol 7878) dan meneruskannya")
+    parser.add_argument("--drop-every", type=float, default=None,
+                        help="Putus semua subscriber setiap N detik")
+    parser.add_argument("--queue-size", type=int, default=4096)
+    parser.add_argument("--progress", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    try:
+        asyncio.run(main_async(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""Load generator dan replay untuk protokol JSON SensorData ke tcp_server (port 7878).
+
+Protokolnya sama dengan modbus_client: satu koneksi TCP per pembacaan, kirim
+satu objek JSON, lalu baca balasan "OK: ...", "WARNING: ..." atau "ERROR: ..."
+sampai server menutup koneksi. Hanya memakai standard library.
+
+Contoh:
+  # 2000 sensor virtual, masing-masing tiap 10 detik (+/-20%), 2% payload rusak, 5 menit
+  python tcp_loadgen.py simulate --sensors 2000 --interval 10 --jitter 0.2 --malformed 0.02 --duration 300
+
+  # Replay data rekaman (JSONL SensorData atau CSV dengan kolom yang sama) 10x lebih cepat
+  python tcp_loadgen.py replay readings.jsonl --speed 10
+
+  # Replay secepat mungkin dengan 200 koneksi paralel, simpan laporan JSON
+  python tcp_loadgen.py replay readings.csv --speed 0 --concurrency 200 --json report.json
+"""
+import argparse
+import asyncio
+import collections
+import csv
+import datetime
+import json
+import random
+import sys
+import time
+
+
+STATUSES = ("OK", "WARNING", "ERROR", "EMPTY", "TIMEOUT", "CONNECT_ERROR")
+MALFORMED_KINDS = ("truncated_json", "missing_field", "wrong_type", "bad_timestamp",
+                   "invalid_utf8", "oversize")
+FIELDS = ("timestamp", "sensor_id", "location", "process_stage", "temperature_celsius", "humidity_percent")
+PERCENTILES = (50, 90, 95, 99)
+
+
+def sensor_payload(sensor_id, location, process_stage, temperature, humidity, timestamp=None):
+    """Objek SensorData seperti yang dikirim modbus_client"""
+    timestamp = timestamp or datetime.datetime.now().astimezone().isoformat(timespec='seconds')
+    return {
+        "timestamp": timestamp,
+        "sensor_id": sensor_id,
+        "location": location,
+        "process_stage": process_stage,
+        "temperature_celsius": temperature,
+        "humidity_percent": humidity,
+    }
+
+
+def malform(payload, kind):
+    """Payload rusak sesuai jenisnya; server seharusnya membalas ERROR"""
+    if kind == "truncated_json":
+        text = json.dumps(payload)
+        return text[:len(text) // 2].encode()
+    if kind == "missing_field":
+        payload = dict(payload)
+        payload.pop("humidity_percent")
+    elif kind == "wrong_type":
+        payload = dict(payload, temperature_celsius="dua puluh tujuh")
+    elif kind == "bad_timestamp":
+        payload = dict(payload, timestamp="17/10/2024 10:00")
+    elif kind == "invalid_utf8":
+        return json.dumps(payload).encode()[:-2] + b"\xff\xfe}"
+    elif kind == "oversize":
+        # Server hanya membaca 1024 byte pertama
+        payload = dict(payload, location=payload["location"] + " " + "X" * 2048)
+    return json.dumps(payload).encode()
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+class Stats:
+    """Hasil semua pengiriman: status balasan, latensi dan pesan error"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.status_counts = collections.Counter()
+        self.latencies = collections.defaultdict(list)  # status -> detik
+        self.messages = collections.Counter()  # (status, pesan) untuk WARNING/ERROR
+        self.malformed = collections.Counter()  # (jenis payload rusak, status)
+        self.in_flight = 0
+
+    def record(self, status, latency, reply, malformed_kind=None):
+        self.status_counts[status] += 1
+        self.latencies[status].append(latency)
+        if status in ("WARNING", "ERROR", "CONNECT_ERROR"):
+            message = reply.split(":", 1)[-1].strip() if status != "CONNECT_ERROR" else reply
+            self.messages[(status, message[:80])] += 1
+        if malformed_kind is not None:
+            self.malformed[(malformed_kind, status)] += 1
+
+    @property
+    def total(self):
+        return sum(self.status_counts.values())
+
+    def progress_line(self):
+        elapsed = time.monotonic() - self.started
+        counts = " ".join(f"{status}={self.status_counts[status]}" for status in STATUSES
+                          if self.status_counts[status])
+        return (f"[{elapsed:7.1f}s] terkirim={self.total} ({self.total / max(elapsed, 1e-9):.1f}/s) "
+                f"aktif={self.in_flight} {counts}")
+
+    def summary(self):
+        elapsed = time.monotonic() - self.started
+        all_latencies = sorted(latency for values in self.latencies.values() for latency in values)
+        return {
+            'duration_s': elapsed,
+            'sent': self.total,
+            'throughput_per_s': self.total / elapsed if elapsed else 0.0,
+            'status': {status: self.status_counts[status] for status in STATUSES},
+            'latency_ms': {
+                status: {f"p{p}": percentile(sorted(values), p) * 1000 for p in PERCENTILES}
+                | {'max': max(values) * 1000, 'count': len(values)}
+                for status, values in [("all", all_latencies)] + sorted(self.latencies.items()) if values
+            },
+            'top_messages': [
+                {'status': status, 'message': message, 'count': count}
+                for (status, message), count in self.messages.most_common(10)
+            ],
+            'malformed': [
+                {'kind': kind, 'status': status, 'count': count}
+                for (kind, status), count in sorted(self.malformed.items())
+            ],
+        }
+
+
+def print_summary(summary):
+    print("\n=== Ringkasan ===")
+    print(f"Durasi      : {summary['duration_s']:.1f} s")
+    print(f"Terkirim    : {summary['sent']}")
+    print(f"Throughput  : {summary['throughput_per_s']:.1f} pesan/s")
+    print("Status balasan:")
+    for status, count in summary['status'].items():
+        if count:
+            print(f"  {status:<14}{count:>9}  {count / summary['sent']:7.2%}")
+    print("Latensi (ms):")
+    print(f"  {'status':<14}{'n':>8}" + "".join(f"{'p' + str(p):>10}" for p in PERCENTILES) + f"{'max':>10}")
+    for status, values in summary['latency_ms'].items():
+        print(f"  {status:<14}{values['count']:>8}"
+              + "".join(f"{values[f'p{p}']:10.1f}" for p in PERCENTILES) + f"{values['max']:10.1f}")
+    if summary['top_messages']:
+        print("Pesan error/warning terbanyak:")
+        for item in summary['top_messages']:
+            print(f"  {item['count']:>7}  {item['status']}: {item['message']}")
+    if summary['malformed']:
+        print("Payload rusak -> status balasan:")
+        for item in summary['malformed']:
+            print(f"  {item['kind']:<16}{item['status']:<14}{item['count']:>7}")
+
+
+class LoadGenerator:
+    def __init__(self, host, port, timeout, concurrency):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.limit = asyncio.Semaphore(concurrency)  # Batas koneksi terbuka bersamaan
+        self.stats = Stats()
+
+    async def send(self, data, malformed_kind=None):
+        """Satu pembacaan: connect, kirim, baca balasan sampai koneksi ditutup server"""
+        async with self.limit:
+            self.stats.in_flight += 1
+            started = time.monotonic()
+            writer = None
+            try:
+                try:
+                    reader, writer = await asyncio.wait_for(
+                        asyncio.open_connection(self.host, self.port), self.timeout)
+                except (OSError, asyncio.TimeoutError) as e:
+                    self.stats.record("CONNECT_ERROR", time.monotonic() - started,
+                                      type(e).__name__, malformed_kind)
+                    return
+                try:
+                    writer.write(data)
+                    await writer.drain()
+                    reply = await asyncio.wait_for(reader.read(), self.timeout)
+                except asyncio.TimeoutError:
+                    self.stats.record("TIMEOUT", time.monotonic() - started, "", malformed_kind)
+                    return
+                except OSError as e:
+                    self.stats.record("EMPTY", time.monotonic() - started, str(e), malformed_kind)
+                    return
+                text = reply.decode("utf-8", errors="replace")
+                status = text.split(":", 1)[0] if text else "EMPTY"
+                if status not in STATUSES:
+                    status = "EMPTY"
+                self.stats.record(status, time.monotonic() - started, text, malformed_kind)
+            finally:
+                self.stats.in_flight -= 1
+                if writer is not None:
+                    writer.close()
+
+    async def report_progress(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            print(self.stats.progress_line(), flush=True)
+
+
+class VirtualSensor:
+    """Sensor virtual dengan random walk suhu dan kelembaban"""
+
+    def __init__(self, index, prefix, rng):
+        self.sensor_id = f"{prefix}{index + 1:04d}"
+        self.location = "Crude Oil Storage Tank T-101"
+        self.process_stage = "Storage"
+        self.temperature = rng.uniform(25.0, 29.0)
+        self.humidity = rng.uniform(52.0, 68.0)
+
+    def reading(self, rng):
+        # Nilai satu desimal seperti register Modbus / 10
+        self.temperature = min(max(self.temperature + rng.gauss(0, 0.1), 15.0), 40.0)
+        self.humidity = min(max(self.humidity + rng.gauss(0, 0.3), 20.0), 95.0)
+        return sensor_payload(self.sensor_id, self.location, self.process_stage,
+                              round(self.temperature, 1), round(self.humidity, 1))
+
+
+async def simulate(args, generator):
+    rng = random.Random(args.seed)
+    sensors = [VirtualSensor(index, args.sensor_prefix, rng) for index in range(args.sensors)]
+    deadline = time.monotonic() + args.duration
+    pending = set()
+
+    async def run_sensor(sensor):
+        # Offset awal acak agar sensor tidak mengirim bersamaan
+        await asyncio.sleep(rng.uniform(0, args.interval))
+        while time.monotonic() < deadline:
+            payload = sensor.reading(rng)
+            kind = rng.choice(MALFORMED_KINDS) if rng.random() < args.malformed else None
+            data = malform(payload, kind) if kind else json.dumps(payload).encode()
+            task = asyncio.create_task(generator.send(data, kind))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            await asyncio.sleep(args.interval * (1 + rng.uniform(-args.jitter, args.jitter)))
+
+    progress = asyncio.create_task(generator.report_progress(args.progress))
+    await asyncio.gather(*(run_sensor(sensor) for sensor in sensors))
+    if pending:
+        await asyncio.gather(*pending)
+    progress.cancel()
+
+
+def load_dataset(path):
+    """Membaca rekaman: JSONL (satu SensorData per baris) atau CSV dengan kolom SensorData"""
+    readings = []
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(f):
+                row["temperature_celsius"] = float(row["temperature_celsius"])
+                row["humidity_percent"] = float(row["humidity_percent"])
+                readings.append({field: row[field] for field in FIELDS})
+        else:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                # Juga menerima log modbus_client: "[...] Sending data: {...}"
+                readings.append(json.loads(line[line.index("{"):]))
+    readings.sort(key=lambda reading: datetime.datetime.fromisoformat(
+        reading["timestamp"].replace("Z", "+00:00")))
+    return readings
+
+
+async def replay(args, generator):
+    readings = load_dataset(args.dataset)
+    if not readings:
+        return
+    parse = lambda reading: datetime.datetime.fromisoformat(reading["timestamp"].replace("Z", "+00:00"))
+    first = parse(readings[0])
+    # Geser timestamp agar data rekaman tercatat sebagai data baru
+    shift = datetime.datetime.now().astimezone() - parse(readings[-1]) if args.shift_to_now else None
+
+    progress = asyncio.create_task(generator.report_progress(args.progress))
+    tasks = []
+    started = time.monotonic()
+    for reading in readings:
+        if args.speed > 0:
+            due = (parse(reading) - first).total_seconds() / args.speed
+            delay = due - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if shift is not None:
+            reading = dict(reading, timestamp=(parse(reading) + shift).isoformat(timespec='seconds'))
+        tasks.append(asyncio.create_task(generator.send(json.dumps(reading).encode())))
+        if len(tasks) >= 10_000:
+            tasks = [task for task in tasks if not task.done()]
+    await asyncio.gather(*tasks)
+    progress.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator protokol SensorData untuk tcp_server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7878)
+    parser.add_argument("--timeout", type=float, default=5.0, help="Timeout connect dan balasan (detik)")
+    parser.add_argument("--concurrency", type=int, default=500, help="Koneksi terbuka maksimum")
+    parser.add_argument("--progress", type=float, default=5.0, help="Interval laporan progres (detik)")
+    parser.add_argument("--json", help="Simpan ringkasan sebagai JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sim = commands.add_parser("simulate", help="Sensor virtual dengan data sintetis")
+    sim.add_argument("--sensors", type=int, default=1000)
+    sim.add_argument("--interval", type=float, default=10.0, help="Detik antar pembacaan per sensor")
+    sim.add_argument("--jitter", type=float, default=0.1, help="Variasi interval (0.1 = +/-10%%)")
+    sim.add_argument("--malformed", type=float, default=0.0, help="Rasio payload rusak (0-1)")
+    sim.add_argument("--duration", type=float, default=60.0, help="Durasi (detik)")
+    sim.add_argument("--sensor-prefix", default="LOAD-", help="Prefix sensor_id agar tidak tercampur data asli")
+    sim.add_argument("--seed", type=int, default=None)
+
+    rep = commands.add_parser("replay", help="Kirim ulang data rekaman")
+    rep.add_argument("dataset", help="File .jsonl atau .csv")
+    rep.add_argument("--speed", type=float, default=1.0,
+                     help="Kelipatan kecepatan rekaman; 0 = secepat mungkin")
+    rep.add_argument("--shift-to-now", action="store_true",
+                     help="Geser timestamp sehingga data terakhir bertepatan dengan sekarang")
+
+    args = parser.parse_args()
+    runner = simulate if args.command == "simulate" else replay
+
+    generators = []
+
+    async def run():
+        # Semaphore dibuat di dalam event loop yang menjalankannya
+        generators.append(LoadGenerator(args.host, args.port, args.timeout, args.concurrency))
+        await runner(args, generators[0])
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("Dihentikan, ringkasan sebagian:", file=sys.stderr)
+    if not generators:
+        return
+    summary = generators[0].stats.summary()
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,636 @@
+// Anchoring batch ke blockchain: pembacaan dikumpulkan selama BATCH_WINDOW,
+// dibuat Merkle tree, lalu hanya root-nya yang dikirim lewat satu transaksi
+// anchorBatch. Proof per pembacaan disimpan lokal (PROOF_FILE) setelah receipt
+// transaksinya sukses, dan bisa dicek lewat verify API di VERIFY_ADDR.
+use std::collections::HashMap;
+use std::sync::Arc;
+use std::time::{Duration, Instant};
+
+use chrono::{DateTime, Utc};
+use serde::{Deserialize, Serialize};
+use tokio::{
+    fs::{File, OpenOptions},
+    io::{AsyncBufReadExt, AsyncReadExt, AsyncWriteExt, BufReader},
+    net::TcpListener,
+    sync::{mpsc, Mutex},
+    time,
+};
+use web3::{
+    contract::{Contract, Options},
+    ethabi::{encode, Token},
+    signing::keccak256,
+    transports::Http,
+    types::{H160, H256, U256, U64},
+    Web3,
+};
+
+use crate::SensorData;
+
+pub const BATCH_WINDOW: Duration = Duration::from_secs(10);
+pub const MAX_BATCH: usize = 1000; // Batch dikirim lebih awal jika sudah sebanyak ini
+pub const MAX_PENDING: usize = 100_000; // Batas antrean saat node blockchain tidak bisa dihubungi
+pub const MAX_BACKOFF: Duration = Duration::from_secs(300); // Jeda percobaan ulang terlama setelah anchor gagal
+pub const RECEIPT_TIMEOUT: Duration = Duration::from_secs(120); // Transaksi tanpa receipt dianggap gagal/dropped
+const RECEIPT_POLL: Duration = Duration::from_secs(1);
+pub const PROOF_FILE: &str = "anchor_proofs.jsonl";
+pub const VERIFY_ADDR: &str = "127.0.0.1:7879";
+// DApp masih membaca riwayat lewat getReadingCount/sensorReadings, jadi addReading per
+// pembacaan tetap dikirim kecuali variabel ini diset ke 0/false/off
+pub const LEGACY_READINGS_ENV: &str = "SHT20_LEGACY_READINGS";
+
+type BoxError = Box<dyn std::error::Error + Send + Sync>;
+
+const CONTRACT_ABI: &str = r#"
+    [
+        {
+            "inputs": [
+                {"internalType": "string", "name": "_sensorId", "type": "string"},
+                {"internalType": "string", "name": "_location", "type": "string"},
+                {"internalType": "string", "name": "_processStage", "type": "string"},
+                {"internalType": "uint256", "name": "_timestamp", "type": "uint256"},
+                {"internalType": "int256", "name": "_temperature", "type": "int256"},
+                {"internalType": "uint256", "name": "_humidity", "type": "uint256"}
+            ],
+            "name": "addReading",
+            "outputs": [],
+            "stateMutability": "nonpayable",
+            "type": "function"
+        },
+        {
+            "inputs": [
+                {"internalType": "bytes32", "name": "_merkleRoot", "type": "bytes32"},
+                {"internalType": "uint256", "name": "_count", "type": "uint256"},
+                {"internalType": "uint256", "name": "_firstTimestamp", "type": "uint256"},
+                {"internalType": "uint256", "name": "_lastTimestamp", "type": "uint256"}
+            ],
+            "name": "anchorBatch",
+            "outputs": [],
+            "stateMutability": "nonpayable",
+            "type": "function"
+        },
+        {
+            "inputs": [{"internalType": "bytes32", "name": "", "type": "bytes32"}],
+            "name": "batchIdByRoot",
+            "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+            "stateMutability": "view",
+            "type": "function"
+        },
+        {
+            "inputs": [
+                {"internalType": "bytes32", "name": "_merkleRoot", "type": "bytes32"},
+                {"internalType": "bytes32", "name": "_leaf", "type": "bytes32"},
+                {"internalType": "bytes32[]", "name": "_proof", "type": "bytes32[]"}
+            ],
+            "name": "verifyReading",
+            "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
+            "stateMutability": "view",
+            "type": "function"
+        }
+    ]
+"#;
+
+/// Pembacaan dalam bentuk yang di-hash ke kontrak (nilai x10, timestamp unix detik)
+#[derive(Debug, Clone, Serialize, Deserialize)]
+pub struct Reading {
+    pub sensor_id: String,
+    pub location: String,
+    pub process_stage: String,
+    pub timestamp: u64,
+    pub temperature_x10: i64,
+    pub humidity_x10: u64,
+}
+
+impl Reading {
+    pub fn from_sensor(data: &SensorData) -> Self {
+        let timestamp = match DateTime::parse_from_rfc3339(&data.timestamp) {
+            Ok(dt) => dt.timestamp() as u64,
+            Err(_) => Utc::now().timestamp() as u64,
+        };
+        Reading {
+            sensor_id: data.sensor_id.clone(),
+            location: data.location.clone(),
+            process_stage: data.process_stage.clone(),
+            timestamp,
+            temperature_x10: (data.temperature_celsius * 10.0).round() as i64,
+            humidity_x10: (data.humidity_percent * 10.0).round() as u64,
+        }
+    }
+
+    /// Sama dengan Fermentation.readingLeaf: keccak256(abi.encode(...))
+    pub fn leaf(&self) -> [u8; 32] {
+        keccak256(&encode(&[
+            Token::String(self.sensor_id.clone()),
+            Token::String(self.location.clone()),
+            Token::String(self.process_stage.clone()),
+            Token::Uint(U256::from(self.timestamp)),
+            Token::Int(int256(self.temperature_x10)),
+            Token::Uint(U256::from(self.humidity_x10)),
+        ]))
+    }
+}
+
+/// Nilai SHT20_LEGACY_READINGS; tidak diset berarti addReading per pembacaan tetap aktif
+pub fn legacy_readings_enabled(value: Option<&str>) -> bool {
+    !matches!(
+        value.map(|v| v.trim().to_ascii_lowercase()).as_deref(),
+        Some("0") | Some("false") | Some("off") | Some("no")
+    )
+}
+
+/// int256 two's complement
+fn int256(value: i64) -> U256 {
+    if value >= 0 {
+        U256::from(value as u64)
+    } else {
+        !U256::from((-(value + 1)) as u64)
+    }
+}
+
+fn hash_pair(a: &[u8; 32], b: &[u8; 32]) -> [u8; 32] {
+    let (left, right) = if a <= b { (a, b) } else { (b, a) };
+    let mut buf = [0u8; 64];
+    buf[..32].copy_from_slice(left);
+    buf[32..].copy_from_slice(right);
+    keccak256(&buf)
+}
+
+/// Root dan proof setiap leaf. Pasangan di-hash terurut (sama dengan verifyReading);
+/// node ganjil di ujung level naik tanpa di-hash.
+pub fn merkle_tree(leaves: &[[u8; 32]]) -> ([u8; 32], Vec<Vec<[u8; 32]>>) {
+    let mut proofs = vec![Vec::new(); leaves.len()];
+    let mut positions: Vec<usize> = (0..leaves.len()).collect();
+    let mut level = leaves.to_vec();
+    while level.len() > 1 {
+        for (leaf, position) in positions.iter_mut().enumerate() {
+            let sibling = *position ^ 1;
+            if sibling < level.len() {
+                proofs[leaf].push(level[sibling]);
+            }
+            *position /= 2;
+        }
+        level = level
+            .chunks(2)
+            .map(|pair| if pair.len() == 2 { hash_pair(&pair[0], &pair[1]) } else { pair[0] })
+            .collect();
+    }
+    (level[0], proofs)
+}
+
+pub fn verify_proof(leaf: &[u8; 32], proof: &[[u8; 32]], root: &[u8; 32]) -> bool {
+    proof.iter().fold(*leaf, |node, sibling| hash_pair(&node, sibling)) == *root
+}
+
+fn to_hex(bytes: &[u8; 32]) -> String {
+    format!("0x{}", hex::encode(bytes))
+}
+
+fn from_hex(text: &str) -> Result<[u8; 32], BoxError> {
+    let mut bytes = [0u8; 32];
+    hex::decode_to_slice(text.trim_start_matches("0x"), &mut bytes)?;
+    Ok(bytes)
+}
+
+/// Satu pembacaan yang sudah di-anchor beserta proof-nya
+#[derive(Debug, Clone, Serialize, Deserialize)]
+pub struct AnchoredReading {
+    pub reading: Reading,
+    pub leaf: String,
+    pub proof: Vec<String>,
+}
+
+/// Satu baris PROOF_FILE
+#[derive(Debug, Clone, Serialize, Deserialize)]
+pub struct BatchRecord {
+    pub root: String,
+    pub tx_hash: String,
+    pub first_timestamp: u64,
+    pub last_timestamp: u64,
+    pub readings: Vec<AnchoredReading>,
+}
+
+#[derive(Debug, Serialize)]
+pub struct VerifyResult {
+    pub verified: bool,
+    pub on_chain: Option<bool>,
+    pub leaf: String,
+    pub root: Option<String>,
+    pub tx_hash: Option<String>,
+    pub proof: Vec<String>,
+    pub message: String,
+}
+
+/// leaf (hex) -> (root, tx hash, proof)
+type ProofIndex = Arc<Mutex<HashMap<String, (String, String, Vec<String>)>>>;
+
+/// Status percobaan ulang setelah anchor gagal. Selama aktif, batch penuh di jalur terima
+/// tidak memicu RPC; percobaan berikutnya hanya dari ticker setelah jedanya lewat.
+#[derive(Debug, Default)]
+struct Backoff {
+    failures: u32,
+    retry_at: Option<Instant>,
+}
+
+impl Backoff {
+    fn active(&self) -> bool {
+        self.retry_at.is_some()
+    }
+
+    fn ready(&self, now: Instant) -> bool {
+        self.retry_at.map_or(true, |at| now >= at)
+    }
+
+    /// Jeda berlipat dua per kegagalan berturut-turut: BATCH_WINDOW, 2x, 4x, ... sampai MAX_BACKOFF
+    fn failed(&mut self, now: Instant) -> Duration {
+        let delay = BATCH_WINDOW.saturating_mul(1u32 << self.failures.min(16)).min(MAX_BACKOFF);
+        self.failures += 1;
+        self.retry_at = Some(now + delay);
+        delay
+    }
+
+    fn succeeded(&mut self) {
+        *self = Backoff::default();
+    }
+}
+
+/// Membuang pembacaan terlama jika antrean melebihi MAX_PENDING
+fn trim_pending(pending: &mut Vec<Reading>) {
+    if pending.len() > MAX_PENDING {
+        let dropped = pending.len() - MAX_PENDING;
+        pending.drain(..dropped);
+        eprintln!("Anchoring queue full, dropped {} oldest readings", dropped);
+    }
+}
+
+#[derive(Clone)]
+pub struct Anchorer {
+    web3: Web3<Http>,
+    contract: Contract<Http>,
+    from: H160,
+    proof_path: String,
+    proofs: ProofIndex,
+    submitted: Arc<Mutex<HashMap<[u8; 32], H256>>>, // root -> tx yang receipt-nya belum diterima
+}
+
+impl Anchorer {
+    /// Transport dan kontrak dibuat sekali, bukan per pembacaan
+    pub fn new(rpc_url: &str, contract_addr: &str, from: &str, proof_path: &str) -> Result<Self, BoxError> {
+        let web3 = Web3::new(Http::new(rpc_url)?);
+        let contract = Contract::from_json(web3.eth(), contract_addr.parse()?, CONTRACT_ABI.as_bytes())?;
+        Ok(Anchorer {
+            web3,
+            contract,
+            from: from.parse()?,
+            proof_path: proof_path.to_string(),
+            proofs: Arc::new(Mutex::new(HashMap::new())),
+            submitted: Arc::new(Mutex::new(HashMap::new())),
+        })
+    }
+
+    /// Memuat proof dari batch sebelumnya; mengembalikan jumlah pembacaan
+    pub async fn load_proofs(&self) -> Result<usize, BoxError> {
+        let file = match File::open(&self.proof_path).await {
+            Ok(file) => file,
+            Err(e) if e.kind() == std::io::ErrorKind::NotFound => return Ok(0),
+            Err(e) => return Err(e.into()),
+        };
+        let mut lines = BufReader::new(file).lines();
+        let mut proofs = self.proofs.lock().await;
+        while let Some(line) = lines.next_line().await? {
+            let record: BatchRecord = serde_json::from_str(&line)?;
+            for anchored in record.readings {
+                proofs.insert(anchored.leaf, (record.root.clone(), record.tx_hash.clone(), anchored.proof));
+            }
+        }
+        Ok(proofs.len())
+    }
+
+    /// Mengumpulkan pembacaan dari channel dan meng-anchor per BATCH_WINDOW atau MAX_BATCH
+    pub async fn run(self, mut receiver: mpsc::Receiver<Reading>) {
+        let mut pending: Vec<Reading> = Vec::new();
+        let mut backoff = Backoff::default();
+        let mut ticker = time::interval(BATCH_WINDOW);
+        loop {
+            tokio::select! {
+                received = receiver.recv() => match received {
+                    Some(reading) => {
+                        pending.push(reading);
+                        if backoff.active() {
+                            // Node sedang gagal: jangan kirim RPC per pembacaan, cukup jaga batas antrean
+                            if pending.len() >= MAX_PENDING + MAX_BATCH {
+                                trim_pending(&mut pending);
+                            }
+                        } else if pending.len() >= MAX_BATCH {
+                            self.flush(&mut pending, &mut backoff).await;
+                        }
+                    }
+                    None => {
+                        self.flush(&mut pending, &mut backoff).await;
+                        return;
+                    }
+                },
+                _ = ticker.tick() => {
+                    if backoff.ready(Instant::now()) {
+                        self.flush(&mut pending, &mut backoff).await;
+                    }
+                }
+            }
+        }
+    }
+
+    async fn flush(&self, pending: &mut Vec<Reading>, backoff: &mut Backoff) {
+        if pending.is_empty() {
+            return;
+        }
+        let batch = std::mem::take(pending);
+        match self.anchor(&batch).await {
+            Ok(record) => {
+                backoff.succeeded();
+                println!(
+                    "Batch of {} readings anchored, root {} (tx {})",
+                    batch.len(), record.root, record.tx_hash
+                );
+            }
+            Err(e) => {
+                // Dicoba lagi oleh ticker setelah jeda backoff; yang paling lama dibuang jika antrean penuh
+                let delay = backoff.failed(Instant::now());
+                eprintln!(
+                    "Failed to anchor batch of {} readings: {} (retry in {:?})",
+                    batch.len(), e, delay
+                );
+                *pending = batch;
+                trim_pending(pending);
+            }
+        }
+    }
+
+    /// Menunggu receipt; gagal jika transaksi revert atau tidak di-mine dalam RECEIPT_TIMEOUT
+    async fn wait_for_receipt(&self, tx: H256) -> Result<(), BoxError> {
+        let deadline = Instant::now() + RECEIPT_TIMEOUT;
+        loop {
+            if let Some(receipt) = self.web3.eth().transaction_receipt(tx).await? {
+                return match receipt.status {
+                    Some(status) if status == U64::from(1) => Ok(()),
+                    _ => Err(format!("anchor tx {:?} reverted", tx).into()),
+                };
+            }
+            if Instant::now() >= deadline {
+                return Err(format!("no receipt for anchor tx {:?} after {:?}", tx, RECEIPT_TIMEOUT).into());
+            }
+            time::sleep(RECEIPT_POLL).await;
+        }
+    }
+
+    /// Mengirim anchorBatch dan menunggu receipt-nya. Root yang sudah tercatat di kontrak
+    /// (transaksi percobaan sebelumnya ternyata di-mine) tidak dikirim ulang.
+    async fn submit_root(&self, root: [u8; 32], count: usize, first: u64, last: u64) -> Result<H256, BoxError> {
+        let batch_id: U256 = self.contract.query(
+            "batchIdByRoot", (H256::from(root),), None, Options::default(), None,
+        ).await?;
+        if !batch_id.is_zero() {
+            let previous = self.submitted.lock().await.remove(&root);
+            return Ok(previous.unwrap_or_default());
+        }
+
+        let tx = self.contract.call(
+            "anchorBatch",
+            (H256::from(root), U256::from(count), U256::from(first), U256::from(last)),
+            self.from,
+            Options::default(),
+        ).await?;
+        self.submitted.lock().await.insert(root, tx);
+        self.wait_for_receipt(tx).await?;
+        self.submitted.lock().await.remove(&root);
+        Ok(tx)
+    }
+
+    async fn anchor(&self, batch: &[Reading]) -> Result<BatchRecord, BoxError> {
+        let leaves: Vec<[u8; 32]> = batch.iter().map(Reading::leaf).collect();
+        let (root, proofs) = merkle_tree(&leaves);
+        let first_timestamp = batch.iter().map(|r| r.timestamp).min().unwrap_or(0);
+        let last_timestamp = batch.iter().map(|r| r.timestamp).max().unwrap_or(0);
+
+        // Proof baru ditulis setelah receipt sukses: transaksi yang revert atau hilang
+        // tidak meninggalkan proof untuk root yang tidak ada di chain
+        let tx = self.submit_root(root, batch.len(), first_timestamp, last_timestamp).await?;
+
+        let record = BatchRecord {
+            root: to_hex(&root),
+            tx_hash: format!("{:?}", tx),
+            first_timestamp,
+            last_timestamp,
+            readings: batch
+                .iter()
+                .zip(leaves.iter().zip(proofs))
+                .map(|(reading, (leaf, proof))| AnchoredReading {
+                    reading: reading.clone(),
+                    leaf: to_hex(leaf),
+                    proof: proof.iter().map(to_hex).collect(),
+                })
+                .collect(),
+        };
+
+        let mut line = serde_json::to_string(&record)?;
+        line.push('\n');
+        let mut file = OpenOptions::new().create(true).append(true).open(&self.proof_path).await?;
+        file.write_all(line.as_bytes()).await?;
+
+        let mut proofs = self.proofs.lock().await;
+        for anchored in &record.readings {
+            proofs.insert(
+                anchored.leaf.clone(),
+                (record.root.clone(), record.tx_hash.clone(), anchored.proof.clone()),
+            );
+        }
+        Ok(record)
+    }
+
+    /// Mode lama: satu transaksi addReading (event NewReading) per pembacaan, lewat kontrak yang sama
+    pub async fn add_reading(&self, reading: &Reading) -> Result<H256, BoxError> {
+        let tx = self.contract.call(
+            "addReading",
+            (
+                reading.sensor_id.clone(),
+                reading.location.clone(),
+                reading.process_stage.clone(),
+                U256::from(reading.timestamp),
+                reading.temperature_x10 as i128,
+                U256::from(reading.humidity_x10),
+            ),
+            self.from,
+            Options::default(),
+        ).await?;
+        Ok(tx)
+    }
+
+    /// Leaf dihitung ulang dari nilai yang dikirim, jadi nilai yang diubah tidak akan ditemukan
+    pub async fn verify(&self, reading: &Reading) -> VerifyResult {
+        let leaf = reading.leaf();
+        let leaf_hex = to_hex(&leaf);
+        let entry = self.proofs.lock().await.get(&leaf_hex).cloned();
+        let Some((root_hex, tx_hash, proof_hex)) = entry else {
+            return VerifyResult {
+                verified: false,
+                on_chain: None,
+                leaf: leaf_hex,
+                root: None,
+                tx_hash: None,
+                proof: Vec::new(),
+                message: "Reading not anchored yet or values differ".to_string(),
+            };
+        };
+
+        let decoded = from_hex(&root_hex).and_then(|root| {
+            let proof = proof_hex.iter().map(|p| from_hex(p)).collect::<Result<Vec<_>, _>>()?;
+            Ok((root, proof))
+        });
+        let (root, proof) = match decoded {
+            Ok(decoded) => decoded,
+            Err(e) => {
+                return VerifyResult {
+                    verified: false,
+                    on_chain: None,
+                    leaf: leaf_hex,
+                    root: Some(root_hex),
+                    tx_hash: Some(tx_hash),
+                    proof: proof_hex,
+                    message: format!("Corrupt proof record: {}", e),
+                };
+            }
+        };
+        let verified = verify_proof(&leaf, &proof, &root);
+
+        let on_chain: Result<bool, _> = self.contract.query(
+            "verifyReading",
+            (H256::from(root), H256::from(leaf), proof.iter().map(|p| H256::from(*p)).collect::<Vec<_>>()),
+            None,
+            Options::default(),
+            None,
+        ).await;
+        let (on_chain, message) = match on_chain {
+            Ok(true) => (Some(true), "Reading verified against the anchored root".to_string()),
+            Ok(false) => (Some(false), "Root not anchored on-chain or proof rejected".to_string()),
+            Err(e) => (None, format!("Local proof checked, on-chain check failed: {}", e)),
+        };
+
+        VerifyResult {
+            verified: verified && on_chain != Some(false),
+            on_chain,
+            leaf: leaf_hex,
+            root: Some(root_hex),
+            tx_hash: Some(tx_hash),
+            proof: proof_hex,
+            message,
+        }
+    }
+}
+
+/// Verify API: kirim JSON pembacaan (format sama dengan port 7878), balasan JSON VerifyResult
+pub async fn serve_verify(addr: &str, anchorer: Anchorer) -> std::io::Result<()> {
+    let listener = TcpListener::bind(addr).await?;
+    println!("Verify API running on {}", addr);
+
+    loop {
+        let (mut socket, _) = listener.accept().await?;
+        let anchorer = anchorer.clone();
+
+        tokio::spawn(async move {
+            let mut buf = [0; 1024];
+            let n = match socket.read(&mut buf).await {
+                Ok(0) => return,
+                Ok(n) => n,
+                Err(e) => {
+                    eprintln!("Error reading socket: {}", e);
+                    return;
+                }
+            };
+            let reply = match serde_json::from_slice::<SensorData>(&buf[..n]) {
+                Ok(sensor_data) => {
+                    let result = anchorer.verify(&Reading::from_sensor(&sensor_data)).await;
+                    serde_json::to_string(&result).unwrap_or_else(|e| format!("ERROR: {}", e))
+                }
+                Err(e) => format!("ERROR: Invalid JSON - {}", e),
+            };
+            let _ = socket.write_all(reply.as_bytes()).await;
+        });
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn reading(i: u64) -> Reading {
+        Reading {
+            sensor_id: format!("SHT20-{:03}", i % 3 + 1),
+            location: "Tank T-101".to_string(),
+            process_stage: "Fermentasi".to_string(),
+            timestamp: 1_700_000_000 + i,
+            temperature_x10: 275 - i as i64,
+            humidity_x10: 652,
+        }
+    }
+
+    #[test]
+    fn every_proof_matches_root() {
+        for size in [1, 2, 3, 7, 8, 100] {
+            let leaves: Vec<[u8; 32]> = (0..size).map(|i| reading(i).leaf()).collect();
+            let (root, proofs) = merkle_tree(&leaves);
+            for (leaf, proof) in leaves.iter().zip(&proofs) {
+                assert!(verify_proof(leaf, proof, &root));
+            }
+        }
+    }
+
+    #[test]
+    fn changed_value_is_rejected() {
+        let leaves: Vec<[u8; 32]> = (0..10).map(|i| reading(i).leaf()).collect();
+        let (root, proofs) = merkle_tree(&leaves);
+        let mut tampered = reading(4);
+        tampered.temperature_x10 += 1;
+        assert!(!verify_proof(&tampered.leaf(), &proofs[4], &root));
+    }
+
+    #[test]
+    fn backoff_doubles_up_to_max() {
+        let now = Instant::now();
+        let mut backoff = Backoff::default();
+        assert!(!backoff.active());
+        assert!(backoff.ready(now));
+
+        let delays: Vec<Duration> = (0..8).map(|_| backoff.failed(now)).collect();
+        assert_eq!(delays[0], BATCH_WINDOW);
+        assert_eq!(delays[1], BATCH_WINDOW * 2);
+        assert_eq!(delays[2], BATCH_WINDOW * 4);
+        assert_eq!(*delays.last().unwrap(), MAX_BACKOFF);
+        assert!(backoff.active());
+        assert!(!backoff.ready(now));
+        assert!(backoff.ready(now + MAX_BACKOFF));
+
+        backoff.succeeded();
+        assert!(!backoff.active());
+        assert_eq!(backoff.failed(now), BATCH_WINDOW);
+    }
+
+    #[test]
+    fn trim_keeps_newest_readings() {
+        let mut pending: Vec<Reading> = (0..(MAX_PENDING + 5) as u64).map(reading).collect();
+        trim_pending(&mut pending);
+        assert_eq!(pending.len(), MAX_PENDING);
+        assert_eq!(pending[0].timestamp, reading(5).timestamp);
+    }
+
+    #[test]
+    fn legacy_readings_default_on() {
+        assert!(legacy_readings_enabled(None));
+        assert!(legacy_readings_enabled(Some("1")));
+        assert!(!legacy_readings_enabled(Some("0")));
+        assert!(!legacy_readings_enabled(Some(" False ")));
+        assert!(!legacy_readings_enabled(Some("off")));
+    }
+
+    #[test]
+    fn negative_temperature_is_twos_complement() {
+        assert_eq!(int256(-1), U256::MAX);
+        assert_eq!(int256(-15), U256::MAX - U256::from(14));
+    }
+}
@@ -0,0 +1,33 @@
+// Live feed fan-out: setiap pembacaan yang berhasil ditulis ke InfluxDB dikirim
+// ke semua subscriber sebagai satu baris JSON (NDJSON) lewat TCP, sehingga
+// dashboard tidak perlu polling InfluxDB untuk data baru.
+use tokio::{io::AsyncWriteExt, net::TcpListener, sync::broadcast};
+
+pub const LIVE_ADDR: &str = "127.0.0.1:7880";
+pub const LIVE_BUFFER: usize = 4096; // Pembacaan yang bisa tertinggal per subscriber
+
+pub async fn serve_live(addr: &str, sender: broadcast::Sender<String>) -> std::io::Result<()> {
+    let listener = TcpListener::bind(addr).await?;
+    println!("Live feed running on {}", addr);
+
+    loop {
+        let (mut socket, peer) = listener.accept().await?;
+        let mut receiver = sender.subscribe();
+        println!("Live subscriber {} connected", peer);
+
+        tokio::spawn(async move {
+            loop {
+                let line = match receiver.recv().await {
+                    Ok(line) => line,
+                    // Subscriber terlalu lambat: beri tahu agar mengambil celahnya dari InfluxDB
+                    Err(broadcast::error::RecvError::Lagged(skipped)) => format!("{{\"lagged\":{}}}", skipped),
+                    Err(broadcast::error::RecvError::Closed) => return,
+                };
+                if socket.write_all(format!("{}\n", line).as_bytes()).await.is_err() {
+                    println!("Live subscriber {} disconnected", peer);
+                    return;
+                }
+            }
+        });
+    }
+}
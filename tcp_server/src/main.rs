@@ -1,22 +1,20 @@
 use influxdb2::Client;
 use influxdb2::models::DataPoint;
-use serde::Deserialize;
+use serde::{Deserialize, Serialize};
 use tokio::{
     io::{AsyncReadExt, AsyncWriteExt},
     net::TcpListener,
+    sync::{broadcast, mpsc},
 };
 use futures::stream;
 use chrono::{Utc, DateTime};
-use web3::{
-    contract::{Contract, Options},
-    types::{H160, U256},
-    transports::Http,
-    Web3,
-};
-use std::str::FromStr;
 
-#[derive(Debug, Deserialize)]
-struct SensorData {
+mod anchor;
+mod live;
+use anchor::{Anchorer, Reading};
+
+#[derive(Debug, Deserialize, Serialize)]
+pub(crate) struct SensorData {
     timestamp: String,
     sensor_id: String,
     location: String,
@@ -25,61 +23,6 @@ struct SensorData {
     humidity_percent: f64,
 }
 
-async fn store_to_blockchain(data: &SensorData) -> Result<(), Box<dyn std::error::Error + Send + Sync>> {
-    let timestamp = match DateTime::parse_from_rfc3339(&data.timestamp) {
-        Ok(dt) => dt.timestamp() as u64,
-        Err(_) => Utc::now().timestamp() as u64,
-    };
-
-    let transport = Http::new("http://localhost:8545")?;
-    let web3 = Web3::new(transport);
-
-    // Contoh alamat kontrak - ganti dengan yang sebenarnya
-    let contract_addr = H160::from_str("0x5FbDB2315678afecb367f032d93F642f64180aa3")?;
-    
-    // ABI langsung dalam kode
-    let contract_abi = r#"
-        [
-            {
-                "inputs": [
-                    {"internalType": "string", "name": "_sensorId", "type": "string"},
-                    {"internalType": "string", "name": "_location", "type": "string"},
-                    {"internalType": "string", "name": "_processStage", "type": "string"},
-                    {"internalType": "uint256", "name": "_timestamp", "type": "uint256"},
-                    {"internalType": "int256", "name": "_temperature", "type": "int256"},
-                    {"internalType": "uint256", "name": "_humidity", "type": "uint256"}
-                ],
-                "name": "addReading",
-                "outputs": [],
-                "stateMutability": "nonpayable",
-                "type": "function"
-            }
-        ]
-    "#.as_bytes();
-    
-    let contract = Contract::from_json(web3.eth(), contract_addr, contract_abi)?;
-
-    let temp_fixed = (data.temperature_celsius * 10.0).round() as i128;
-    let hum_fixed = (data.humidity_percent * 10.0).round() as u64;
-
-    let tx = contract.call(
-        "addReading",
-        (
-            data.sensor_id.clone(),
-            data.location.clone(),
-            data.process_stage.clone(),
-            timestamp,
-            temp_fixed,
-            U256::from(hum_fixed),
-        ),
-        "0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266".parse()?,
-        Options::default(),
-    ).await?;
-
-    println!("Transaction Hash: {:?}", tx);
-    Ok(())
-}
-
 #[tokio::main]
 async fn main() -> Result<(), Box<dyn std::error::Error>> {
     let influx_url = "http://localhost:8086";
@@ -97,6 +40,41 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
         }
     }
 
+    // Pembacaan di-anchor per batch; addReading per sampel hanya untuk DApp yang belum membaca batch
+    let anchorer = Anchorer::new(
+        "http://localhost:8545",
+        "0x5FbDB2315678afecb367f032d93F642f64180aa3",
+        "0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266",
+        anchor::PROOF_FILE,
+    ).map_err(|e| e.to_string())?;
+    match anchorer.load_proofs().await {
+        Ok(count) => println!("Loaded {} anchored reading proofs", count),
+        Err(e) => eprintln!("Failed to load anchor proofs: {}", e),
+    }
+    let legacy_readings = anchor::legacy_readings_enabled(
+        std::env::var(anchor::LEGACY_READINGS_ENV).ok().as_deref(),
+    );
+    if legacy_readings {
+        println!("Per-reading addReading enabled (set {}=0 to anchor batches only)", anchor::LEGACY_READINGS_ENV);
+    }
+    let (anchor_tx, anchor_rx) = mpsc::channel::<Reading>(anchor::MAX_PENDING);
+    tokio::spawn(anchorer.clone().run(anchor_rx));
+    let verify_anchorer = anchorer.clone();
+    tokio::spawn(async move {
+        if let Err(e) = anchor::serve_verify(anchor::VERIFY_ADDR, verify_anchorer).await {
+            eprintln!("Verify API stopped: {}", e);
+        }
+    });
+
+    // Pembacaan yang diterima juga di-push ke dashboard lewat live feed
+    let (live_tx, _) = broadcast::channel::<String>(live::LIVE_BUFFER);
+    let live_sender = live_tx.clone();
+    tokio::spawn(async move {
+        if let Err(e) = live::serve_live(live::LIVE_ADDR, live_sender).await {
+            eprintln!("Live feed stopped: {}", e);
+        }
+    });
+
     let listener = TcpListener::bind("127.0.0.1:7878").await?;
     println!("Server running on 127.0.0.1:7878");
 
@@ -104,6 +82,9 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
         let (mut socket, _) = listener.accept().await?;
         let client = client.clone();
         let bucket = influx_bucket.to_string();
+        let anchor_tx = anchor_tx.clone();
+        let anchorer = anchorer.clone();
+        let live_tx = live_tx.clone();
         
         tokio::spawn(async move {
             let mut buf = [0; 1024];
@@ -150,17 +131,29 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
                             match client.write(&bucket, stream::iter(vec![point])).await {
                                 Ok(_) => {
                                     println!("Data successfully written to InfluxDB");
+
+                                    // Tidak ada subscriber bukan error
+                                    if let Ok(line) = serde_json::to_string(&sensor_data) {
+                                        let _ = live_tx.send(line);
+                                    }
                                     
-                                    // Tambahan: simpan data ke blockchain juga
-                                    match store_to_blockchain(&sensor_data).await {
+                                    let reading = Reading::from_sensor(&sensor_data);
+                                    if legacy_readings {
+                                        match anchorer.add_reading(&reading).await {
+                                            Ok(tx) => println!("Transaction Hash: {:?}", tx),
+                                            Err(e) => eprintln!("Failed to store reading to blockchain: {}", e),
+                                        }
+                                    }
+
+                                    // Tambahan: antrekan untuk anchoring batch ke blockchain
+                                    match anchor_tx.send(reading).await {
                                         Ok(_) => {
-                                            println!("Data stored to blockchain successfully");
-                                            let _ = socket.write_all(b"OK: Data stored to DB and Blockchain").await;
+                                            let _ = socket.write_all(b"OK: Data stored to DB and queued for Blockchain").await;
                                         },
                                         Err(e) => {
-                                            eprintln!("Failed to store to blockchain: {}", e);
+                                            eprintln!("Failed to queue for blockchain: {}", e);
                                             let _ = socket.write_all(
-                                                format!("WARNING: DB success but Blockchain failed - {}", e).as_bytes()
+                                                format!("WARNING: DB success but Blockchain queue closed - {}", e).as_bytes()
                                             ).await;
                                         }
                                     }